@@ -3,6 +3,7 @@ import logging
 from json import dumps
 
 from core.management.commands._community import CommunityCommand
+from core.views.growth import GrowthSerializer
 from core.utils.configuration import DecodeConfigAction
 
 
@@ -15,10 +16,15 @@ class Command(CommunityCommand):
         parser.add_argument('-a', '--args', type=str, nargs="*", default="")
         parser.add_argument('-c', '--config', type=str, action=DecodeConfigAction, nargs="?", default={})
         parser.add_argument('--kernel-content', action="store_true")
+        parser.add_argument('--timeline', action="store_true")
         parser.add_argument('--limit', type=int, default=None)
         parser.add_argument('--indent', type=int, default=None)
 
     def handle_community(self, community, *arguments, **options):
+        if options["timeline"]:
+            timeline = GrowthSerializer(community.growth_set.order_by("id"), many=True).data
+            print(dumps(timeline, indent=options["indent"]))
+            return
         output = community.kernel.content if options["kernel_content"] else community.manifestation
         print(dumps(list(output)[:options["limit"]], indent=options["indent"]))
 
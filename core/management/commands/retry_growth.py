@@ -0,0 +1,26 @@
+from __future__ import unicode_literals, absolute_import, print_function, division
+
+from core.management.commands import CommunityCommand
+from core.models.organisms.growth import GrowthState
+
+
+class Command(CommunityCommand):
+    """
+    Sends the failed resources of partially completed growths again and contributes new successes to their output.
+    """
+
+    def add_arguments(self, parser):
+        super(Command, self).add_arguments(parser)
+        parser.add_argument('-g', '--growth', type=str, nargs="*", default=None)
+
+    def handle_community(self, community, *args, **options):
+        community.config = {"async": False}
+        community.save()
+        growths = community.growth_set.filter(state__in=[GrowthState.PARTIAL, GrowthState.RETRY])
+        if options["growth"]:
+            growths = growths.filter(type__in=options["growth"])
+        for growth in growths:
+            retained = growth.resources.count()
+            result = growth.retry()
+            output, errors = growth.finish(result)
+            print("Retried:", growth.type, retained, "Remaining errors:", errors.count())
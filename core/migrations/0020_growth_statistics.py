@@ -0,0 +1,30 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+import json_field.fields
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0019_auto_20171017_1444'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='growth',
+            name='began_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='growth',
+            name='finished_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='growth',
+            name='statistics',
+            field=json_field.fields.JSONField(blank=True, default='null', help_text='Enter a valid JSON object', null=True),
+        ),
+    ]
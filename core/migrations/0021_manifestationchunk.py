@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+import json_field.fields
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0020_growth_statistics'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ManifestationChunk',
+            fields=[
+                ('id', models.AutoField(verbose_name='ID', serialize=False, auto_created=True, primary_key=True)),
+                ('index', models.PositiveIntegerField()),
+                ('data', json_field.fields.JSONField(default='null', help_text='Enter a valid JSON object', null=True)),
+                ('manifestation', models.ForeignKey(related_name='chunks', to='core.Manifestation')),
+            ],
+            options={
+                'ordering': ('manifestation', 'index'),
+            },
+        ),
+        migrations.AlterUniqueTogether(
+            name='manifestationchunk',
+            unique_together=set([('manifestation', 'index')]),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0021_manifestationchunk'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='collective',
+            name='view_of',
+            field=models.ForeignKey(related_name='views', blank=True, to='core.Collective', null=True, help_text='Collective of which members with an identity form the members of this Collective'),
+        ),
+    ]
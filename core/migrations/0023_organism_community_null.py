@@ -0,0 +1,35 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('core', '0022_collective_view_of'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='collective',
+            name='community_id',
+            field=models.PositiveIntegerField(null=True, blank=True),
+        ),
+        migrations.AlterField(
+            model_name='collective',
+            name='community_type',
+            field=models.ForeignKey(related_name='+', blank=True, to='contenttypes.ContentType', null=True),
+        ),
+        migrations.AlterField(
+            model_name='individual',
+            name='community_id',
+            field=models.PositiveIntegerField(null=True, blank=True),
+        ),
+        migrations.AlterField(
+            model_name='individual',
+            name='community_type',
+            field=models.ForeignKey(related_name='+', blank=True, to='contenttypes.ContentType', null=True),
+        ),
+    ]
@@ -1,9 +1,12 @@
 from __future__ import unicode_literals, absolute_import, print_function, division
 import six
 
+import json
 from collections import Iterator, Iterable
 
-from django.db import models
+from django.db import models, connection
+from django.db.models import Value, Aggregate, Case, When
+from django.db.models.functions import Coalesce
 from django.conf import settings
 from django.core.urlresolvers import reverse
 
@@ -11,8 +14,8 @@ import json_field
 from json_field.fields import JSONEncoder, JSONDecoder
 
 from core.models.organisms import Organism, Individual
-from core.utils.helpers import ibatch
-from core.utils.data import reach
+from core.utils.helpers import ibatch, iterate_json_array
+from core.utils.data import compile_reach
 
 
 class IndexEncoder(JSONEncoder):
@@ -27,6 +30,21 @@ class IndexDecoder(JSONDecoder):
         return {key: int(value) for value, key in six.iteritems(obj)}
 
 
+class GroupConcat(Aggregate):
+    """
+    Concatenates the values of a group with commas in the database. Supported by SQLite and MySQL.
+    """
+
+    function = "GROUP_CONCAT"
+    MYSQL_MAX_LENGTH = 4294967295  # MySQL truncates results at 1024 characters by default
+
+    @classmethod
+    def prepare_connection(cls):
+        if connection.vendor == "mysql":
+            with connection.cursor() as cursor:
+                cursor.execute("SET SESSION group_concat_max_len = %s", [cls.MYSQL_MAX_LENGTH])
+
+
 class Collective(Organism):  # TODO: rename to family
 
     indexes = json_field.JSONField(
@@ -37,6 +55,13 @@ class Collective(Organism):  # TODO: rename to family
         decoder=IndexDecoder
     )
     identifier = models.CharField(max_length=255, null=True, blank=True)
+    view_of = models.ForeignKey(
+        "Collective",
+        null=True,
+        blank=True,
+        related_name="views",
+        help_text="Collective of which members with an identity form the members of this Collective"
+    )
 
     @property
     def url(self):
@@ -44,6 +69,18 @@ class Collective(Organism):  # TODO: rename to family
             raise ValueError("Can't get url for unsaved Collective")
         return reverse("v1:collective-content", args=[self.id])  # TODO: make version aware
 
+    @property
+    def members(self):
+        """
+        Returns the Individuals of this Collective. When this Collective is a view of another Collective,
+        the members of that Collective that have an identity get returned instead, without copying them.
+
+        :return: Individual queryset
+        """
+        if self.view_of_id is None:
+            return self.individual_set.all()
+        return self.view_of.individual_set.exclude(identity__isnull=True).exclude(identity="")
+
     @staticmethod
     def validate(data, schema):
         """
@@ -69,6 +106,7 @@ class Collective(Organism):  # TODO: rename to family
         """
         assert isinstance(data, (Iterator, list, tuple, dict, Individual)), \
             "Collective.update expects data to be formatted as iteratable, dict or Individual not {}".format(type(data))
+        assert self.view_of_id is None, "Collective.update can't add data to a view of another Collective"
 
         if reset:
             self.individual_set.all().delete()
@@ -107,6 +145,99 @@ class Collective(Organism):  # TODO: rename to family
 
         return update_count
 
+    def iterate_raw_rows(self, chunk_size=None):
+        """
+        Yields the ids and properties of the members of this Collective as the JSON text that is stored in the database.
+        Rows get fetched in chunks ordered by id without building Individual models to keep memory flat.
+
+        :param chunk_size: (optional) the amount of rows to fetch per query (MAX_BATCH_SIZE by default)
+        :return: a generator yielding ids and JSON strings
+        """
+        chunk_size = chunk_size or settings.MAX_BATCH_SIZE
+        raw_properties = Coalesce("properties", Value("{}"), output_field=models.TextField())
+        queryset = self.members.annotate(raw_properties=raw_properties).order_by("id")
+        last_id = 0
+        while True:
+            rows = list(queryset.filter(id__gt=last_id).values_list("id", "raw_properties")[:chunk_size])
+            if not rows:
+                return
+            for row in rows:
+                yield row
+            last_id = rows[-1][0]
+
+    def iterate_raw_properties(self, chunk_size=None):
+        """
+        Yields the properties of the members of this Collective as the JSON text that is stored in the database.
+
+        :param chunk_size: (optional) the amount of rows to fetch per query (MAX_BATCH_SIZE by default)
+        :return: a generator yielding JSON strings
+        """
+        return (properties for identifier, properties in self.iterate_raw_rows(chunk_size))
+
+    def rekey(self, identifier, batch_size=300):
+        """
+        Sets a new identifier and recalculates the identity of all members in place.
+        Every batch of members gets updated by a single UPDATE query.
+
+        :param identifier: the key of member properties that identifies members
+        :param batch_size: (optional) the amount of members per UPDATE query, which stays below SQLite variable limits
+        :return: None
+        """
+        self.identifier = identifier
+        self.save()
+        get_identity = compile_reach("$." + identifier) if identifier else lambda properties: None
+        for rows in ibatch(self.iterate_raw_rows(), batch_size=batch_size):
+            identities = []
+            for individual_id, raw_properties in rows:
+                identity = get_identity(json.loads(raw_properties, cls=JSONDecoder))
+                identities.append(When(id=individual_id, then=Value(None if identity is None else str(identity))))
+            self.individual_set.filter(id__in=[row[0] for row in rows]).update(
+                identity=Case(*identities, default=Value(None), output_field=models.CharField())
+            )
+
+    def iterate_grouped_properties(self, chunk_size=None):
+        """
+        Yields the identities of members of this Collective together with the properties of all members
+        that share that identity. Grouping happens in the database, which returns the properties of a group as JSON text.
+        Groups get fetched in chunks ordered by identity. Members without an identity are left out.
+
+        :param chunk_size: (optional) the amount of groups to fetch per query (MAX_BATCH_SIZE by default)
+        :return: a generator yielding identity and a list of properties
+        """
+        chunk_size = chunk_size or settings.MAX_BATCH_SIZE
+        GroupConcat.prepare_connection()
+        queryset = self.members.filter(identity__isnull=False) \
+            .values("identity") \
+            .annotate(raw_properties=GroupConcat("properties", output_field=models.TextField())) \
+            .values_list("identity", "raw_properties") \
+            .order_by("identity")
+        last_identity = None
+        while True:
+            chunk = queryset if last_identity is None else queryset.filter(identity__gt=last_identity)
+            rows = list(chunk[:chunk_size])
+            if not rows:
+                return
+            for identity, raw_properties in rows:
+                yield identity, json.loads("[{}]".format(raw_properties), cls=JSONDecoder)
+            last_identity = rows[-1][0]
+
+    @staticmethod
+    def get_public_json(raw_properties):
+        """
+        Removes the private keys starting with an underscore from JSON properties text.
+        The text gets returned as is when it can't contain private keys.
+
+        :param raw_properties: JSON text of Individual properties
+        :return: JSON text without private keys
+        """
+        if '"_' not in raw_properties:
+            return raw_properties
+        properties = json.loads(raw_properties, cls=JSONDecoder)
+        return json.dumps(
+            {key: value for key, value in properties.items() if not key.startswith("_")},
+            cls=JSONEncoder
+        )
+
     @property
     def content(self):
         """
@@ -114,7 +245,9 @@ class Collective(Organism):  # TODO: rename to family
 
         :return: a generator yielding properties from Individual members
         """
-        return (ind.content for ind in self.individual_set.iterator())
+        for raw_properties in self.iterate_raw_properties():
+            properties = json.loads(raw_properties, cls=JSONDecoder)
+            yield {key: value for key, value in properties.items() if not key.startswith("_")}
 
     @property
     def has_content(self):
@@ -123,19 +256,36 @@ class Collective(Organism):  # TODO: rename to family
 
         :return: True if there are Individuals, False otherwise
         """
-        return self.individual_set.exists()
+        return self.members.exists()
+
+    def iterate_json_members(self):
+        """
+        Yields the content of the members of this Collective as JSON text.
+        Stored JSON text gets passed on to prevent decoding and encoding of all members.
+
+        :return: a generator yielding JSON strings
+        """
+        return (self.get_public_json(raw_properties) for raw_properties in self.iterate_raw_properties())
+
+    def iterate_json_content(self):
+        """
+        Yields the content of the members of this Collective as parts of a JSON array.
+        Stored JSON text gets concatenated to prevent decoding and encoding of all members.
+
+        :return: a generator yielding JSON strings
+        """
+        return iterate_json_array(self.iterate_json_members())
 
     @property
     def json_content(self):
-        json_content = [ind.json_content for ind in self.individual_set.all()]
-        return "[{}]".format(",".join(json_content))
+        return "".join(self.iterate_json_content())
 
     def output(self, *args):
         if len(args) > 1:
             return map(self.output, args)
         frm = args[0]
         if not frm:
-            return [frm for ind in range(0, self.individual_set.count())]
+            return [frm for ind in range(0, self.members.count())]
         elif isinstance(frm, list):
             output = self.output(*frm)
             if len(frm) > 1:
@@ -144,7 +294,7 @@ class Collective(Organism):  # TODO: rename to family
                 output = [[out] for out in output]
             return output
         else:
-            return [ind.output(frm) for ind in self.individual_set.iterator()]
+            return [ind.output(frm) for ind in self.members.iterator()]
 
     def group_by(self, key):
         """
@@ -154,7 +304,7 @@ class Collective(Organism):  # TODO: rename to family
         :return:
         """
         grouped = {}
-        for ind in self.individual_set.all():
+        for ind in self.members.all():
             assert key in ind.properties, \
                 "Can't group by {}, because it is missing from an individual on collective {}".format(key, self.id)
             value = ind.properties[key]
@@ -199,7 +349,7 @@ class Collective(Organism):  # TODO: rename to family
         :return: The influenced individual
         """
         if self.identifier:
-            individual.identity = reach("$." + self.identifier, individual.properties)
+            individual.identity = compile_reach("$." + self.identifier)(individual.properties)
         if self.indexes:
             index_keys = self._get_index_keys()
             individual = self.set_index_for_individual(individual, index_keys)
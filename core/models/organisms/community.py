@@ -4,19 +4,23 @@ from itertools import groupby
 from collections import OrderedDict, Iterator
 import logging
 
-from django.db import models
+from celery.result import AsyncResult
+
+from django.db import models, transaction
 from django.contrib.contenttypes.fields import GenericForeignKey, GenericRelation, ContentType
 
 from datascope.configuration import DEFAULT_CONFIGURATION
 from core.models.organisms.states import CommunityState, COMMUNITY_STATE_CHOICES
 from core.models.organisms import Growth, Collective, Individual, Organism
+from core.models.organisms.growth import GrowthState
 from core.models.organisms.mixins import ProcessorMixin
 from core.models.organisms.managers.community import CommunityManager
 from core.models.resources.manifestation import Manifestation
 from core.models.user import DataScopeUser
 from core.utils.configuration import ConfigurationField
 from core.utils.helpers import get_any_model
-from core.exceptions import DSProcessUnfinished, DSProcessError
+from core.utils.profiling import measure
+from core.exceptions import DSProcessException, DSProcessUnfinished, DSProcessError
 
 
 log = logging.getLogger("datascope")
@@ -55,8 +59,10 @@ class Community(models.Model, ProcessorMixin):
     COMMUNITY_SPIRIT = OrderedDict()
     COMMUNITY_BODY = []
     ASYNC_MANIFEST = False
+    ASYNC_GROWTH_CALLBACKS = False
     INPUT_THROUGH_PATH = True
     PUBLIC_CONFIG = {}
+    WARM_UP_SIZE = 0  # amount of recent manifestations of predecessors to recalculate when the community is ready
 
     objects = CommunityManager()
 
@@ -188,6 +194,31 @@ class Community(models.Model, ProcessorMixin):
             raise Growth.DoesNotExist("Community.next_growth did not find a next growth.")
         return growth
 
+    def start_current_growth(self):
+        """
+        Calls the begin callback for the current growth and begins it.
+        When ASYNC_GROWTH_CALLBACKS is set the background task of the growth will advance the community when done
+        or abort the community when it fails.
+        Duration, CPU time and database queries get recorded in the statistics of the growth.
+
+        :return: the result of Growth.begin
+        """
+        log.info("Preparing " + self.current_growth.type)
+        with measure(profile=self.config.profile) as measurements:
+            self.call_begin_callback(self.current_growth.type, self.current_growth.input)
+            log.info("Starting " + self.current_growth.type)
+            if self.state == CommunityState.ASYNC and self.ASYNC_GROWTH_CALLBACKS:
+                from core.tasks import grow_community, abort_community
+                arguments = (self.__class__.__name__, self.id, self.current_growth.id,)
+                result = self.current_growth.begin(
+                    link=grow_community.si(*arguments),
+                    link_error=abort_community.si(*arguments)
+                )
+            else:
+                result = self.current_growth.begin()
+        self.current_growth.record_statistics("begin", measurements)
+        return result
+
     def set_kernel(self):
         """
 
@@ -199,6 +230,19 @@ class Community(models.Model, ProcessorMixin):
         assert issubclass(self.kernel.__class__, Organism), \
             "The kernel should be an Organism."
 
+    @property
+    def predecessor(self):
+        """
+        Returns the community that this community continues from when growing incrementally.
+        Set the "predecessor" configuration to the id of a community of the same type to enable this.
+
+        :return: Community or None
+        """
+        predecessor_id = getattr(self.config, "predecessor", None)
+        if not predecessor_id:
+            return None
+        return self.__class__.objects.get(id=predecessor_id)
+
     def initial_input(self, *args):
         """
 
@@ -228,27 +272,26 @@ class Community(models.Model, ProcessorMixin):
             self.setup_growth(*args)
             self.current_growth = self.next_growth()
             self.save()  # in between save because next operations may take long and community needs to be claimed.
-            log.info("Preparing " + self.current_growth.type)
-            self.call_begin_callback(self.current_growth.type, self.current_growth.input)
-            log.info("Starting " + self.current_growth.type)
-            result = self.current_growth.begin()  # when synchronous result contains actual results
+            result = self.start_current_growth()  # when synchronous result contains actual results
             self.save()
 
         while self.kernel is None:
 
-            output, errors = self.current_growth.finish(result)  # will raise when Growth is not finished
-            error_count = errors.count()
-            if error_count > 1:
-                should_finish = self.call_error_callbacks(self.current_growth.type, errors, output)
-                log.info("{} errors occurred".format(error_count))
-            else:
-                should_finish = True
-            if not should_finish:
-                self.state = CommunityState.ABORTED
-                self.save()
-                raise DSProcessError("Could not finish growth according to error callbacks.")
-            log.info("Finishing " + self.current_growth.type)
-            self.call_finish_callback(self.current_growth.type, output, errors)
+            with measure(profile=self.config.profile) as measurements:
+                output, errors = self.current_growth.finish(result)  # will raise when Growth is not finished
+                error_count = errors.count()
+                if error_count > 1:
+                    should_finish = self.call_error_callbacks(self.current_growth.type, errors, output)
+                    log.info("{} errors occurred".format(error_count))
+                else:
+                    should_finish = True
+                if not should_finish:
+                    self.state = CommunityState.ABORTED
+                    self.save()
+                    raise DSProcessError("Could not finish growth according to error callbacks.")
+                log.info("Finishing " + self.current_growth.type)
+                self.call_finish_callback(self.current_growth.type, output, errors)
+            self.current_growth.record_statistics("finish", measurements)
             try:
                 self.current_growth = self.next_growth()
             except Growth.DoesNotExist:
@@ -256,15 +299,97 @@ class Community(models.Model, ProcessorMixin):
                 self.state = CommunityState.READY
                 self.save()
                 return True
-            log.info("Preparing " + self.current_growth.type)
-            self.call_begin_callback(self.current_growth.type, self.current_growth.input)
-            log.info("Starting " + self.current_growth.type)
-            result = self.current_growth.begin()
+            self.save()  # growth callbacks should find the current growth when the growth task completes fast
+            result = self.start_current_growth()
             self.save()
 
             if self.state == CommunityState.ASYNC:
                 raise DSProcessUnfinished("Community starts another Growth.")
 
+    def claim_growth(self):
+        """
+        Claims the next state transition of this community while holding a short lock on its database row.
+        New communities get claimed by storing the state they will grow in.
+        Asynchronous communities get claimed by moving a growth with a completed task from PROCESSING to CONTRIBUTE.
+        Other processes that try to advance the community see the claim and leave the community alone.
+
+        :return: True if this process may grow the community
+        """
+        with transaction.atomic():
+            locked = self.__class__.objects.select_for_update().get(id=self.id)
+            if locked.state != self.state or locked.current_growth_id != self.current_growth_id:
+                return False
+            if self.state == CommunityState.NEW:
+                state = CommunityState.ASYNC if self.config.async else CommunityState.SYNC
+                self.__class__.objects.filter(id=self.id).update(state=state)
+                return True
+            elif self.state == CommunityState.ASYNC:
+                growth = Growth.objects.get(id=self.current_growth_id)
+                if growth.state != GrowthState.PROCESSING or not AsyncResult(growth.result_id).ready():
+                    return False
+                Growth.objects.filter(id=growth.id).update(state=GrowthState.CONTRIBUTE)
+                self.current_growth = Growth.objects.get(id=growth.id)
+                return True
+            return self.state in [CommunityState.READY, CommunityState.SYNC]
+
+    def grow_with_lock(self, *args):
+        """
+        Grows the community after claiming its next state transition with claim_growth.
+        Growth callbacks and requests use this to prevent that the same Growth gets finished twice.
+        The row lock is only held during the claim, so growth tasks get dispatched after the lock is released
+        and slow callbacks or synchronous growth don't block other processes.
+        A community gets aborted when the task of its growth failed.
+
+        :return: True if the community is ready
+        """
+        was_ready = self.state == CommunityState.READY
+        if self.state == CommunityState.ABORTED:
+            raise DSProcessError("Community got aborted.")
+        if not self.claim_growth():
+            raise DSProcessUnfinished("Community got advanced by another process or its growth is not done.")
+        try:
+            is_ready = self.grow(*args)
+        except DSProcessError:
+            if self.current_growth is not None and self.current_growth.state == GrowthState.ERROR:
+                self.state = CommunityState.ABORTED
+                self.save()
+            raise
+        if is_ready and not was_ready:
+            self.warm_up_manifestations()
+        return is_ready
+
+    def warm_up_manifestations(self, predecessors=None):
+        """
+        Recalculates the most recently completed manifestations of communities with the same signature.
+        These manifestations move to this community and keep serving their data until the new data is ready.
+
+        :param predecessors: (optional) queryset of communities to take manifestations from instead
+        :return: list of manifestations that are recalculating
+        """
+        if not self.WARM_UP_SIZE:
+            return []
+        if predecessors is None:
+            predecessors = self.__class__.objects.filter(signature=self.signature)
+        predecessors = predecessors.exclude(id=self.id)
+        manifestations = Manifestation.objects.filter(
+            community_type=ContentType.objects.get_for_model(self),
+            community_id__in=list(predecessors.values_list("id", flat=True)),
+            completed_at__isnull=False
+        ).order_by("-completed_at")[:self.WARM_UP_SIZE]
+        manifestations = list(manifestations)
+        for manifestation in manifestations:
+            manifestation.revalidate(community=self)
+        return manifestations
+
+    def get_manifestation_content(self):
+        """
+        Returns the content that gets processed into the manifestation.
+        Communities can override this to process a preselection of the kernel.
+
+        :return: iterator with content
+        """
+        return self.kernel.content
+
     @property
     def manifestation(self):
         """
@@ -272,9 +397,14 @@ class Community(models.Model, ProcessorMixin):
 
         :return:
         """
-        content = self.kernel.content
+        content = self.get_manifestation_content()
+        extra_config = {}
+        if self.kernel is not None:
+            # Processors can cache per individual with this cheap version of the content
+            extra_config["kernel_version"] = "{}-{}".format(self.kernel.id, self.kernel.modified_at.isoformat())
         for part in self.COMMUNITY_BODY:
-            processor, method, args_type = self.prepare_process(part["process"], extra_config=part.get("config"))
+            config = dict(extra_config, **(part.get("config") or {}))
+            processor, method, args_type = self.prepare_process(part["process"], extra_config=config)
             content = method(content)
             assert isinstance(content, Iterator), \
                 "To prevent high memory usage processors should return iterators when manifestating"
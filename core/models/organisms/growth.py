@@ -1,11 +1,16 @@
 import logging
 from operator import xor
+from datetime import datetime
 from collections import Iterator
 
 from django.db import models
+from django.db.models import Sum
+from django.db.models.functions import Length
 from django.contrib.contenttypes.fields import GenericForeignKey, ContentType
 from django.core.exceptions import ValidationError
 
+import json_field
+
 from datascope.configuration import PROCESS_CHOICE_LIST, DEFAULT_CONFIGURATION
 from core.processors.base import ArgumentsTypes
 from core.utils.configuration import ConfigurationField
@@ -70,20 +75,30 @@ class Growth(models.Model, ProcessorMixin):
     state = models.CharField(max_length=255, choices=GROWTH_STATE_CHOICES, default=GrowthState.NEW, db_index=True)
     is_finished = models.BooleanField(default=False, db_index=True)
 
-    def begin(self):
+    began_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    statistics = json_field.JSONField(null=True, blank=True)
+
+    def begin(self, link=None, link_error=None):
         """
         Starts the Celery task that provides growth of the data pool and is stored under self.process.
 
-        :param args: (optional) The positional arguments to pass through to the process of Growth
-        :param kwargs: (optional) The keyword arguments to pass through the process of Growth
+        :param link: (optional) A Celery signature to call when the background task of an async Growth completes
+        :param link_error: (optional) A Celery signature to call when the background task of an async Growth fails
         :return: the input Organism
         """
         assert self.state in [GrowthState.NEW, GrowthState.RETRY], \
             "Can't begin a growth that is in state {}".format(self.state)
 
         self.config = self.community.config.to_dict(protected=True)  # TODO: make this += operation instead
+        self.began_at = datetime.now()
 
-        processor, method, args_type = self.prepare_process(self.process, async=self.config.async)
+        processor, method, args_type = self.prepare_process(
+            self.process,
+            async=self.config.async,
+            link=link,
+            link_error=link_error
+        )
         assert args_type == ArgumentsTypes.NORMAL and isinstance(self.input, Individual) or \
             args_type == ArgumentsTypes.BATCH and isinstance(self.input, Collective), \
             "Unexpected arguments type '{}' for input of class {}".format(args_type, self.input.__class__.__name__)
@@ -103,6 +118,62 @@ class Growth(models.Model, ProcessorMixin):
         self.save()
         return result
 
+    def retry(self, link=None, link_error=None):
+        """
+        Sends the retained error resources of a partially completed Growth again.
+        Call finish with the result to contribute new successes to the existing output.
+        Errors that remain get retained again by finish.
+
+        :param link: (optional) A Celery signature to call when the background task of an async Growth completes
+        :param link_error: (optional) A Celery signature to call when the background task of an async Growth fails
+        :return: the result of the process
+        """
+        assert self.state in [GrowthState.PARTIAL, GrowthState.RETRY], \
+            "Can't retry a growth that is in state {}".format(self.state)
+
+        self.config = self.community.config.to_dict(protected=True)
+        self.began_at = datetime.now()
+        self.state = GrowthState.RETRY
+        self.save()
+
+        processor, method, args_type = self.prepare_process(
+            self.process,
+            async=self.config.async,
+            link=link,
+            link_error=link_error
+        )
+        assert args_type == ArgumentsTypes.BATCH, \
+            "Growth.retry expects a batch process to send errors with, not {}".format(self.process)
+        # Requests of concatenated batches stored their args joined like "1|2|3"
+        # These get split again to let the process batch them within its limits
+        concat_args_symbol = getattr(processor.config, "concat_args_symbol", None) \
+            if getattr(processor.config, "concat_args_size", None) else None
+        errors = self.resources
+        args_list = []
+        kwargs_list = []
+        for error in errors.iterator():
+            args = error.request.get("args", [])
+            kwargs = error.request.get("kwargs", {})
+            if concat_args_symbol and len(args) == 1:
+                for arg in str(args[0]).split(concat_args_symbol):
+                    args_list.append([arg])
+                    kwargs_list.append(kwargs)
+            else:
+                args_list.append(args)
+                kwargs_list.append(kwargs)
+        if not args_list:
+            raise DSNoContent("Growth.retry did not find any error resources to retry")
+        errors.update(retainer_type=None, retainer_id=None)
+        result = method(args_list, kwargs_list)
+
+        if not self.config.async:
+            self.state = GrowthState.CONTRIBUTE
+        else:
+            self.state = GrowthState.PROCESSING
+            self.result_id = result.id
+        self.save()
+        return result
+
     def finish(self, result):
         """
 
@@ -114,7 +185,9 @@ class Growth(models.Model, ProcessorMixin):
 
         processor, method, args_type = self.prepare_process(self.process, async=self.config.async)
 
-        if self.state == GrowthState.PROCESSING:
+        # Growths get claimed by moving them to CONTRIBUTE before the results of their task get collected
+        is_claimed = self.state == GrowthState.CONTRIBUTE and result is None and self.result_id
+        if self.state == GrowthState.PROCESSING or is_claimed:
             try:
                 result = processor.async_results(self.result_id)
                 self.state = GrowthState.CONTRIBUTE
@@ -143,7 +216,12 @@ class Growth(models.Model, ProcessorMixin):
             for res in err:
                 res.retain(self)
             self.state = GrowthState.COMPLETE if not len(err) else GrowthState.PARTIAL
-            self.save()
+            self.finished_at = datetime.now()
+            self.record_statistics("resources", {
+                "success": scc.count(),
+                "errors": len(err),
+                "size": self.get_resources_size(scc) + self.get_resources_size(err)
+            })
 
         return self.output, self.resources
 
@@ -174,10 +252,12 @@ class Growth(models.Model, ProcessorMixin):
     def inline_by_key(self, contributions, inline_key):
         assert isinstance(self.output, Collective), "inline_by_key expects a Collective as output"
         original_identifier = self.output.identifier
-        assert original_identifier == inline_key, \
-            "Identifier of output '{}' does not match inline key '{}'".format(original_identifier, inline_key)
-        self.output.identifier = "{}.{}".format(original_identifier, original_identifier)
-        self.output.save()
+        inlined_identifier = "{}.{}".format(inline_key, inline_key)
+        if original_identifier != inlined_identifier:  # output gets inlined again when retrying
+            assert original_identifier == inline_key, \
+                "Identifier of output '{}' does not match inline key '{}'".format(original_identifier, inline_key)
+            self.output.identifier = inlined_identifier
+            self.output.save()
         for contribution in contributions:
             affected_individuals = self.output.individual_set.filter(identity=contribution[inline_key])
             for individual in affected_individuals.iterator():
@@ -197,6 +277,31 @@ class Growth(models.Model, ProcessorMixin):
                 individual.clean()
                 individual.save()
 
+    @staticmethod
+    def get_resources_size(resources):
+        """
+        Returns the amount of characters stored in the body of given resources. Returns zero for resources without body.
+
+        :param resources: Resource queryset
+        :return: size of the resources
+        """
+        if not any(field.name == "body" for field in resources.model._meta.get_fields()):
+            return 0
+        return resources.aggregate(size=Sum(Length("body")))["size"] or 0
+
+    def record_statistics(self, key, statistics):
+        """
+        Stores statistics like durations, query counts and resource counts under given key and saves the Growth.
+
+        :param key: (string) name of the statistics like "begin", "finish" or "resources"
+        :param statistics: (dict) the statistics to store
+        :return: None
+        """
+        recorded = dict(self.statistics or {})
+        recorded[key] = statistics
+        self.statistics = recorded
+        self.save()
+
     def save(self, *args, **kwargs):
         self.is_finished = self.state in [GrowthState.COMPLETE, GrowthState.PARTIAL]
         super(Growth, self).save(*args, **kwargs)
@@ -10,7 +10,7 @@ from django.core.urlresolvers import reverse
 import json_field
 
 from core.models.organisms import Organism
-from core.utils.data import reach
+from core.utils.data import compile_reach
 
 
 class Individual(Organism):
@@ -104,7 +104,7 @@ class Individual(Organism):
         if not frm:
             return frm
         if isinstance(frm, str):
-            return reach(frm, content)
+            return compile_reach(frm)(content)
         elif isinstance(frm, list):
             if len(frm) > 1:
                 return Individual.output_from_content(content, *frm)
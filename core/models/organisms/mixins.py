@@ -3,13 +3,15 @@ from core.processors.base import Processor
 
 class ProcessorMixin(object):
 
-    def prepare_process(self, process, async=False, extra_config=None):
+    def prepare_process(self, process, async=False, extra_config=None, link=None, link_error=None):
         """
         Creates an instance of the processor based on requested process with a correct config set.
         Processors get loaded from core.processors
         It returns the processor and the method that should be invoked.
 
         :param process: A dotted string indicating the processor and method that represent the process.
+        :param link: (optional) A Celery signature that gets called when an async process completes
+        :param link_error: (optional) A Celery signature that gets called when an async process fails
         :return: processor, method
         """
         assert isinstance(extra_config, (dict, type(None))), \
@@ -29,6 +31,9 @@ class ProcessorMixin(object):
         processor = processor_class(config=config)
         method, args_type = processor.get_processor_method(method_name)
         if async:
+            callbacks = {key: value for key, value in [("link", link), ("link_error", link_error)] if value is not None}
+            if callbacks:
+                method = method.set(**callbacks)
             method = getattr(method, "delay")
         if not callable(method):
             raise AssertionError("{} is not a callable property on {}.".format(method_name, processor))
@@ -40,8 +40,8 @@ class OrganismIterator(object):
 class Organism(models.Model):
 
     community = GenericForeignKey(ct_field="community_type", fk_field="community_id")
-    community_type = models.ForeignKey(ContentType, related_name="+")
-    community_id = models.PositiveIntegerField()
+    community_type = models.ForeignKey(ContentType, related_name="+", null=True, blank=True)
+    community_id = models.PositiveIntegerField(null=True, blank=True)  # organisms without community belong to streams
 
     schema = json_field.JSONField(default=None, null=False, blank=False)  # BUG: schema does not throw IntegrityError on None
 
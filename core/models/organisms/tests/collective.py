@@ -155,6 +155,64 @@ class TestCollective(TransactionTestCase):
             "JSON content did not meet expectation. Is get_json inside json_field.fields patched properly??"
         )
 
+    def test_content(self):
+        self.assertEqual(list(self.instance.content), self.expected_content)
+        individual = self.instance.individual_set.last()
+        individual.properties["_private"] = "private value"
+        individual.save()
+        self.assertEqual(list(self.instance.content), self.expected_content)
+
+    def test_iterate_raw_properties(self):
+        raw_properties = list(self.instance.iterate_raw_properties(chunk_size=2))
+        self.assertEqual(len(raw_properties), 3)
+        self.assertEqual([loads(properties) for properties in raw_properties], self.expected_content)
+
+    def test_iterate_grouped_properties(self):
+        self.instance2.individual_set.filter(id__in=[4, 5]).update(identity="NL")
+        self.instance2.individual_set.filter(id__in=[7, 8]).update(identity="GB")
+        groups = list(self.instance2.iterate_grouped_properties(chunk_size=1))
+        self.assertEqual([identity for identity, properties in groups], ["GB", "NL"])
+        for identity, properties in groups:
+            self.assertEqual(len(properties), 2)
+            self.assertEqual({props["country"] for props in properties}, {identity})
+        self.assertEqual(
+            sorted(props["word"] for props in groups[1][1]),
+            ["ouderdom", "pensioen"]
+        )
+
+    def test_rekey(self):
+        self.instance2.rekey("country", batch_size=2)
+        self.instance2.refresh_from_db()
+        self.assertEqual(self.instance2.identifier, "country")
+        identities = self.instance2.individual_set.order_by("id").values_list("identity", flat=True)
+        self.assertEqual(list(identities), ["NL", "NL", "BE", "GB", "GB"])
+        self.instance2.rekey("missing")
+        identities = self.instance2.individual_set.values_list("identity", flat=True)
+        self.assertEqual(set(identities), {None})
+
+    def test_view_of(self):
+        view = Collective.objects.create(
+            community_type=self.instance2.community_type,
+            community_id=self.instance2.community_id,
+            schema={},
+            view_of=self.instance2
+        )
+        self.assertFalse(view.has_content)
+        self.instance2.individual_set.filter(id__in=[4, 5]).update(identity="NL")
+        self.instance2.individual_set.filter(id=6).update(identity="")
+        self.assertTrue(view.has_content)
+        self.assertEqual(sorted(view.output("$.word")), ["ouderdom", "pensioen"])
+        self.assertEqual(view.individual_set.count(), 0)
+        self.assertRaises(AssertionError, view.update, [{"word": "copy"}])
+
+    def test_json_content_private_keys(self):
+        individual = self.instance.individual_set.last()
+        individual.properties["_private"] = "private value"
+        individual.save()
+        self.assertEqual(loads(self.instance.json_content), self.expected_content)
+        self.instance.individual_set.all().delete()
+        self.assertEqual(loads(self.instance.json_content), [])
+
     def test_group_by(self):
         groups = self.instance2.group_by("country")
         for country, individuals in groups.items():
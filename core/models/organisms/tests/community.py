@@ -1,5 +1,7 @@
 from __future__ import unicode_literals
 
+from datetime import datetime
+
 from django.test import TestCase
 
 from mock import Mock, patch
@@ -7,6 +9,7 @@ from mock import Mock, patch
 from core.models.organisms import Individual, Collective, Growth, Community, Organism
 from core.models.organisms.community import CommunityState
 from core.models.organisms.growth import GrowthState
+from core.models.resources.manifestation import Manifestation
 from core.tests.mocks.community import CommunityMock
 from core.tests.mocks.http import HttpResourceMock, MockErrorQuerySet
 from core.exceptions import DSProcessUnfinished, DSProcessError
@@ -298,6 +301,68 @@ class TestCommunityMock(CommunityTestMixin):
         self.assertFalse(finish_growth.called)
         self.assertEqual(self.instance.state, CommunityState.READY)
 
+    @patch("core.models.organisms.community.Growth.begin")
+    def test_start_current_growth(self, begin_growth):
+        self.instance.state = CommunityState.ASYNC
+        self.instance.setup_growth()
+        self.instance.current_growth = self.instance.next_growth()
+        self.instance.start_current_growth()
+        begin_growth.assert_called_once_with()
+        begin_growth.reset_mock()
+        self.instance.ASYNC_GROWTH_CALLBACKS = True
+        self.instance.start_current_growth()
+        args, kwargs = begin_growth.call_args
+        callback = kwargs["link"]
+        self.assertEqual(callback.task, "core.grow_community")
+        self.assertEqual(callback.args, ("CommunityMock", self.instance.id, self.instance.current_growth.id,))
+        self.assertTrue(callback.immutable)
+        error_callback = kwargs["link_error"]
+        self.assertEqual(error_callback.task, "core.abort_community")
+        self.assertEqual(error_callback.args, callback.args)
+        self.assertTrue(error_callback.immutable)
+
+    @patch("core.models.organisms.community.AsyncResult")
+    def test_claim_growth(self, async_result):
+        # New communities get claimed by storing their next state
+        stale = CommunityMock.objects.get(id=self.instance.id)
+        self.assertTrue(self.instance.claim_growth())
+        self.assertEqual(CommunityMock.objects.get(id=self.instance.id).state, CommunityState.ASYNC)
+        self.assertFalse(stale.claim_growth())
+        # Asynchronous communities get claimed when the task of their growth is done
+        growth = Growth.objects.get(id=2)
+        growth.result_id = "task-id"
+        growth.save()
+        self.incomplete.current_growth = growth
+        self.incomplete.save()
+        async_result.return_value.ready.return_value = False
+        self.assertFalse(self.incomplete.claim_growth())
+        self.assertEqual(Growth.objects.get(id=growth.id).state, GrowthState.PROCESSING)
+        async_result.return_value.ready.return_value = True
+        stale = CommunityMock.objects.get(id=self.incomplete.id)
+        self.assertTrue(self.incomplete.claim_growth())
+        self.assertEqual(self.incomplete.current_growth.state, GrowthState.CONTRIBUTE)
+        self.assertFalse(stale.claim_growth())
+        # Ready communities don't need a claim
+        self.complete.state = CommunityState.READY
+        self.complete.save()
+        self.assertTrue(self.complete.claim_growth())
+
+    @patch("core.models.organisms.community.AsyncResult")
+    def test_grow_with_lock_failed_task(self, async_result):
+        growth = Growth.objects.get(id=2)
+        growth.result_id = "task-id"
+        growth.save()
+        self.incomplete.current_growth = growth
+        self.incomplete.save()
+        async_result.return_value.ready.return_value = True
+        with patch("core.processors.resources.AsyncResult") as processor_async_result:
+            processor_async_result.return_value.ready.return_value = True
+            processor_async_result.return_value.status = "FAILURE"
+            self.assertRaises(DSProcessError, self.incomplete.grow_with_lock)
+        self.assertEqual(CommunityMock.objects.get(id=self.incomplete.id).state, CommunityState.ABORTED)
+        self.assertEqual(Growth.objects.get(id=growth.id).state, GrowthState.ERROR)
+        self.assertRaises(DSProcessError, self.incomplete.grow_with_lock)
+
     @patch('core.tasks.http.get_resource_link', return_value=HttpResourceMock())
     def test_grow_sync(self, get_resource_link):
         self.instance.config.async = False
@@ -324,6 +389,31 @@ class TestCommunityMock(CommunityTestMixin):
         manifestation = self.complete.manifestation
         self.assertEqual(len(list(manifestation)), 0)
 
+    def test_warm_up_manifestations(self):
+        self.assertEqual(self.complete.warm_up_manifestations(), [])
+        Manifestation.objects.create(uri="/mock/test-multiple?", community=self.error, config={}, data=[1])
+        completed = Manifestation.objects.create(
+            uri="/mock/test-multiple?include_odd=1", community=self.error, config={}, data=[1],
+            completed_at=datetime.now()
+        )
+        Manifestation.objects.create(
+            uri="/mock/test?include_odd=1", community=self.incomplete, config={}, data=[1],
+            completed_at=datetime.now()
+        )
+        with patch.object(CommunityMock, "WARM_UP_SIZE", 10):
+            with patch.object(Manifestation, "revalidate") as revalidate:
+                manifestations = self.complete.warm_up_manifestations()
+        self.assertEqual(manifestations, [completed])
+        revalidate.assert_called_once_with(community=self.complete)
+        # Manifestations of given predecessors get warmed up regardless of their signature
+        incomplete_manifestation = Manifestation.objects.get(community_id=self.incomplete.id)
+        with patch.object(CommunityMock, "WARM_UP_SIZE", 10):
+            with patch.object(Manifestation, "revalidate"):
+                manifestations = self.complete.warm_up_manifestations(
+                    predecessors=CommunityMock.objects.filter(id=self.incomplete.id)
+                )
+        self.assertEqual(manifestations, [incomplete_manifestation])
+
     def test_get_name(self):
         self.assertEqual(self.instance.get_name(), 'mock')
         self.instance.__class__.COMMUNITY_NAME = 'community_real'
@@ -4,9 +4,11 @@ from mock import patch, Mock
 
 from core.models.organisms.growth import Growth, GrowthState
 from core.processors import HttpResourceProcessor
+from core.tasks.http import send_mass
 from core.tests.mocks.celery import (MockTask, MockAsyncResultSuccess, MockAsyncResultPartial,
                                     MockAsyncResultError, MockAsyncResultWaiting)
 from core.tests.mocks.http import HttpResourceMock
+from core.tests.mocks.requests import MockRequests
 from core.models.organisms.tests.mixins import TestProcessorMixin
 from core.exceptions import DSProcessError, DSProcessUnfinished
 
@@ -64,6 +66,7 @@ class TestGrowth(TestProcessorMixin):
         self.processing = Growth.objects.get(type="test_processing")
         self.finished = Growth.objects.get(type="test_finished")
         self.contributing = Growth.objects.get(type="test_contributing")
+        self.partial = Growth.objects.get(type="test_partial")
         self.contributing.append_to_output = Mock()
         self.contributing.inline_by_key = Mock()
         self.contributing.update_by_key = Mock()
@@ -132,6 +135,21 @@ class TestGrowth(TestProcessorMixin):
         self.assertEqual(len(errors), 2)
         self.assertIsInstance(errors[0], HttpResourceMock)
         self.assertEqual([resource.id for resource in self.processing.resources], [error.id for error in errors])
+        statistics = Growth.objects.get(id=self.processing.id).statistics
+        self.assertEqual(statistics["resources"], {
+            "success": 3,
+            "errors": 2,
+            "size": sum(len(resource.body) for resource in HttpResourceMock.objects.filter(id__in=[1, 2, 3, 4, 5]))
+        })
+
+    def test_record_statistics(self):
+        self.new.record_statistics("begin", {"duration": 1.5, "queries": 3})
+        self.new.record_statistics("finish", {"duration": 2.5, "queries": 4})
+        self.new.record_statistics("begin", {"duration": 0.5, "queries": 1})
+        self.assertEqual(Growth.objects.get(id=self.new.id).statistics, {
+            "begin": {"duration": 0.5, "queries": 1},
+            "finish": {"duration": 2.5, "queries": 4}
+        })
 
     @patch('core.processors.resources.AsyncResult', return_value=MockAsyncResultSuccess)
     def test_finish_without_errors(self, async_result):
@@ -187,6 +205,68 @@ class TestGrowth(TestProcessorMixin):
         self.assertFalse(self.processing.is_finished)
         self.assertEqual(self.processing.state, GrowthState.PROCESSING)
 
+    def test_retry(self):
+        for resource in HttpResourceMock.objects.filter(id__in=[4, 5]):
+            resource.retain(self.partial)
+        with patch('core.tasks.http.send_mass.s', return_value=MockTask) as send_mass_s:
+            self.partial.retry()
+        MockTask.delay.assert_called_once_with(
+            [["en", "fail"], ["en", "fail2"]],
+            [{}, {}]
+        )
+        self.assertEqual(self.partial.result_id, "result-id")
+        self.assertEqual(self.partial.state, GrowthState.PROCESSING)
+        self.assertFalse(self.partial.is_finished)
+        self.assertEqual(self.partial.resources.count(), 0)
+
+    def test_retry_concatenated_args(self):
+        self.partial.community.config.concat_args_size = 2
+        error = HttpResourceMock.objects.get(id=4)
+        error.request["args"] = ["1|2|3|4|5"]
+        error.save()
+        error.retain(self.partial)
+        with patch('core.tasks.http.send_mass.s', return_value=MockTask) as send_mass_s:
+            self.partial.retry()
+        args, kwargs = MockTask.delay.call_args
+        args_list, kwargs_list = args
+        self.assertEqual(args_list, [["1"], ["2"], ["3"], ["4"], ["5"]])
+        self.assertEqual(kwargs_list, [{}, {}, {}, {}, {}])
+        with patch("core.tasks.http.send_serie", return_value=([], [],)) as send_serie:
+            send_mass(
+                args_list,
+                kwargs_list,
+                config={
+                    "_namespace": "http_resource",
+                    "_private": ["_resource", "_continuation_limit"],
+                    "_resource": "HttpResourceMock",
+                    "concat_args_size": 2
+                },
+                method="get",
+                session=MockRequests
+            )
+        batches = [call[0][0][0][0] for call in send_serie.call_args_list]
+        self.assertEqual(batches, ["1|2", "3|4", "5"])
+
+    @patch('core.processors.resources.AsyncResult', return_value=MockAsyncResultSuccess)
+    def test_retry_finish(self, async_result):
+        existing_output = list(self.partial.output.content)
+        for resource in HttpResourceMock.objects.filter(id__in=[4, 5]):
+            resource.retain(self.partial)
+        with patch('core.tasks.http.send_mass.s', return_value=MockTask):
+            self.partial.retry()
+        output, errors = self.partial.finish(None)
+        self.assertTrue(async_result.called)
+        self.assertEqual(self.partial.state, GrowthState.COMPLETE)
+        self.assertEqual(list(output.content), existing_output + self.expected_append_output)
+        self.assertEqual(len(errors), 0)
+
+    def test_retry_invalid_state(self):
+        try:
+            self.new.retry()
+            self.fail("Growth.retry did not warn against retrying a growth that did not finish partially.")
+        except AssertionError:
+            pass
+
     def test_prepare_contributions_invalid_usage(self):
         qs = HttpResourceMock.objects.filter(id__in=[100])  # empty queryset
         contributions = self.contributing.prepare_contributions(qs)
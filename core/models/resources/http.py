@@ -9,7 +9,7 @@ import requests
 import jsonschema
 from jsonschema.exceptions import ValidationError as SchemaValidationError
 from urlobject import URLObject
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 from selenium import webdriver
 from selenium.webdriver.common.desired_capabilities import DesiredCapabilities
 
@@ -58,6 +58,10 @@ class HttpResource(Resource):
         "args": {},
         "kwargs": {}
     }
+    HTML_PARSER = "html.parser"  # "lxml" and "html5lib" are faster or more lenient when installed
+    HTML_PARSE_ONLY = None  # SoupStrainer arguments to only build a tree of matching elements
+    CONCAT_ARGS_MAX_SIZE = None  # maximum amount of concatenated args that the source accepts in a single request
+    CONCAT_ARGS_MAX_LENGTH = 2000  # maximum URL encoded length of concatenated args to stay within URL length limits
 
     #######################################################
     # PUBLIC FUNCTIONALITY
@@ -139,11 +143,26 @@ class HttpResource(Resource):
             if content_type == "application/json":
                 return content_type, json.loads(self.body)
             elif content_type == "text/html":
-                return content_type, BeautifulSoup(self.body, "html.parser")
+                return content_type, self.soup
             else:
                 return content_type, None
         return None, None
 
+    @property
+    def soup(self):
+        """
+        Parses the body with HTML_PARSER on first access. The tree gets reused until the body changes.
+        When HTML_PARSE_ONLY is set only elements matching these SoupStrainer arguments are parsed.
+
+        :return: BeautifulSoup
+        """
+        body = self.body or ""
+        if getattr(self, "_soup_body", None) is not body:
+            parse_only = SoupStrainer(**self.HTML_PARSE_ONLY) if self.HTML_PARSE_ONLY else None
+            self._soup = BeautifulSoup(body, self.HTML_PARSER, parse_only=parse_only)
+            self._soup_body = body
+        return self._soup
+
     @property
     def meta(self):
         """
@@ -452,7 +471,6 @@ class BrowserResource(HttpResource):  # TODO: write tests
         self.head = dict()
         self.status = 1
         self.body = response.page_source
-        self.soup = BeautifulSoup(self.body, "html.parser")
 
     @property
     def success(self):
@@ -481,10 +499,6 @@ class BrowserResource(HttpResource):  # TODO: write tests
             return "application/json", self.transform(self.soup)
         return None, None
 
-    def __init__(self, *args, **kwargs):
-        super(HttpResource, self).__init__(*args, **kwargs)
-        self.soup = BeautifulSoup(self.body if self.body else "", "html.parser")
-
     class Meta:
         abstract = True
 
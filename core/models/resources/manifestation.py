@@ -1,7 +1,10 @@
-from datetime import datetime
+from datetime import datetime, timedelta
 import logging
+import hashlib
 
-from django.db import models
+from django.conf import settings
+from django.db import models, transaction
+from django.core.cache import caches
 from django.contrib.contenttypes.fields import GenericForeignKey, ContentType
 
 from celery.result import AsyncResult
@@ -9,6 +12,8 @@ from json_field import JSONField
 
 from core.models.resources.resource import Resource
 from core.exceptions import DSProcessUnfinished
+from core.utils.cache import LRUCache
+from core.utils.helpers import ibatch
 
 
 log = logging.getLogger("datascope")
@@ -25,29 +30,171 @@ class Manifestation(Resource):
     task = models.CharField(max_length=255, null=True, blank=True)
     completed_at = models.DateTimeField(null=True, blank=True)
 
+    local_cache = LRUCache(
+        max_size=settings.MANIFESTATION_LOCAL_CACHE_SIZE,
+        timeout=settings.MANIFESTATION_LOCAL_CACHE_TIMEOUT
+    )
+
     @staticmethod
     def generate_config(allowed_config, **kwargs):
         config = {key: value for key, value in kwargs.items() if key in allowed_config}
         return config
 
-    def get_data(self, async=False):
+    @staticmethod
+    def get_cache_key(uri):
+        return "manifestation:" + hashlib.sha1(uri.encode("utf-8")).hexdigest()
+
+    @classmethod
+    def get_cached_data(cls, uri):
+        """
+        Looks up manifestation data for an uri in process memory and then in the shared manifestations cache.
+        Data found in the shared cache gets copied to process memory.
+
+        :param uri: the uri of the manifestation
+        :return: the manifestation data or None when it is not cached
+        """
+        cache_key = cls.get_cache_key(uri)
+        data = cls.local_cache.get(cache_key)
+        if data is not None:
+            return data
+        data = caches["manifestations"].get(cache_key)
+        if data is not None:
+            cls.local_cache.set(cache_key, data)
+        return data
+
+    def cache_data(self, data):
+        """
+        Stores data that fits in a single chunk in the cache tiers for as long as the data stays fresh.
+
+        :param data: the data of this manifestation
+        """
+        if not data or len(data) > settings.MANIFESTATION_CHUNK_SIZE or self.is_stale:
+            return
+        timeout = None
+        local_timeout = self.local_cache.timeout
+        if self.expires_at is not None:
+            timeout = max(int((self.expires_at - datetime.now()).total_seconds()), 1)
+            local_timeout = min(timeout, local_timeout) if local_timeout is not None else timeout
+        cache_key = self.get_cache_key(self.uri)
+        self.local_cache.set(cache_key, data, timeout=local_timeout)
+        caches["manifestations"].set(cache_key, data, timeout=timeout)
+
+    @property
+    def expires_at(self):
+        if settings.MANIFESTATION_TIMEOUT is None or self.completed_at is None:
+            return None
+        return self.completed_at + timedelta(seconds=settings.MANIFESTATION_TIMEOUT)
+
+    @property
+    def is_stale(self):
+        expires_at = self.expires_at
+        return expires_at is not None and expires_at <= datetime.now()
+
+    def revalidate(self, community=None):
+        """
+        Starts recalculating the data in the background. Current data gets served until the new data is ready.
+
+        :param community: (optional) a community that should calculate the data instead of the current community
+        :return: None
+        """
+        from core.tasks import get_manifestation_data
+        if community is not None:
+            self.community = community
+            self.save()
+        self.task = get_manifestation_data.delay(self.id)
+        self.save()
+
+    @property
+    def has_data(self):
+        return self.completed_at is not None or bool(self.data)
+
+    def store_data(self, data):
+        """
+        Stores data as ordered chunks of MANIFESTATION_CHUNK_SIZE items, which replace any previous data at once.
+        The data gets computed before the transaction starts to keep the transaction short.
+
+        :param data: iterable with data
+        :return: the amount of stored chunks
+        """
+        chunks = [
+            ManifestationChunk(manifestation=self, index=index, data=chunk)
+            for index, chunk in enumerate(ibatch(data, batch_size=settings.MANIFESTATION_CHUNK_SIZE))
+        ]
+        with transaction.atomic():
+            self.chunks.all().delete()
+            ManifestationChunk.objects.bulk_create(chunks)
+            Manifestation.objects.filter(id=self.id).update(data=None)
+        return len(chunks)
+
+    def prepare_data(self, async=False):
+        """
+        Makes sure that the data of this manifestation is stored or raises DSProcessUnfinished while it is calculating.
+        Stale data remains available while it gets recalculated in the background.
+
+        :param async: (optional) whether to calculate data in the background
+        :return: None
+        """
         from core.tasks import get_manifestation_data
-        if self.data:
-            return self.data
         if self.task:
             result = AsyncResult(self.task)
-            if not result.ready():
+            if result.ready() and not result.successful():
+                log.warning("Processing manifestation {} failed, trying again".format(self.id))
+                self.task = get_manifestation_data.delay(self.id)
+                self.save()
+            if not result.ready() or not result.successful():
+                if self.has_data:
+                    return  # stale data gets served while revalidating
                 raise DSProcessUnfinished("Manifest processing is not done")
-            self.data = result.result
+            self.task = None
+        elif self.has_data and not self.is_stale:
+            return
+        elif self.has_data and async:
+            self.revalidate()
+            return
         elif async:
             self.task = get_manifestation_data.delay(self.id)
             self.save()
             raise DSProcessUnfinished("Manifest started processing")
         else:
-            self.data = get_manifestation_data(self.id)
+            get_manifestation_data(self.id)
+        self.data = None  # get_manifestation_data stores the data in chunks
         self.completed_at = datetime.now()
         self.save()
-        return self.data
+
+    def get_page(self, cursor):
+        """
+        Returns the items of a single chunk together with the cursor of the chunk after it.
+
+        :param cursor: (int) the index of the chunk
+        :return: list of items and the next cursor or None when there are no more chunks
+        """
+        if self.data:  # data stored before chunks were introduced
+            start = cursor * settings.MANIFESTATION_CHUNK_SIZE
+            end = start + settings.MANIFESTATION_CHUNK_SIZE
+            return self.data[start:end], cursor + 1 if end < len(self.data) else None
+        chunk = self.chunks.filter(index=cursor).first()
+        if chunk is None:
+            return [], None
+        has_next = self.chunks.filter(index=cursor + 1).exists()
+        return chunk.data, cursor + 1 if has_next else None
+
+    def iterate_data(self):
+        """
+        Yields the items of this manifestation while loading a single chunk at a time.
+
+        :return: generator with items
+        """
+        cursor = 0
+        while cursor is not None:
+            items, cursor = self.get_page(cursor)
+            for item in items:
+                yield item
+
+    def get_data(self, async=False):
+        self.prepare_data(async=async)
+        data = list(self.iterate_data())
+        self.cache_data(data)
+        return data
 
     def __str__(self):
         return "Manifestation {} for {}".format(
@@ -61,3 +208,14 @@ class Manifestation(Resource):
             "service": self.uri,
             "data": self.get_data()
         }
+
+
+class ManifestationChunk(models.Model):
+
+    manifestation = models.ForeignKey(Manifestation, related_name="chunks")
+    index = models.PositiveIntegerField()
+    data = JSONField(null=True)
+
+    class Meta:
+        unique_together = ("manifestation", "index")
+        ordering = ("manifestation", "index")
@@ -38,6 +38,21 @@ class HttpResourceTestMixin(TestCase):
         self.assertEqual(content_type, "application/json")
         self.assertEqual(data, self.test_data)
 
+    def test_soup(self):
+        self.instance.head = {"content-type": "text/html; charset=utf-8"}
+        self.instance.body = "<html><body><p>first</p></body></html>"
+        self.instance.status = 200
+        content_type, soup = self.instance.content
+        self.assertEqual(content_type, "text/html")
+        self.assertEqual(soup.find("p").text, "first")
+        self.assertIs(self.instance.content[1], soup)
+        self.instance.body = "<html><body><p>second</p><a>link</a></body></html>"
+        self.assertEqual(self.instance.soup.find("p").text, "second")
+        self.instance.HTML_PARSE_ONLY = {"name": "a"}
+        self.instance.body = "<html><body><p>third</p><a>link</a></body></html>"
+        self.assertIsNone(self.instance.soup.find("p"))
+        self.assertEqual(self.instance.soup.find("a").text, "link")
+
     def test_parameters(self):
         self.assertIsInstance(self.instance.parameters(), dict)
 
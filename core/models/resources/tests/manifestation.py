@@ -0,0 +1,76 @@
+from __future__ import unicode_literals, absolute_import, print_function, division
+
+from datetime import datetime
+
+from mock import patch
+
+from django.test import TestCase
+from django.test.utils import override_settings
+
+from core.models.resources.manifestation import Manifestation
+from core.tests.mocks.community import CommunityMock
+from core.tests.mocks.celery import MockAsyncResultError
+from core.exceptions import DSProcessUnfinished
+
+
+@override_settings(MANIFESTATION_CHUNK_SIZE=2)
+class TestManifestation(TestCase):
+
+    fixtures = ["test-community"]
+
+    def setUp(self):
+        super(TestManifestation, self).setUp()
+        self.instance = Manifestation.objects.create(
+            uri="/mock/test?include_odd=1",
+            community=CommunityMock.objects.get(id=3),
+            config={}
+        )
+
+    def test_store_data(self):
+        self.instance.data = ["legacy"]
+        self.instance.save()
+        self.assertEqual(self.instance.store_data(iter(range(5))), 3)
+        self.assertEqual(list(self.instance.chunks.values_list("index", flat=True)), [0, 1, 2])
+        self.instance.refresh_from_db()
+        self.assertIsNone(self.instance.data)
+        self.assertEqual(self.instance.store_data([]), 0)
+        self.assertFalse(self.instance.chunks.exists())
+
+    def test_store_data_failure(self):
+        self.instance.store_data(range(5))
+
+        def failing_data():
+            yield 5
+            raise ValueError("Computation failed")
+
+        self.assertRaises(ValueError, self.instance.store_data, failing_data())
+        self.assertEqual(list(self.instance.iterate_data()), [0, 1, 2, 3, 4])
+
+    def test_get_page(self):
+        self.instance.store_data(range(5))
+        self.assertEqual(self.instance.get_page(0), ([0, 1], 1))
+        self.assertEqual(self.instance.get_page(2), ([4], None))
+        self.assertEqual(self.instance.get_page(3), ([], None))
+        self.assertEqual(list(self.instance.iterate_data()), [0, 1, 2, 3, 4])
+
+    def test_get_page_legacy_data(self):
+        self.instance.data = [0, 1, 2]
+        self.assertEqual(self.instance.get_page(0), ([0, 1], 1))
+        self.assertEqual(self.instance.get_page(1), ([2], None))
+        self.assertEqual(list(self.instance.iterate_data()), [0, 1, 2])
+
+    @patch("core.tasks.get_manifestation_data.delay", return_value="retry-id")
+    @patch("core.models.resources.manifestation.AsyncResult", return_value=MockAsyncResultError)
+    def test_prepare_data_failed_task(self, async_result, get_manifestation_data_delay):
+        self.instance.task = "failed-id"
+        self.instance.save()
+        self.assertRaises(DSProcessUnfinished, self.instance.prepare_data, async=True)
+        get_manifestation_data_delay.assert_called_once_with(self.instance.id)
+        self.assertEqual(Manifestation.objects.get(id=self.instance.id).task, "retry-id")
+        # Stale data gets served while the failed task gets dispatched again
+        self.instance.task = "failed-id"
+        self.instance.completed_at = datetime.now()
+        self.instance.save()
+        self.instance.prepare_data(async=True)
+        self.assertEqual(get_manifestation_data_delay.call_count, 2)
+        self.assertEqual(self.instance.task, "retry-id")
@@ -1,6 +1,6 @@
 from __future__ import unicode_literals, absolute_import, print_function, division
 
-from copy import deepcopy
+from types import MappingProxyType
 
 from core.models.organisms import Individual
 from core.processors.rank import RankProcessor
@@ -13,6 +13,7 @@ class ComparisonProcessor(RankProcessor):
         assert "$reference" in config or "reference" in config or "_reference" in config, \
             "Expected a reference configuration to make comparisons with in ComparisonProcessor"
         self.reference = Individual.objects.get(id=int(self.config.reference))
+        self.reference_view = MappingProxyType(self.reference.properties)
 
     def get_hook_arguments(self, individual):
-        return (deepcopy(individual), deepcopy(self.reference.properties),)
+        return (MappingProxyType(individual), self.reference_view,)
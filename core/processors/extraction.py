@@ -3,17 +3,53 @@ import six
 
 import logging
 from copy import copy
+from functools import lru_cache
 
 from datascope.configuration import DEFAULT_CONFIGURATION
 from core.processors.base import Processor
 from core.exceptions import DSNoContent
 from core.utils.configuration import ConfigurationProperty
-from core.utils.data import reach
+from core.utils.data import compile_reach
 
 
 log = logging.getLogger("datascope")
 
 
+def compile_expression(expression):
+    return compile(expression, "<objective>", "eval") if expression else None
+
+
+@lru_cache(maxsize=256)
+def compile_json_objective(at, context, objective):
+    """
+    Compiles the paths of a JSON objective into functions that reach for these paths.
+    Context and objective are tuples of name and path pairs, which makes it possible to cache per objective.
+
+    :return: tuple with the compiled at, context and objective
+    """
+    return (
+        compile_reach(at),
+        tuple((name, compile_reach(path)) for name, path in context),
+        tuple((name, compile_reach(path)) for name, path in objective)
+    )
+
+
+@lru_cache(maxsize=256)
+def compile_html_objective(at, context, objective):
+    """
+    Compiles the Python expressions of a HTML objective into code objects.
+    Context and objective are tuples of name and expression pairs, which makes it possible to cache per objective.
+    Expressions that are falsy are kept as values instead of getting compiled.
+
+    :return: tuple with the compiled at, context and objective
+    """
+    return (
+        compile_expression(at),
+        tuple((name, expression, compile_expression(expression)) for name, expression in context),
+        tuple((name, expression, compile_expression(expression)) for name, expression in objective)
+    )
+
+
 class ExtractProcessor(Processor):
 
     config = ConfigurationProperty(
@@ -28,6 +64,7 @@ class ExtractProcessor(Processor):
         self._at = None
         self._context = {}
         self._objective = {}
+        self._fingerprint = None
         if "_objective" in config or "objective" in config:
             self.load_objective(self.config.objective)
 
@@ -44,6 +81,11 @@ class ExtractProcessor(Processor):
             "ExtractProcessor did not load elements to start with from its objective {}. " \
             "Make sure that '@' is specified".format(objective)
         assert self._objective, "No objectives loaded from objective {}".format(objective)
+        self._fingerprint = (
+            self._at,
+            tuple(sorted(six.iteritems(self._context))),
+            tuple(sorted(six.iteritems(self._objective)))
+        )
 
     def pass_resource_through(self, resource):
         mime_type, data = resource.content
@@ -63,11 +105,13 @@ class ExtractProcessor(Processor):
             raise TypeError("Extract processor does not support content_type {}".format(content_type))
 
     def application_json(self, data):
+        reach_at, reach_context, reach_objective = compile_json_objective(*self._fingerprint)
+
         context = {}
-        for name, objective in six.iteritems(self._context):
-            context[name] = reach(objective, data)
+        for name, reach_path in reach_context:
+            context[name] = reach_path(data)
 
-        nodes = reach(self._at, data)
+        nodes = reach_at(data)
         if isinstance(nodes, dict):
             nodes = six.itervalues(nodes)
 
@@ -76,22 +120,25 @@ class ExtractProcessor(Processor):
 
         for node in nodes:
             result = copy(context)
-            for name, objective in six.iteritems(self._objective):
-                result[name] = reach(objective, node)
+            for name, reach_path in reach_objective:
+                result[name] = reach_path(node)
             yield result
 
     def text_html(self, soup):  # soup used in eval!
+        at_code, context_code, objective_code = compile_html_objective(*self._fingerprint)
+        namespace = dict(globals(), soup=soup)
 
         context = {}
-        for name, objective in six.iteritems(self._context):
-            context[name] = eval(objective) if objective else objective
+        for name, expression, code in context_code:
+            context[name] = eval(code, namespace) if code is not None else expression
 
-        at = elements = eval(self._at)
+        at = elements = eval(at_code, namespace)
         if not isinstance(at, list):
             elements = [at]
 
         for el in elements:  # el used in eval!
+            namespace["el"] = el
             result = copy(context)
-            for name, objective in six.iteritems(self._objective):
-                result[name] = eval(objective) if objective else objective
+            for name, expression, code in objective_code:
+                result[name] = eval(code, namespace) if code is not None else expression
             yield result
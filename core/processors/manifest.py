@@ -1,19 +1,64 @@
 import logging
 
+from celery import chord
 from celery.result import AsyncResult, states as TaskStates
 
 from datascope.configuration import DEFAULT_CONFIGURATION
 from core.models.organisms.individual import Individual
 from core.models.resources.manifestation import Manifestation
-from core.tasks import manifest, manifest_serie
+from core.tasks import manifest, manifest_serie, merge_manifest_results
+from core.tasks.manifestation import get_unique_manifestations
 from core.processors.base import Processor
 from core.utils.configuration import ConfigurationProperty
+from core.utils.helpers import ibatch, get_any_model
 from core.exceptions import DSProcessUnfinished, DSProcessError
 
 
 log = logging.getLogger("datascope")
 
 
+class ManifestFanOut(object):
+    """
+    Stands in for a manifest_serie signature. Called directly it manifests all args and kwargs in one go.
+    When delayed the unique manifestations get spread over a chord with a manifest_serie task per batch.
+    The AsyncResult of the chord returns merged results and calls the link when all batches are done.
+    The link_error gets called when any of the batches fails.
+    """
+
+    def __init__(self, config, community, batch_size, link=None, link_error=None):
+        self.config = config
+        self.community = community
+        self.batch_size = batch_size
+        self.link = link
+        self.link_error = link_error
+
+    def set(self, link=None, link_error=None):
+        return ManifestFanOut(self.config, self.community, self.batch_size, link=link, link_error=link_error)
+
+    def __call__(self, args_list, kwargs_list):
+        return manifest_serie(args_list, kwargs_list, config=self.config)
+
+    def delay(self, args_list, kwargs_list):
+        community_model = get_any_model(self.community)
+        args_list, kwargs_list = get_unique_manifestations(community_model, args_list, kwargs_list)
+        header = [
+            manifest_serie.s(
+                [args for args, kwargs in batch],
+                [kwargs for args, kwargs in batch],
+                config=self.config
+            )
+            for batch in ibatch(zip(args_list, kwargs_list), batch_size=self.batch_size)
+        ]
+        body = merge_manifest_results.s()
+        if self.link is not None:
+            body = body.set(link=self.link)
+        if self.link_error is not None:
+            body = body.set(link_error=self.link_error)
+        if not header:
+            return body.delay([])
+        return chord(header)(body)
+
+
 class ManifestProcessor(Processor):
 
     ARGS_BATCH_METHODS = ['manifest_mass']
@@ -55,6 +100,8 @@ class ManifestProcessor(Processor):
 
     @property
     def manifest_mass(self):
-        return manifest_serie.s(
-            config=self.config.to_dict(private=True, protected=True)
+        return ManifestFanOut(
+            config=self.config.to_dict(private=True, protected=True),
+            community=self.config.community,
+            batch_size=self.config.batch_size
         )
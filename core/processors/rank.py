@@ -1,15 +1,19 @@
 from __future__ import unicode_literals, absolute_import, print_function, division
-# noinspection PyUnresolvedReferences
-from six.moves import reduce
 import six
 
-from itertools import islice
-from copy import deepcopy
+import json
+import heapq
+from types import MappingProxyType
+
+import numpy as np
+
+from django.conf import settings
+from django.core.cache import caches
 
 from datascope.configuration import DEFAULT_CONFIGURATION
 from core.processors.base import Processor
 from core.utils.configuration import ConfigurationProperty
-from core.utils.helpers import merge_iter
+from core.utils.helpers import ibatch
 
 
 class RankProcessor(Processor):
@@ -21,57 +25,180 @@ class RankProcessor(Processor):
         namespace="rank_processor"
     )
 
+    FEATURE_STORE = None  # name of a cache that stores hook values when hooks only depend on the individual
+    FEATURE_IDENTIFIER = None  # key of individuals that identifies them in the FEATURE_STORE
+
     def get_hook_arguments(self, individual):
-        return (deepcopy(individual),)
+        """
+        Returns the arguments for hooks. Individuals are passed as read-only views instead of copies.
 
-    def hooks(self, individuals):
+        :param individual: the individual to rank
+        :return: tuple with hook arguments
+        """
+        return (MappingProxyType(individual),)
+
+    def call_hook(self, hook, individual):
+        """
+        Calls a hook for an individual. Read-only views don't protect nested data,
+        so in DEBUG mode an AssertionError gets raised when a hook changes the individual anyway.
+
+        :param hook: the hook method
+        :param individual: the individual to rank
+        :return: the result of the hook
+        """
+        if not settings.DEBUG:
+            return hook(*self.get_hook_arguments(individual))
+        fingerprint = json.dumps(individual, sort_keys=True, default=str)
+        result = hook(*self.get_hook_arguments(individual))
+        assert fingerprint == json.dumps(individual, sort_keys=True, default=str), \
+            "Hook {} changed the individual it ranked".format(hook.__name__)
+        return result
+
+    def get_hooks(self):
+        """
+        Returns the hook methods that are enabled in the configuration together with their weights.
+        Hooks with weights that are not numbers get left out.
+
+        :return: list of hook methods and a NumPy array with their weights
+        """
         config_dict = self.config.to_dict()
-        hooks = [
-            getattr(self, hook[1:])
-            for hook, weight in six.iteritems(config_dict)  # config gets whitelisted by Community
-            if isinstance(hook, str) and hook.startswith("$") and callable(getattr(self, hook[1:], None)) and weight
-        ]
-        sort_key = lambda el: el["ds_rank"].get("rank", 0)
-        results = []
-        batch = []
-
-        def flush_batch(batch, result_size):
-            sorted_batch = sorted(batch, key=sort_key, reverse=True)[:result_size]
-            results.append(sorted_batch)
-
-        for idx, individual in enumerate(individuals):
-            # Get ranks from modules
-            rank_info = {hook.__name__: {"rank": 0.0} for hook in hooks}
-            for hook in hooks:
-                hook_name = hook.__name__
-                try:
-                    hook_result = hook(*self.get_hook_arguments(individual))
-                    module_value = float(hook_result)
-                    module_weight = float(config_dict["$"+hook_name])
-                except (ValueError, TypeError):
-                    continue
-                if not module_value:
+        hooks = []
+        weights = []
+        for hook, weight in six.iteritems(config_dict):  # config gets whitelisted by Community
+            if not isinstance(hook, str) or not hook.startswith("$") or not weight:
+                continue
+            method = getattr(self, hook[1:], None)
+            if not callable(method):
+                continue
+            try:
+                weights.append(float(weight))
+            except (ValueError, TypeError):
+                continue
+            hooks.append(method)
+        return hooks, np.array(weights, dtype=np.float64)
+
+    def get_hook_value(self, hook, individual):
+        try:
+            return float(self.call_hook(hook, individual))
+        except (ValueError, TypeError):
+            return 0.0
+
+    def get_feature_keys(self, batch):
+        """
+        Returns the FEATURE_STORE keys of individuals in a batch.
+        Keys consist of the identity of an individual and the kernel_version configuration,
+        which the community sets to a version of the content that gets ranked.
+        Individuals without an identity get None as key, because their hook values can't be stored.
+
+        :param batch: list of individuals
+        :return: list with a key per individual or None when hook values can't be stored at all
+        """
+        version = getattr(self.config, "kernel_version", None)
+        if not self.FEATURE_STORE or not self.FEATURE_IDENTIFIER or version is None:
+            return None
+        feature_keys = []
+        for individual in batch:
+            identity = individual.get(self.FEATURE_IDENTIFIER)
+            feature_keys.append(
+                "{}:{}:{}".format(self.__class__.__name__, version, identity) if identity is not None else None
+            )
+        return feature_keys
+
+    def get_hook_values(self, batch, hooks):
+        """
+        Calls all hooks for all individuals in a batch and returns the results as columns of a NumPy array.
+        Results that are not numbers become zero.
+        When FEATURE_STORE is set hook values get read from and written to that cache
+        per individual identity and kernel version, so other weights for the same individuals don't call hooks again.
+
+        :param batch: list of individuals
+        :param hooks: list of hook methods
+        :return: NumPy array with a row per individual and a column per hook
+        """
+        values = np.zeros((len(batch), len(hooks)), dtype=np.float64)
+        feature_keys = self.get_feature_keys(batch)
+        if feature_keys is None:
+            for row, individual in enumerate(batch):
+                for column, hook in enumerate(hooks):
+                    values[row, column] = self.get_hook_value(hook, individual)
+            return values
+
+        feature_store = caches[self.FEATURE_STORE]
+        features = feature_store.get_many([feature_key for feature_key in feature_keys if feature_key is not None])
+        missing_features = {}
+        for row, individual in enumerate(batch):
+            feature_key = feature_keys[row]
+            individual_features = features.get(feature_key, {})
+            is_missing = False
+            for column, hook in enumerate(hooks):
+                if hook.__name__ in individual_features:
+                    values[row, column] = individual_features[hook.__name__]
                     continue
-                rank_info[hook_name] = {
-                    "rank": module_value * module_weight,
-                    "value": module_value,
-                    "weight": module_weight
-                }
-            # Aggregate all ranks to a single rank
-            hook_rankings = [ranking for ranking in six.itervalues(rank_info) if ranking["rank"]]
-            if hook_rankings:
-                rank_info["rank"] = reduce(
-                    lambda reduced, hook_rank_info: reduced * hook_rank_info["rank"],
-                    hook_rankings,
-                    1
-                )
-            # Set info on individual and write batch to results when appropriate
-            individual['ds_rank'] = rank_info
-            if not idx % self.config.batch_size and len(batch):
-                flush_batch(batch, self.config.result_size)
-                batch = []
-            # Append ranked individual to batch
-            batch.append(individual)
-
-        flush_batch(batch, self.config.result_size)
-        return islice(merge_iter(*results, key=sort_key, reversed=True), self.config.result_size)
+                value = self.get_hook_value(hook, individual)
+                values[row, column] = value
+                individual_features[hook.__name__] = value
+                is_missing = True
+            if is_missing and feature_key is not None:
+                missing_features[feature_key] = individual_features
+        if missing_features:
+            feature_store.set_many(missing_features)
+        return values
+
+    @staticmethod
+    def get_top_indices(ranks, size):
+        """
+        Returns the indices of the highest ranks in descending order of rank.
+        Equal ranks keep their original order like a stable sort would.
+
+        :param ranks: NumPy array with ranks
+        :param size: the amount of indices to return
+        :return: NumPy array with indices
+        """
+        if size < len(ranks):
+            threshold = ranks[np.argpartition(-ranks, size - 1)[size - 1]]
+            above = np.flatnonzero(ranks > threshold)
+            ties = np.flatnonzero(ranks == threshold)[:size - len(above)]
+            ranks_indices = np.concatenate([above, ties])
+        else:
+            ranks_indices = np.arange(len(ranks))
+        return ranks_indices[np.argsort(-ranks[ranks_indices], kind="mergesort")]
+
+    def rank_batches(self, individuals, hooks, weights):
+        """
+        Ranks individuals per batch and yields the individuals of each batch that can make it into the results.
+
+        :param individuals: iterable of individuals to rank
+        :param hooks: list of hook methods
+        :param weights: NumPy array with weights of the hooks
+        :return: generator yielding individuals with ds_rank annotations
+        """
+        hook_names = [hook.__name__ for hook in hooks]
+        for batch in ibatch(individuals, self.config.batch_size):
+            # Get ranks from modules and aggregate them to a single rank with a product over non-zero ranks
+            values = self.get_hook_values(batch, hooks)
+            module_ranks = values * weights
+            is_ranked = module_ranks != 0
+            ranks = np.where(is_ranked, module_ranks, 1.0).prod(axis=1)
+            has_rank = is_ranked.any(axis=1)
+            ranks[~has_rank] = 0.0
+            # Set info on the individuals that can make it into the results
+            for index in self.get_top_indices(ranks, self.config.result_size):
+                rank_info = {hook_name: {"rank": 0.0} for hook_name in hook_names}
+                for column in np.flatnonzero(is_ranked[index]):
+                    rank_info[hook_names[column]] = {
+                        "rank": float(module_ranks[index, column]),
+                        "value": float(values[index, column]),
+                        "weight": float(weights[column])
+                    }
+                if has_rank[index]:
+                    rank_info["rank"] = float(ranks[index])
+                individual = batch[index]
+                individual['ds_rank'] = rank_info
+                yield individual
+
+    def hooks(self, individuals):
+        hooks, weights = self.get_hooks()
+        sort_key = lambda el: el["ds_rank"].get("rank", 0)
+        # A bounded heap keeps the top results, equal ranks keep their original order
+        ranked = self.rank_batches(individuals, hooks, weights)
+        return iter(heapq.nlargest(self.config.result_size, ranked, key=sort_key))
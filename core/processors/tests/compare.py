@@ -30,8 +30,11 @@ class TestCompareProcessor(TestCase):
     def test_get_hook_arguments(self):
         ind = Individual.objects.get(id=2)
         args = self.prc.get_hook_arguments(ind.properties)
-        self.assertEqual(args, (ind.properties, self.prc.reference.properties))
-        ind.properties["context"] = "changed"
-        self.prc.reference.properties["context"] = "changed"
+        self.assertEqual([dict(arg) for arg in args], [ind.properties, self.prc.reference.properties])
         for arg in args:
+            try:
+                arg["context"] = "changed"
+                self.fail("Hook arguments should be read-only")
+            except TypeError:
+                pass
             self.assertEqual(arg["context"], "nested value")
@@ -1,7 +1,7 @@
 from __future__ import unicode_literals, absolute_import, print_function, division
 
 from bs4 import BeautifulSoup
-from mock import Mock
+from mock import Mock, patch
 from types import GeneratorType
 
 from django.test import TestCase
@@ -51,6 +51,15 @@ class TestExtractProcessor(TestCase):
         self.assertEqual(self.html_prc._context, {"page": "soup.find('title').text"})
         self.assertEqual(self.html_prc._objective, {"text": "el.text", "link": "el['href']"})
 
+    def test_compiled_objective_cache(self):
+        other_prc = ExtractProcessor(config={"objective": dict(self.json_obj)})
+        self.assertEqual(other_prc._fingerprint, self.json_prc._fingerprint)
+        list(self.json_prc.application_json(self.json_records))
+        with patch("core.processors.extraction.compile_reach") as compile_reach:
+            rsl = other_prc.application_json(self.json_records)
+            self.assertEqual(list(rsl), MOCK_JSON_DATA)
+            compile_reach.assert_not_called()
+
     def test_extract(self):
         self.html_prc.text_html = Mock()
         self.html_prc.application_json = Mock()
@@ -4,11 +4,15 @@ from six.moves import reduce
 
 from collections import Iterator, OrderedDict
 from operator import itemgetter
+from copy import deepcopy
 
 from mock import patch
+import numpy as np
 
 from django.test import TestCase
+from django.core.cache import caches
 
+from core.processors.rank import RankProcessor
 from core.tests.mocks.processor import MockRankProcessor
 
 
@@ -197,24 +201,19 @@ class TestRankProcessor(TestCase):
         names = list(map(itemgetter('name'), ranking))
         self.assertEqual(names, ['lowest', 'lowest-2'], "Order of ranked dictionaries is not correct.")
 
-    @patch('core.processors.rank.islice')
-    def test_order(self, islice_patch):
+    def test_order(self):
         instance = MockRankProcessor({
-            "result_size": 2,
+            "result_size": 6,
             "batch_size": 3,
             "$rank_by_value": 1
         })
-        instance.hooks(self.test_content)
-        islice_patch.assert_called_once()
-        args, kwargs = islice_patch.call_args
-        order = list(args[0])
+        order = list(instance.hooks(self.test_content))
         order_keys = list(map(itemgetter('name'), order))
         self.assertEqual(
             order_keys,
-            ['highest', 'highest-of-triple', 'double-1', 'double-2', 'lowest-included', 'lowest'],
+            ['highest', 'highest-of-triple', 'double-1', 'double-2', 'under-double', 'lowest-included'],
             "Order of ranked dictionaries is not correct or splitting it batches did not work."
         )
-        self.assertEqual(args[1], 2, "Slice should be the size of the result")
 
     def test_floats_as_values(self):
         instance = MockRankProcessor({
@@ -238,3 +237,48 @@ class TestRankProcessor(TestCase):
         ranking = list(instance.hooks(self.test_content))
         names = list(map(itemgetter('name'), ranking))
         self.assertEqual(names, ['double-1', 'double-2'], "Order of ranked dictionaries is not correct.")
+
+    def test_get_top_indices(self):
+        ranks = np.array([0.0, 8.0, 1.0, 8.0, 9.0, 8.0])
+        self.assertEqual(list(RankProcessor.get_top_indices(ranks, 3)), [4, 1, 3])
+        self.assertEqual(list(RankProcessor.get_top_indices(ranks, 1)), [4])
+        self.assertEqual(list(RankProcessor.get_top_indices(ranks, 10)), [4, 1, 3, 5, 2, 0])
+
+    def test_feature_store(self):
+        instance = MockRankProcessor({
+            "result_size": 2,
+            "batch_size": 3,
+            "$rank_by_value": 1,
+            "kernel_version": "1-2017-03-01T10:00:00"
+        })
+        instance.FEATURE_STORE = "features"
+        instance.FEATURE_IDENTIFIER = "name"
+        caches["features"].clear()
+        with patch.object(MockRankProcessor, "rank_by_value", return_value=1, autospec=True) as rank_by_value:
+            list(instance.hooks(deepcopy(self.test_content)))
+            self.assertEqual(rank_by_value.call_count, len(self.test_content))
+            list(instance.hooks(deepcopy(self.test_content)))
+            self.assertEqual(rank_by_value.call_count, len(self.test_content))
+            # Individuals without identity don't get stored
+            anonymous_content = [{"value": 1}]
+            list(instance.hooks(deepcopy(anonymous_content)))
+            list(instance.hooks(deepcopy(anonymous_content)))
+            self.assertEqual(rank_by_value.call_count, len(self.test_content) + 2)
+            # Another kernel version calls hooks again
+            instance.config.kernel_version = "1-2017-03-02T10:00:00"
+            list(instance.hooks(deepcopy(self.test_content)))
+            self.assertEqual(rank_by_value.call_count, 2 * len(self.test_content) + 2)
+
+    def test_feature_store_without_version(self):
+        instance = MockRankProcessor({
+            "result_size": 2,
+            "batch_size": 3,
+            "$rank_by_value": 1
+        })
+        instance.FEATURE_STORE = "features"
+        instance.FEATURE_IDENTIFIER = "name"
+        caches["features"].clear()
+        with patch.object(MockRankProcessor, "rank_by_value", return_value=1, autospec=True) as rank_by_value:
+            list(instance.hooks(deepcopy(self.test_content)))
+            list(instance.hooks(deepcopy(self.test_content)))
+            self.assertEqual(rank_by_value.call_count, 2 * len(self.test_content))
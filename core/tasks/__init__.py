@@ -1 +1,2 @@
-from .manifestation import get_manifestation_data, manifest, manifest_serie
+from .manifestation import get_manifestation_data, manifest, manifest_serie, merge_manifest_results
+from .community import grow_community, abort_community
@@ -0,0 +1,64 @@
+import logging
+
+from celery import current_app as app
+
+from django.db import transaction
+
+from core.models.organisms.states import CommunityState
+from core.utils.helpers import get_any_model
+from core.exceptions import DSProcessUnfinished, DSProcessError
+
+
+log = logging.getLogger("datascope")
+
+
+@app.task(name="core.grow_community", bind=True, max_retries=10, default_retry_delay=1)
+def grow_community(self, community_type, community_id, growth_id):
+    """
+    Gets linked to the background task of a Growth and advances the community as soon as that task completes.
+    The community is left alone if another process already advanced it beyond given growth.
+    When the task completes before the community stored that it began the growth, this task tries again.
+
+    :param community_type: (string) name of the Community model
+    :param community_id: (int) id of the community to grow
+    :param growth_id: (int) id of the Growth that completed
+    :return: None
+    """
+    from core.models.organisms.growth import Growth, GrowthState
+    community_model = get_any_model(community_type)
+    community = community_model.objects.get(id=community_id)
+    growth = Growth.objects.get(id=growth_id)
+    if community.current_growth_id != growth_id or growth.state != GrowthState.PROCESSING:
+        if growth.state in [GrowthState.NEW, GrowthState.RETRY]:
+            raise self.retry()
+        log.info("Community {} already advanced beyond growth {}".format(community_id, growth_id))
+        return
+    try:
+        community.grow_with_lock()
+    except DSProcessUnfinished:
+        pass
+    except DSProcessError as exc:
+        log.error("Could not advance community {}: {}".format(community_id, exc))
+
+
+@app.task(name="core.abort_community")
+def abort_community(community_type, community_id, growth_id):
+    """
+    Gets linked as error callback to the background task of a Growth.
+    It aborts the community when that task fails, so the community doesn't wait for the growth forever.
+
+    :param community_type: (string) name of the Community model
+    :param community_id: (int) id of the community to abort
+    :param growth_id: (int) id of the Growth that failed
+    :return: None
+    """
+    from core.models.organisms.growth import Growth, GrowthState
+    community_model = get_any_model(community_type)
+    with transaction.atomic():
+        community = community_model.objects.select_for_update().get(id=community_id)
+        if community.state != CommunityState.ASYNC or community.current_growth_id != growth_id:
+            return
+        Growth.objects.filter(id=growth_id, state=GrowthState.PROCESSING).update(state=GrowthState.ERROR)
+        community.state = CommunityState.ABORTED
+        community.save()
+    log.error("Aborted community {} because the task of growth {} failed".format(community_id, growth_id))
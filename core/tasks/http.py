@@ -1,5 +1,6 @@
 import logging
-from time import sleep
+from time import sleep, time
+from urllib.parse import quote
 
 from celery import current_app as app
 
@@ -109,6 +110,58 @@ def send_serie(config, args_list, kwargs_list, session=None, method=None):
     return [success, errors]
 
 
+class ConcatArgsBatcher(object):
+    """
+    Concatenates args for send_mass into batches that adapt to the responses of a source.
+    Batches start at the configured size, capped by the maximum size of the resource,
+    and shrink when the source reports errors like maxlag or other server errors.
+    After a shrink batches grow back towards that maximum while responses stay fast and error free.
+    Batches never exceed the URL encoded length that the resource allows.
+    """
+
+    FAST_RESPONSE_DURATION = 2  # seconds
+
+    def __init__(self, size, symbol, max_size=None, max_length=None):
+        self.max_size = min(size, max_size) if max_size else size
+        self.size = self.max_size
+        self.symbol = symbol
+        self.max_length = max_length
+
+    def next_batch(self, args_list, start):
+        """
+        Concatenates args from start onwards into a batch that fits the current size and the maximum length.
+
+        :param args_list: list of args
+        :param start: the index of the first args in the batch
+        :return: the concatenated args and the amount of args in the batch
+        """
+        joined_slice = []
+        length = 0
+        for args in args_list[start:start + self.size]:
+            joined = self.symbol.join(map(str, args))
+            joined_length = len(quote(joined, safe="")) + (len(quote(self.symbol, safe="")) if joined_slice else 0)
+            if joined_slice and self.max_length and length + joined_length > self.max_length:
+                break
+            joined_slice.append(joined)
+            length += joined_length
+        return self.symbol.join(joined_slice), len(joined_slice)
+
+    def adapt(self, duration, error_statuses):
+        """
+        Halves the batch size when the source reports server errors or rate limits
+        and doubles it up to the maximum size when the last batch was fast and error free.
+
+        :param duration: seconds it took to send the last batch
+        :param error_statuses: HTTP statuses of resources that failed in the last batch
+        :return: the new batch size
+        """
+        if any(status is not None and status >= 500 or status == 429 for status in error_statuses):
+            self.size = max(1, self.size // 2)
+        elif not error_statuses and duration < self.FAST_RESPONSE_DURATION:
+            self.size = min(self.max_size, self.size * 2)
+        return self.size
+
+
 @app.task(name="core.send_mass")
 @load_config(defaults=DEFAULT_CONFIGURATION)
 @load_session()
@@ -117,32 +170,41 @@ def send_mass(config, args_list, kwargs_list, session=None, method=None):
 
     assert args_list and kwargs_list, "No args list and/or kwargs list given to send mass"
 
-    if config.concat_args_size:
-        # Set some vars based on config
-        symbol = config.concat_args_symbol
-        concat_size = config.concat_args_size
-        args_list_size = int(len(args_list) / concat_size) + 1
-        # Calculate new args_list and kwargs_list
-        # Arg list that are of the form [[1],[2],[3], ...] should become [[1|2|3], ...]
-        # Kwargs are assumed to remain similar across the list
-        prc_args_list = []
-        prc_kwargs_list = []
-        for index in range(0, args_list_size):
-            args_slice = args_list[index*concat_size:index*concat_size+concat_size]
-            joined_slice = []
-            for args in args_slice:
-                joined = symbol.join(map(str, args))
-                joined_slice.append(joined)
-            prc_args_list.append([symbol.join(joined_slice)])
-            prc_kwargs_list.append(kwargs_list[0])
-    else:
-        prc_args_list = args_list
-        prc_kwargs_list = kwargs_list
-
-    return send_serie(
-        prc_args_list,
-        prc_kwargs_list,
-        config=config,
-        method=method,
-        session=session
+    if not config.concat_args_size:
+        return send_serie(
+            args_list,
+            kwargs_list,
+            config=config,
+            method=method,
+            session=session
+        )
+
+    # Arg list that are of the form [[1],[2],[3], ...] should become [[1|2|3], ...]
+    # Kwargs are assumed to remain similar across the list
+    Resource = get_any_model(config.resource)
+    batcher = ConcatArgsBatcher(
+        config.concat_args_size,
+        config.concat_args_symbol,
+        max_size=Resource.CONCAT_ARGS_MAX_SIZE,
+        max_length=Resource.CONCAT_ARGS_MAX_LENGTH
     )
+    success = []
+    errors = []
+    start = 0
+    while start < len(args_list):
+        joined, batch_size = batcher.next_batch(args_list, start)
+        started_at = time()
+        scc, err = send_serie(
+            [[joined]],
+            [kwargs_list[0]],
+            config=config,
+            method=method,
+            session=session
+        )
+        duration = time() - started_at
+        success += scc
+        errors += err
+        error_statuses = Resource.objects.filter(id__in=err).values_list("status", flat=True) if err else []
+        batcher.adapt(duration, error_statuses)
+        start += batch_size
+    return [success, errors]
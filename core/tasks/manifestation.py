@@ -17,7 +17,7 @@ def get_manifestation_data(manifestation_id):
     manifestation = Manifestation.objects.get(id=manifestation_id)
     community = manifestation.community
     community.config = manifestation.config
-    return list(community.manifestation)
+    return manifestation.store_data(community.manifestation)
 
 
 @app.task(name="core.manifest")
@@ -47,13 +47,53 @@ def manifest(config, *args, **kwargs):
     return [success, errors]
 
 
+def get_unique_manifestations(community_model, args_list, kwargs_list):
+    """
+    Removes args and kwargs that lead to the same service path as args and kwargs earlier in the lists.
+
+    :param community_model: the Community model that should get manifested
+    :param args_list: list of args for manifest
+    :param kwargs_list: list of kwargs for manifest
+    :return: args list and kwargs list with unique service paths
+    """
+    service_paths = set()
+    unique_args_list = []
+    unique_kwargs_list = []
+    for args, kwargs in zip(args_list, kwargs_list):
+        service_path = CommunityView.get_full_path(community_model, "/".join(args), kwargs)
+        if service_path in service_paths:
+            continue
+        service_paths.add(service_path)
+        unique_args_list.append(args)
+        unique_kwargs_list.append(kwargs)
+    return unique_args_list, unique_kwargs_list
+
+
 @app.task(name="core.manifest_serie")
 @load_config(defaults=DEFAULT_CONFIGURATION)
 def manifest_serie(config, args_list, kwargs_list):
     success = []
     errors = []
+    community_model = get_any_model(config.community)
+    args_list, kwargs_list = get_unique_manifestations(community_model, args_list, kwargs_list)
     for args, kwargs in zip(args_list, kwargs_list):
         scc, err = manifest(config=config, *args, **kwargs)
         success += scc
         errors += err
     return [success, errors]
+
+
+@app.task(name="core.merge_manifest_results")
+def merge_manifest_results(results):
+    """
+    Merges the success and error lists that tasks of a manifest_serie fan out return into a single result.
+
+    :param results: list of success and error lists
+    :return: success and error lists
+    """
+    success = []
+    errors = []
+    for scc, err in results:
+        success += scc
+        errors += err
+    return [success, errors]
@@ -0,0 +1,49 @@
+from __future__ import unicode_literals, absolute_import, print_function, division
+
+from mock import patch
+
+from django.test import TestCase
+
+from core.models.organisms import Growth
+from core.models.organisms.growth import GrowthState
+from core.models.organisms.states import CommunityState
+from core.tasks.community import grow_community, abort_community
+from core.tests.mocks.community import CommunityMock
+
+
+class TestCommunityTasks(TestCase):
+
+    fixtures = ["test-community"]
+
+    def setUp(self):
+        super(TestCommunityTasks, self).setUp()
+        self.community = CommunityMock.objects.get(id=2)
+        self.growth = Growth.objects.get(id=2)
+        self.community.current_growth = self.growth
+        self.community.save()
+
+    @patch("core.tests.mocks.community.CommunityMock.grow_with_lock")
+    def test_grow_community(self, grow_with_lock):
+        grow_community("CommunityMock", self.community.id, self.growth.id)
+        grow_with_lock.assert_called_once_with()
+        grow_with_lock.reset_mock()
+        grow_community("CommunityMock", self.community.id, 1)
+        self.assertFalse(grow_with_lock.called)
+
+    @patch("core.tasks.community.grow_community.retry", side_effect=RuntimeError)
+    @patch("core.tests.mocks.community.CommunityMock.grow_with_lock")
+    def test_grow_community_new_growth(self, grow_with_lock, retry):
+        Growth.objects.filter(id=self.growth.id).update(state=GrowthState.NEW)
+        self.assertRaises(RuntimeError, grow_community, "CommunityMock", self.community.id, self.growth.id)
+        self.assertEqual(retry.call_count, 1)
+        self.assertFalse(grow_with_lock.called)
+
+    def test_abort_community(self):
+        abort_community("CommunityMock", self.community.id, self.growth.id)
+        self.assertEqual(CommunityMock.objects.get(id=self.community.id).state, CommunityState.ABORTED)
+        self.assertEqual(Growth.objects.get(id=self.growth.id).state, GrowthState.ERROR)
+
+    def test_abort_community_advanced(self):
+        abort_community("CommunityMock", self.community.id, 1)
+        self.assertEqual(CommunityMock.objects.get(id=self.community.id).state, CommunityState.ASYNC)
+        self.assertEqual(Growth.objects.get(id=self.growth.id).state, GrowthState.PROCESSING)
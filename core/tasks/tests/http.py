@@ -7,7 +7,7 @@ from django.test import TestCase
 from django.utils import six
 
 from datascope.configuration import MOCK_CONFIGURATION
-from core.tasks.http import send, send_serie, send_mass, get_resource_link, load_session
+from core.tasks.http import send, send_serie, send_mass, get_resource_link, load_session, ConcatArgsBatcher
 from core.utils.configuration import ConfigurationType
 from core.tests.mocks.requests import MockRequestsWithAgent, MockRequests
 from core.tests.mocks.http import HttpResourceMock
@@ -111,12 +111,48 @@ class TestSendMassTaskBase(TestHTTPTasksBase):
             config=self.config,
             session=MockRequests
         )
-        send_serie.assert_called_with(
-            [["1|2|3"], ["4|5|5|6"], ["7"]], [{}, {}, {}],
-            method=self.method,
-            config=self.config,
-            session=MockRequests
-        )
+        self.assertEqual(send_serie.call_count, 3)
+        for call, joined in zip(send_serie.call_args_list, ["1|2|3", "4|5|5|6", "7"]):
+            args, kwargs = call
+            self.assertEqual(args, ([[joined]], [{}],))
+            self.assertEqual(kwargs, {"method": self.method, "config": self.config, "session": MockRequests})
+
+
+class TestConcatArgsBatcher(TestCase):
+
+    def test_next_batch(self):
+        batcher = ConcatArgsBatcher(10, "|", max_size=3)
+        self.assertEqual(batcher.size, 3)
+        args_list = [[1], [2], [3], [4]]
+        self.assertEqual(batcher.next_batch(args_list, 0), ("1|2|3", 3,))
+        self.assertEqual(batcher.next_batch(args_list, 3), ("4", 1,))
+        # Encoded length limits the batch, but a batch always contains at least one args
+        batcher = ConcatArgsBatcher(10, "|", max_length=10)
+        self.assertEqual(batcher.next_batch([["aaaa"], ["bbbb"], ["cccc"]], 0), ("aaaa", 1,))
+        self.assertEqual(batcher.next_batch([["a a"], ["b"]], 0), ("a a|b", 2,))
+        self.assertEqual(batcher.next_batch([["aaaaaaaaaaaa"], ["b"]], 0), ("aaaaaaaaaaaa", 1,))
+
+    def test_adapt(self):
+        batcher = ConcatArgsBatcher(50, "|")
+        self.assertEqual(batcher.adapt(0.1, [503]), 25)
+        self.assertEqual(batcher.adapt(0.1, [429, 404]), 12)
+        # Slow batches or batches with other errors keep their size
+        self.assertEqual(batcher.adapt(10, []), 12)
+        self.assertEqual(batcher.adapt(0.1, [404]), 12)
+        # Fast batches without errors recover towards the maximum size
+        self.assertEqual(batcher.adapt(0.1, []), 24)
+        self.assertEqual(batcher.adapt(0.1, []), 48)
+        self.assertEqual(batcher.adapt(0.1, []), 50)
+        self.assertEqual(batcher.adapt(0.1, []), 50)
+        for _ in range(10):
+            batcher.adapt(0.1, [500])
+        self.assertEqual(batcher.size, 1)
+
+    def test_adapt_maximum_size(self):
+        batcher = ConcatArgsBatcher(10, "|", max_size=4)
+        self.assertEqual(batcher.adapt(0.1, [500]), 2)
+        self.assertEqual(batcher.adapt(0.1, []), 4)
+        self.assertEqual(batcher.adapt(0.1, []), 4)
 
 
 class TestSendMassTaskGet(TestSendMassTaskBase):
@@ -0,0 +1,30 @@
+from __future__ import unicode_literals, absolute_import, print_function, division
+
+from mock import patch
+
+from django.test import TestCase
+
+from core.tasks.manifestation import get_unique_manifestations, merge_manifest_results
+from core.tests.mocks.community import CommunityMock
+
+
+def get_full_path(community_class, query_path, query_parameters):
+    return "/{}/{}?{}".format(community_class.get_name(), query_path, sorted(query_parameters.items()))
+
+
+class TestManifestTasks(TestCase):
+
+    @patch("core.tasks.manifestation.CommunityView.get_full_path", side_effect=get_full_path)
+    def test_get_unique_manifestations(self, get_full_path_mock):
+        args_list, kwargs_list = get_unique_manifestations(
+            CommunityMock,
+            [["test"], ["test"], ["other"], ["test"]],
+            [{"$setting": 1}, {"$setting": 1}, {"$setting": 1}, {"$setting": 2}]
+        )
+        self.assertEqual(args_list, [["test"], ["other"], ["test"]])
+        self.assertEqual(kwargs_list, [{"$setting": 1}, {"$setting": 1}, {"$setting": 2}])
+        self.assertEqual(get_full_path_mock.call_count, 4)
+
+    def test_merge_manifest_results(self):
+        self.assertEqual(merge_manifest_results([[[1, 2], []], [[3], [4]]]), [[1, 2, 3], [4]])
+        self.assertEqual(merge_manifest_results([]), [[], []])
@@ -13,16 +13,19 @@ MockTask.attach_mock(MockTask, "delay")
 
 MockAsyncResultPartial = Mock(spec=AsyncResult)
 MockAsyncResultPartial.attach_mock(Mock(return_value=True), "ready")
+MockAsyncResultPartial.attach_mock(Mock(return_value=True), "successful")
 MockAsyncResultPartial.status = CeleryState.SUCCESS
 MockAsyncResultPartial.result = ([1, 2, 3], [4, 5],)
 
 MockAsyncResultSuccess = Mock(spec=AsyncResult)
 MockAsyncResultSuccess.attach_mock(Mock(return_value=True), "ready")
+MockAsyncResultSuccess.attach_mock(Mock(return_value=True), "successful")
 MockAsyncResultSuccess.status = CeleryState.SUCCESS
 MockAsyncResultSuccess.result = ([1, 2, 3], [],)
 
 MockAsyncResultError = Mock(spec=AsyncResult)
 MockAsyncResultError.attach_mock(Mock(return_value=True), "ready")
+MockAsyncResultError.attach_mock(Mock(return_value=False), "successful")
 MockAsyncResultError.status = CeleryState.FAILURE
 
 MockAsyncResultWaiting = Mock(spec=AsyncResult)
@@ -0,0 +1,24 @@
+from __future__ import unicode_literals, absolute_import, print_function, division
+
+import os
+import sys
+import subprocess
+
+from django.conf import settings
+from django.test import SimpleTestCase
+
+
+class TestAppStartup(SimpleTestCase):
+
+    def test_setup(self):
+        # A fresh interpreter imports the apps in the order that Django does, which reveals import cycles
+        environment = dict(os.environ, DJANGO_SETTINGS_MODULE=settings.SETTINGS_MODULE)
+        script = "import django; django.setup(); from django.core.urlresolvers import resolve; resolve('/data/v1/')"
+        process = subprocess.Popen(
+            [sys.executable, "-c", script],
+            env=environment,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE
+        )
+        stdout, stderr = process.communicate()
+        self.assertEqual(process.returncode, 0, stderr.decode("utf-8"))
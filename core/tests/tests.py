@@ -1,7 +1,11 @@
+from core.tests.startup import TestAppStartup
+
 from core.utils.tests.configuration import TestConfigurationType, TestConfigurationProperty, TestLoadConfigDecorator
 from core.utils.tests.data import TestPythonReach
 from core.utils.tests.image import TestImageGrid
 from core.utils.tests.helpers import TestUtilHelpers
+from core.utils.tests.profiling import TestMeasure
+from core.utils.tests.cache import TestLRUCache
 
 from core.processors.tests.resources import TestHttpResourceProcessor
 from core.processors.tests.extraction import TestExtractProcessor
@@ -15,10 +19,14 @@ from core.models.organisms.managers.tests.community import TestCommunityManager
 from core.models.organisms.tests.collective import TestCollective
 from core.models.organisms.tests.individual import TestIndividual
 from core.models.resources.tests.http import TestHttpResourceMock
+from core.models.resources.tests.manifestation import TestManifestation
 
 from core.tasks.tests.http import (TestSendMassTaskGet, TestSendMassTaskPost, TestSendTaskGet, TestSendTaskPost,
                                    TestSendSerieTaskGet, TestSendSerieTaskPost, TestGetResourceLink, TestLoadSession)
+from core.tasks.tests.manifestation import TestManifestTasks
+from core.tasks.tests.community import TestCommunityTasks
 
 from core.views.tests.collective import TestCollectiveView, TestCollectiveContentView
 from core.views.tests.individual import TestIndividualView, TestIndividualContentView
 from core.views.tests.community import TestCommunityView, TestHtmlCommunityView
+from core.views.tests.growth import TestGrowthView, TestCommunityTimelineView
@@ -6,12 +6,20 @@ from wiki_feed.urls import urlpatterns as wiki_feed_patterns
 from visual_translations.urls import urlpatterns as visual_translations_patterns
 from future_fashion.urls import urlpatterns as future_fashion_patterns
 from . import views
+# Models import core.views through core.tasks, so views that import Growth stay out of core.views
+from .views.growth import GrowthView, CommunityTimelineView
 
 urlpatterns = [
     url(r'^collective/(?P<pk>\d+)/content/$', views.CollectiveContentView.as_view(), name="collective-content"),
     url(r'^collective/(?P<pk>\d+)/$', views.CollectiveView.as_view(), name="collective"),
     url(r'^individual/(?P<pk>\d+)/content/$', views.IndividualContentView.as_view(), name="individual-content"),
     url(r'^individual/(?P<pk>\d+)/$', views.IndividualView.as_view(), name="individual"),
+    url(r'^growth/(?P<pk>\d+)/$', GrowthView.as_view(), name="growth"),
+    url(
+        r'^community/(?P<community>\w+)/(?P<pk>\d+)/timeline/$',
+        CommunityTimelineView.as_view(),
+        name="community-timeline"
+    ),
     url(r'^$', views.index, name="datascope-index"),
     url(r'^question/$', views.question, name="datascope-question")
 ]
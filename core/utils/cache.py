@@ -0,0 +1,50 @@
+from __future__ import unicode_literals, absolute_import, print_function, division
+
+from time import time
+from threading import Lock
+from collections import OrderedDict
+
+
+class LRUCache(object):
+    """
+    A small in-process cache that evicts the least recently used entries when it holds more than max_size entries.
+    Entries also expire when they are older than the timeout in seconds.
+    """
+
+    def __init__(self, max_size, timeout=None):
+        self.max_size = max_size
+        self.timeout = timeout
+        self.entries = OrderedDict()
+        self.lock = Lock()
+
+    def get(self, key, default=None):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return default
+            expires_at, value = entry
+            if expires_at is not None and expires_at <= time():
+                del self.entries[key]
+                return default
+            self.entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, timeout=None):
+        timeout = timeout if timeout is not None else self.timeout
+        expires_at = time() + timeout if timeout is not None else None
+        with self.lock:
+            self.entries[key] = (expires_at, value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+
+    def delete(self, key):
+        with self.lock:
+            self.entries.pop(key, None)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+    def __len__(self):
+        return len(self.entries)
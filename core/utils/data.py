@@ -1,7 +1,7 @@
 from __future__ import unicode_literals, absolute_import, print_function, division
 
 import json
-import copy
+from functools import lru_cache
 from collections import Counter
 
 
@@ -19,6 +19,20 @@ def reach(path, data):
     }
     "test.test" as path would return "second level test"
     while "test.1" as path would return "test1"
+
+    Use compile_reach directly when reaching for the same path many times.
+    """
+    return compile_reach(path)(data)
+
+
+@lru_cache(maxsize=1024)
+def compile_reach(path):
+    """
+    Parses a path once and returns a function that reaches for that path in given data the same way as reach does.
+    The returned function doesn't copy the data and functions get cached per path.
+
+    :param path: (string) the path to reach for
+    :return: function taking a data structure and returning the reached value or None
     """
     if path and path.startswith("$"):  # TODO: fix now that legacy is gone
         if len(path) > 1:
@@ -26,31 +40,28 @@ def reach(path, data):
         else:
             path = None
 
-    # First we check whether we really get a structure we can use
     if path is None:
-        return data
-    if not isinstance(data, (dict, list, tuple)):
-        raise TypeError("Reach needs dict, list or tuple as input, got {} instead".format(type(data)))
-
-    # We make a copy of the input for later reference
-    root = copy.deepcopy(data)
-
-    # We split the path and see how far we get with using it as key/index
-    try:
-        for part in path.split('.'):
-            if part.isdigit():
-                data = data[int(part)]
-            else:
-                data = data[part]
-        else:
-            return data
-
-    except (IndexError, KeyError, TypeError):
-        pass
-
-    # We try the path as key/index or return None.
-    path = int(path) if path.isdigit() else path
-    return root[path] if path in root else None
+        return lambda data: data
+
+    keys = tuple(int(part) if part.isdigit() else part for part in path.split('.'))
+    fallback_key = int(path) if path.isdigit() else path
+
+    def reach_path(data):
+        # First we check whether we really get a structure we can use
+        if not isinstance(data, (dict, list, tuple)):
+            raise TypeError("Reach needs dict, list or tuple as input, got {} instead".format(type(data)))
+        # We see how far we get with using the path parts as key/index
+        value = data
+        try:
+            for key in keys:
+                value = value[key]
+            return value
+        except (IndexError, KeyError, TypeError):
+            pass
+        # We try the path as key/index or return None.
+        return data[fallback_key] if fallback_key in data else None
+
+    return reach_path
 
 
 def interpolate(interpolate_path, source_path):
@@ -1,6 +1,6 @@
 from __future__ import unicode_literals, absolute_import, print_function, division
 
-import operator
+import heapq
 from datetime import datetime
 from itertools import islice, cycle
 
@@ -37,27 +37,55 @@ def override_dict(parent, child):
     return dict(parent.copy(), **child)
 
 
+class MergeEntry(object):
+    """
+    Holds the current value of an iterable inside the heap of merge_iter.
+    Entries with equal keys are ordered by the position of their iterable to keep merges stable.
+    """
+
+    __slots__ = ("key", "index", "value", "iterator", "reversed")
+
+    def __init__(self, key, index, value, iterator, reversed):
+        self.key = key
+        self.index = index
+        self.value = value
+        self.iterator = iterator
+        self.reversed = reversed
+
+    def __lt__(self, other):
+        if self.key == other.key:
+            return self.index < other.index
+        return self.key > other.key if self.reversed else self.key < other.key
+
+
 def merge_iter(*iterables, **kwargs):
     """
-    Given a set of reversed sorted iterables, yield the next value in merged order
+    Given a set of (reversed) sorted iterables, yield the next value in merged order
     Takes an optional `key` callable to compare values by.
-
-    Based on: http://stackoverflow.com/questions/14465154/sorting-text-file-by-using-python/14465236#14465236
+    A heap of the current values makes getting the next value O(log k) for k iterables.
     """
-    key_func = operator.itemgetter(0) if 'key' not in kwargs else lambda item, key=kwargs['key']: key(item[0])
-    order_func = min if 'reversed' not in kwargs or not kwargs['reversed'] else max
-
-    iterables = [iter(it) for it in iterables]
-    iterables = {i: [next(it), i, it] for i, it in enumerate(iterables)}
-    while True:
-        value, i, it = order_func(iterables.values(), key=key_func)
-        yield value
+    key_func = kwargs.get("key", None) or (lambda value: value)
+    is_reversed = kwargs.get("reversed", False)
+
+    heap = []
+    for index, iterable in enumerate(iterables):
+        iterator = iter(iterable)
+        for value in iterator:
+            heap.append(MergeEntry(key_func(value), index, value, iterator, is_reversed))
+            break
+    heapq.heapify(heap)
+
+    while heap:
+        entry = heap[0]
+        yield entry.value
         try:
-            iterables[i][0] = next(it)
+            value = next(entry.iterator)
         except StopIteration:
-            del iterables[i]
-            if not iterables:
-                raise
+            heapq.heappop(heap)
+            continue
+        entry.key = key_func(value)
+        entry.value = value
+        heapq.heapreplace(heap, entry)
 
 
 def ibatch(iterable, batch_size):
@@ -69,6 +97,20 @@ def ibatch(iterable, batch_size):
         yield batch
 
 
+def iterate_json_array(json_iterator):
+    """
+    Yields the parts of a JSON array with JSON strings from given iterator as elements,
+    without building the array in memory.
+
+    :param json_iterator: iterator of JSON strings
+    :return: generator yielding JSON strings
+    """
+    yield "["
+    for index, json_string in enumerate(json_iterator):
+        yield "," + json_string if index else json_string
+    yield "]"
+
+
 def iroundrobin(*iterables):
     "iroundrobin('ABC', 'D', 'EF') --> A D E B F C"
     # Recipe credited to George Sakkis
@@ -0,0 +1,64 @@
+from __future__ import unicode_literals, absolute_import, print_function, division
+
+import io
+import cProfile
+import pstats
+from time import time, process_time
+from collections import deque
+from contextlib import contextmanager
+
+from django.db import connection
+
+
+class QueryCountLog(deque):
+    """
+    A drop in replacement for the queries_log of a database connection that only counts queries.
+    Queries are not stored to keep memory flat when measuring processes with many large inserts.
+    """
+
+    def __init__(self):
+        super(QueryCountLog, self).__init__()
+        self.count = 0
+
+    def append(self, query):
+        self.count += 1
+
+
+@contextmanager
+def measure(profile=False, profile_limit=40):
+    """
+    Measures the wall time and CPU time of the enclosed code.
+    The yielded dictionary gets filled with these measurements when the enclosed code is done.
+    When profiling the database queries get counted as well. Counting needs the debug cursor of Django,
+    which formats and logs every query, so it only happens when profiling.
+
+    :param profile: (boolean) whether to include database queries and a cProfile report with the measurements
+    :param profile_limit: (int) the amount of functions to include in the cProfile report
+    :return: dict with measurements
+    """
+    measurements = {}
+    queries_log = connection.queries_log
+    force_debug_cursor = connection.force_debug_cursor
+    if profile:
+        connection.queries_log = QueryCountLog()
+        connection.force_debug_cursor = True
+    profiler = cProfile.Profile() if profile else None
+    start_time = time()
+    start_cpu_time = process_time()
+    if profiler is not None:
+        profiler.enable()
+    try:
+        yield measurements
+    finally:
+        if profiler is not None:
+            profiler.disable()
+        measurements["duration"] = time() - start_time
+        measurements["cpu_time"] = process_time() - start_cpu_time
+        if profiler is not None:
+            measurements["queries"] = connection.queries_log.count
+            connection.queries_log = queries_log
+            connection.force_debug_cursor = force_debug_cursor
+            report = io.StringIO()
+            stats = pstats.Stats(profiler, stream=report)
+            stats.sort_stats("cumulative").print_stats(profile_limit)
+            measurements["profile"] = report.getvalue()
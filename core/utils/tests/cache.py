@@ -0,0 +1,42 @@
+from __future__ import unicode_literals, absolute_import, print_function, division
+
+from mock import patch
+
+from django.test import TestCase
+
+from core.utils.cache import LRUCache
+
+
+class TestLRUCache(TestCase):
+
+    def test_get_and_set(self):
+        cache = LRUCache(max_size=2)
+        self.assertIsNone(cache.get("missing"))
+        self.assertEqual(cache.get("missing", "default"), "default")
+        cache.set("key", "value")
+        self.assertEqual(cache.get("key"), "value")
+        cache.delete("key")
+        self.assertIsNone(cache.get("key"))
+
+    def test_size_eviction(self):
+        cache = LRUCache(max_size=2)
+        cache.set("first", 1)
+        cache.set("second", 2)
+        cache.get("first")  # makes "second" the least recently used entry
+        cache.set("third", 3)
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.get("first"), 1)
+        self.assertIsNone(cache.get("second"))
+        self.assertEqual(cache.get("third"), 3)
+
+    @patch("core.utils.cache.time", return_value=100)
+    def test_timeout(self, time_mock):
+        cache = LRUCache(max_size=2, timeout=10)
+        cache.set("key", "value")
+        cache.set("longer", "value", timeout=20)
+        time_mock.return_value = 109
+        self.assertEqual(cache.get("key"), "value")
+        time_mock.return_value = 110
+        self.assertIsNone(cache.get("key"))
+        self.assertEqual(cache.get("longer"), "value")
+        self.assertEqual(len(cache), 1)
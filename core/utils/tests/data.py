@@ -1,7 +1,7 @@
 from __future__ import unicode_literals, absolute_import, print_function, division
 
 from unittest import TestCase
-from core.utils.data import extractor, reach, expand, interpolate
+from core.utils.data import extractor, reach, compile_reach, expand, interpolate
 
 
 class TestPythonReach(TestCase):
@@ -47,6 +47,15 @@ class TestPythonReach(TestCase):
         except TypeError:
             pass
 
+    def test_compile_reach(self):
+        reach_path = compile_reach("$.dict.list.0")
+        self.assertIs(reach_path, compile_reach("$.dict.list.0"))
+        self.assertEqual(reach_path(self.test_dict), self.test_dict["dict"]["list"][0])
+        self.assertIs(compile_reach("$.dict")(self.test_dict), self.test_dict["dict"])
+        self.assertEqual(compile_reach("dotted.key")(self.test_dict), self.test_dict["dotted.key"])
+        self.assertIsNone(compile_reach("does.not.exist")(self.test_dict))
+        self.assertIs(compile_reach("$")(self.test_list), self.test_list)
+
 
 class TestPythonExtractor(TestCase):
 
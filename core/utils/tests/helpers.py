@@ -2,6 +2,8 @@ from __future__ import unicode_literals, absolute_import, print_function, divisi
 
 from unittest import TestCase
 
+from core.utils.helpers import merge_iter, iterate_json_array
+
 
 class TestUtilHelpers(TestCase):
 
@@ -12,7 +14,19 @@ class TestUtilHelpers(TestCase):
         self.skipTest("not tested")
 
     def test_merge_iter(self):
-        self.skipTest("not tested")
+        merged = merge_iter([1, 4, 7], [2, 5], [], [3, 6])
+        self.assertEqual(list(merged), [1, 2, 3, 4, 5, 6, 7])
+        merged = merge_iter(
+            [{"rank": 9, "name": "a"}, {"rank": 8, "name": "b"}],
+            [{"rank": 9, "name": "c"}, {"rank": 1, "name": "d"}],
+            key=lambda el: el["rank"],
+            reversed=True
+        )
+        self.assertEqual([el["name"] for el in merged], ["a", "c", "b", "d"])
+
+    def test_iterate_json_array(self):
+        self.assertEqual("".join(iterate_json_array(iter(['{"a":1}', '{"b":2}']))), '[{"a":1},{"b":2}]')
+        self.assertEqual("".join(iterate_json_array([])), "[]")
 
     def test_parse_datetime_string(self):
         self.skipTest("not tested")
\ No newline at end of file
@@ -0,0 +1,29 @@
+from __future__ import unicode_literals, absolute_import, print_function, division
+
+from django.test import TestCase
+from django.db import connection
+
+from core.models.organisms import Growth
+from core.utils.profiling import measure
+
+
+class TestMeasure(TestCase):
+
+    def test_measure(self):
+        with measure() as measurements:
+            list(Growth.objects.all())
+            list(Growth.objects.all())
+        self.assertGreaterEqual(measurements["duration"], 0)
+        self.assertGreaterEqual(measurements["cpu_time"], 0)
+        self.assertNotIn("queries", measurements)
+        self.assertNotIn("profile", measurements)
+        self.assertFalse(connection.force_debug_cursor)
+
+    def test_measure_profile(self):
+        with measure(profile=True) as measurements:
+            list(Growth.objects.all())
+            list(Growth.objects.all())
+        self.assertEqual(measurements["queries"], 2)
+        self.assertFalse(connection.force_debug_cursor)
+        self.assertIn("profile", measurements)
+        self.assertIn("cumulative", measurements["profile"])
@@ -7,10 +7,11 @@ from django.shortcuts import Http404
 
 from rest_framework import generics, serializers, status
 from rest_framework.response import Response
+from rest_framework.utils.encoders import JSONEncoder
 
 from core.models.organisms import Collective, Individual
 from core.views.individual import IndividualSerializer
-from core.views.content import ContentView, ContentPagination
+from core.views.content import ContentView, ContentPagination, StreamingContentResponse
 
 
 class CollectiveSerializer(serializers.ModelSerializer):
@@ -40,6 +41,23 @@ class CollectiveView(generics.RetrieveAPIView):
     queryset = Collective.objects.all()
     serializer_class = CollectiveSerializer
 
+    def retrieve(self, request, *args, **kwargs):
+        """
+        Will stream the Individuals of the Collective when the stream parameter is "json" or "ndjson".
+
+        :param request: Django request
+        :return: Response
+        """
+        stream_format = StreamingContentResponse.get_stream_format(request)
+        if stream_format is None:
+            return super(CollectiveView, self).retrieve(request, *args, **kwargs)
+        collective = self.get_object()
+        individuals = (
+            json.dumps(IndividualSerializer(individual).data, cls=JSONEncoder)
+            for individual in collective.individual_set.order_by("id").iterator()
+        )
+        return StreamingContentResponse(individuals, stream_format)
+
 
 class CollectiveContentView(ContentView):
     """
@@ -60,7 +78,11 @@ class CollectiveContentView(ContentView):
         if request.organism is None:
             raise Http404("Not found")
 
-        page = self.paginate_queryset(request.organism.individual_set.all())
+        stream_format = StreamingContentResponse.get_stream_format(request)
+        if stream_format is not None:
+            return StreamingContentResponse(request.organism.iterate_json_members(), stream_format)
+
+        page = self.paginate_queryset(request.organism.members)
         if page is not None:
             serializer = self.get_serializer(page, many=True)
             return self.get_paginated_response(serializer.data)
@@ -1,3 +1,4 @@
+import json
 from copy import copy
 
 from django.core.exceptions import ValidationError
@@ -7,6 +8,7 @@ from django.core.urlresolvers import reverse
 
 from rest_framework.views import APIView
 from rest_framework.response import Response
+from rest_framework.utils.encoders import JSONEncoder
 from rest_framework.status import (HTTP_200_OK, HTTP_202_ACCEPTED, HTTP_204_NO_CONTENT, HTTP_400_BAD_REQUEST,
                                    HTTP_500_INTERNAL_SERVER_ERROR)
 
@@ -14,6 +16,7 @@ from core.models.organisms.states import CommunityState
 from core.models.resources.manifestation import Manifestation
 from core.exceptions import DSProcessUnfinished, DSProcessError
 from core.utils.helpers import parse_datetime_string
+from core.views.content import StreamingContentResponse
 
 
 class CommunityView(APIView):
@@ -29,10 +32,30 @@ class CommunityView(APIView):
         "error": None
     }
 
-    def _get_response_from_manifestation(self, manifestation, response_data):
-        manifestation_data = manifestation.get_data(async=manifestation.community.ASYNC_MANIFEST)
+    def _get_response_from_manifestation(self, manifestation, response_data, stream_format=None, cursor=None):
+        async = manifestation.community.ASYNC_MANIFEST
+        if cursor is not None:
+            manifestation.prepare_data(async=async)
+            response_data["results"], response_data["next_cursor"] = manifestation.get_page(cursor)
+            return Response(response_data, HTTP_200_OK)
+        if stream_format is not None:
+            manifestation.prepare_data(async=async)
+            return StreamingContentResponse(
+                (json.dumps(item, cls=JSONEncoder) for item in manifestation.iterate_data()),
+                stream_format
+            )
+        manifestation_data = manifestation.get_data(async=async)
+        return self._get_response_from_data(manifestation_data, response_data, stream_format)
+
+    @staticmethod
+    def _get_response_from_data(manifestation_data, response_data, stream_format=None):
         if not manifestation_data:
             return Response(None, HTTP_204_NO_CONTENT)
+        if stream_format is not None and isinstance(manifestation_data, list):
+            return StreamingContentResponse(
+                (json.dumps(item, cls=JSONEncoder) for item in manifestation_data),
+                stream_format
+            )
         results_key = "results" if isinstance(manifestation_data, list) else "result"
         response_data[results_key] = manifestation_data
         return Response(response_data, HTTP_200_OK)
@@ -48,13 +71,17 @@ class CommunityView(APIView):
             "&".join("{}={}".format(key, value) for key, value in parameters_sorted_by_keys)
         )
 
-    def get_response(self, community_class, query_path, query_parameters):
+    def get_response(self, community_class, query_path, query_parameters, stream_format=None, cursor=None):
 
         assert isinstance(query_parameters, dict), \
             "query_parameters for get_response should be a dictionary without urlencoded values"
         response_data = copy(self.RESPONSE_DATA)
         full_path = self.get_full_path(community_class, query_path, query_parameters)
 
+        cached_data = Manifestation.get_cached_data(full_path) if cursor is None else None
+        if cached_data is not None:
+            return self._get_response_from_data(cached_data, response_data, stream_format)
+
         try:
             manifestation = Manifestation.objects.get(uri=full_path)
             community = manifestation.community
@@ -82,14 +109,14 @@ class CommunityView(APIView):
         try:
 
             if manifestation is not None:
-                return self._get_response_from_manifestation(manifestation, response_data)
+                return self._get_response_from_manifestation(manifestation, response_data, stream_format, cursor)
             if community.state == CommunityState.SYNC:
                 raise DSProcessUnfinished()
 
-            community.grow(*query_path.split('/'))
+            community.grow_with_lock(*query_path.split('/'))
             config = Manifestation.generate_config(community.PUBLIC_CONFIG, **query_parameters)
             manifestation = Manifestation.objects.create(uri=full_path, community=community, config=config)
-            return self._get_response_from_manifestation(manifestation, response_data)
+            return self._get_response_from_manifestation(manifestation, response_data, stream_format, cursor)
 
         except ValidationError as exc:
             response_data["error"] = exc
@@ -104,10 +131,22 @@ class CommunityView(APIView):
             return Response(response_data, HTTP_500_INTERNAL_SERVER_ERROR)
 
     def get(self, request, community_class, path="", *args, **kwargs):
+        query_parameters = request.GET.dict()
+        stream_format = StreamingContentResponse.get_stream_format(request)
+        query_parameters.pop("stream", None)
+        cursor = query_parameters.pop("cursor", None)
+        if cursor is not None:
+            if not cursor.isdigit():
+                response_data = copy(self.RESPONSE_DATA)
+                response_data["error"] = "Expected a positive integer as cursor"
+                return Response(response_data, HTTP_400_BAD_REQUEST)
+            cursor = int(cursor)
         return self.get_response(
             community_class,
             query_path=path,
-            query_parameters=request.GET.dict()
+            query_parameters=query_parameters,
+            stream_format=stream_format,
+            cursor=cursor
         )
 
     # FEATURE: allow actions who's function lives on a Community through POST
@@ -2,10 +2,13 @@ from __future__ import unicode_literals, absolute_import, print_function, divisi
 
 from django.core.exceptions import ValidationError
 from django.shortcuts import Http404
+from django.http import StreamingHttpResponse
 
 from rest_framework import serializers, pagination, generics
 from rest_framework.response import Response
 
+from core.utils.helpers import iterate_json_array
+
 
 class ContentSerializer(serializers.Serializer):
 
@@ -72,3 +75,48 @@ class ContentPagination(pagination.PageNumberPagination):
         headers = {'Link': link} if link else {}
 
         return Response(data, headers=headers)
+
+
+class StreamFormats(object):
+    JSON = "json"
+    NDJSON = "ndjson"
+
+
+class StreamingContentResponse(StreamingHttpResponse):
+    """
+    Writes JSON strings from an iterator to the client as a JSON array or as newline delimited JSON.
+    The content never gets built in memory, which keeps memory constant for large Collectives and manifestations.
+    """
+
+    CONTENT_TYPES = {
+        StreamFormats.JSON: "application/json",
+        StreamFormats.NDJSON: "application/x-ndjson"
+    }
+
+    def __init__(self, json_iterator, stream_format=StreamFormats.JSON, *args, **kwargs):
+        assert stream_format in self.CONTENT_TYPES, "Unknown stream format: {}".format(stream_format)
+        streaming_content = self.iterate_ndjson(json_iterator) if stream_format == StreamFormats.NDJSON else \
+            iterate_json_array(json_iterator)
+        kwargs["content_type"] = self.CONTENT_TYPES[stream_format]
+        super(StreamingContentResponse, self).__init__(streaming_content, *args, **kwargs)
+
+    @staticmethod
+    def get_stream_format(request):
+        """
+        Returns the stream format that is requested with the "stream" parameter or None if no stream is requested.
+        Streams are only returned when content negotiation selected a JSON renderer,
+        so the browsable API and other formats keep rendering normally.
+
+        :param request: a DRF request that went through content negotiation
+        :return: a StreamFormats value or None
+        """
+        stream_format = request.GET.get("stream", None)
+        renderer = getattr(request, "accepted_renderer", None)
+        if renderer is None or renderer.format != "json":
+            return None
+        return stream_format if stream_format in StreamingContentResponse.CONTENT_TYPES else None
+
+    @staticmethod
+    def iterate_ndjson(json_iterator):
+        for json_string in json_iterator:
+            yield json_string + "\n"
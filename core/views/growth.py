@@ -0,0 +1,62 @@
+from __future__ import unicode_literals, absolute_import, print_function, division
+
+from django.shortcuts import Http404, get_object_or_404
+
+from rest_framework import serializers, generics
+
+from core.models.organisms import Growth, Community
+from core.utils.helpers import get_any_model
+
+
+class GrowthSerializer(serializers.ModelSerializer):
+
+    statistics = serializers.SerializerMethodField()
+    duration = serializers.SerializerMethodField()
+
+    def get_statistics(self, growth):
+        return growth.statistics
+
+    def get_duration(self, growth):
+        if growth.began_at is None or growth.finished_at is None:
+            return None
+        return (growth.finished_at - growth.began_at).total_seconds()
+
+    class Meta:
+        model = Growth
+        fields = (
+            "id",
+            "type",
+            "state",
+            "process",
+            "contribute",
+            "began_at",
+            "finished_at",
+            "duration",
+            "statistics",
+        )
+
+
+class GrowthView(generics.RetrieveAPIView):
+    """
+    A Growth is a phase of a Community with timestamps and statistics about its execution.
+    """
+    queryset = Growth.objects.all()
+    serializer_class = GrowthSerializer
+
+
+class CommunityTimelineView(generics.ListAPIView):
+    """
+    Lists all Growth of a Community in order of execution, to find out which phase is slow.
+    """
+    serializer_class = GrowthSerializer
+    pagination_class = None  # a timeline is bounded by the amount of growth in a Community
+
+    def get_queryset(self):
+        try:
+            community_model = get_any_model(self.kwargs["community"])
+        except LookupError:
+            raise Http404("Not found")
+        if not issubclass(community_model, Community):
+            raise Http404("Not found")
+        community = get_object_or_404(community_model, id=self.kwargs["pk"])
+        return community.growth_set.order_by("id")
@@ -29,6 +29,26 @@ class TestCollectiveView(TestCase):
         self.assertIsInstance(data, dict)
         self.assertIn("detail", data)
 
+    def test_get_browsable_api(self):
+        response = self.client.get(self.test_url.format(1) + "?format=api")
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("text/html", response["Content-Type"])
+
+    def test_get_stream(self):
+        response = self.client.get(self.test_url.format(1) + "?stream=json")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        data = json.loads(b"".join(response.streaming_content).decode("utf-8"))
+        self.assertIsInstance(data, list)
+        self.assertEqual(len(data), 3)
+        self.assertIn("properties", data[0])
+
+    def test_get_stream_browsable_api(self):
+        response = self.client.get(self.test_url.format(1) + "?stream=json&format=api")
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.streaming)
+        self.assertIn("text/html", response["Content-Type"])
+
 
 class TestCollectiveContentView(TestCase):
 
@@ -46,6 +66,18 @@ class TestCollectiveContentView(TestCase):
         self.assertIsInstance(data, list)
         self.assertTrue(data)
 
+    def test_get_stream(self):
+        response = self.client.get(self.test_url.format(1) + "?stream=json")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "application/json")
+        data = json.loads(b"".join(response.streaming_content).decode("utf-8"))
+        self.assertEqual(data, list(Collective.objects.get(id=1).content))
+        response = self.client.get(self.test_url.format(1) + "?stream=ndjson")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        lines = b"".join(response.streaming_content).decode("utf-8").splitlines()
+        self.assertEqual([json.loads(line) for line in lines], list(Collective.objects.get(id=1).content))
+
     def test_get_not_found(self):
         response = self.client.get(self.test_url.format(3))
         data = json.loads(response.content.decode("utf-8"))
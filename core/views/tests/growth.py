@@ -0,0 +1,63 @@
+from __future__ import unicode_literals, absolute_import, print_function, division
+
+import json
+from datetime import datetime, timedelta
+
+from django.test import TestCase, Client
+
+from core.models.organisms import Growth
+
+
+class TestGrowthView(TestCase):
+
+    fixtures = ["test-community"]
+
+    def setUp(self):
+        super(TestGrowthView, self).setUp()
+        self.client = Client()
+        self.test_url = "/data/v1/growth/{}/"
+
+    def test_get(self):
+        growth = Growth.objects.get(id=1)
+        growth.began_at = datetime(2017, 3, 1, 10, 0, 0)
+        growth.finished_at = growth.began_at + timedelta(seconds=90)
+        growth.record_statistics("resources", {"success": 1, "errors": 0, "size": 100})
+        response = self.client.get(self.test_url.format(1))
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.content.decode("utf-8"))
+        self.assertEqual(data["id"], 1)
+        self.assertEqual(data["state"], "Complete")
+        self.assertEqual(data["duration"], 90)
+        self.assertEqual(data["statistics"], {"resources": {"success": 1, "errors": 0, "size": 100}})
+        response = self.client.get(self.test_url.format(2))
+        data = json.loads(response.content.decode("utf-8"))
+        self.assertIsNone(data["duration"])
+
+    def test_get_not_found(self):
+        response = self.client.get(self.test_url.format(1000))
+        self.assertEqual(response.status_code, 404)
+
+
+class TestCommunityTimelineView(TestCase):
+
+    fixtures = ["test-community"]
+
+    def setUp(self):
+        super(TestCommunityTimelineView, self).setUp()
+        self.client = Client()
+        self.test_url = "/data/v1/community/{}/{}/timeline/"
+
+    def test_get(self):
+        response = self.client.get(self.test_url.format("CommunityMock", 2))
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.content.decode("utf-8"))
+        self.assertEqual([growth["id"] for growth in data], [1, 2])
+        self.assertEqual([growth["state"] for growth in data], ["Complete", "Processing"])
+
+    def test_get_not_found(self):
+        response = self.client.get(self.test_url.format("CommunityMock", 1000))
+        self.assertEqual(response.status_code, 404)
+        response = self.client.get(self.test_url.format("UnknownModel", 2))
+        self.assertEqual(response.status_code, 404)
+        response = self.client.get(self.test_url.format("Growth", 2))
+        self.assertEqual(response.status_code, 404)
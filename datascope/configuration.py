@@ -17,6 +17,7 @@ DEFAULT_CONFIGURATION = {
     "global_user_agent": "DataScope (v{})".format(settings.DATASCOPE_VERSION),
     "global_token": "",
     "global_purge_immediately": False,  # by default keep resources around
+    "global_profile": False,  # set to True to store cProfile reports of growth phases
 
     "http_resource_batch_size": 0,
     "http_resource_continuation_limit": 1,
@@ -29,12 +30,15 @@ DEFAULT_CONFIGURATION = {
     "wikipedia_wiki_full_extracts": False,
     "wikipedia_wiki_domain": "en.wikipedia.org",
     "wikipedia_wiki_show_categories": "!hidden",
+    "wikipedia_claim_properties": [],  # Wikidata properties of claims to keep, empty keeps all claims
 
     "google_api_key": getattr(settings, 'GOOGLE_API_KEY', ''),
     "google_cx": "004613812033868156538:5pcwbuudj1m",
 
     "indico_api_key": getattr(settings, 'INDICO_API_KEY', ''),
 
+    "manifest_processor_batch_size": 1,  # amount of manifestations per task when manifesting in parallel
+
     "rank_processor_batch_size": 1000,
     "rank_processor_result_size": 20
 }
@@ -276,6 +276,35 @@ LOGGING = {
 
 TEST_RUNNER = "core.tests.runner.DataScopeDiscoverRunner"
 
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'features': {  # hook values of rank processors per individual identity and kernel version, shared by all processes
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': 'features_cache',  # create with: ./manage.py createcachetable
+        'TIMEOUT': 2 * 24 * 60 * 60,  # kernels get replaced daily
+        'OPTIONS': {
+            'MAX_ENTRIES': 100000  # individuals of about two kernels
+        }
+    },
+    'manifestations': {  # shared tier of manifestation data, in between the process memory and the database
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'manifestations',
+        'OPTIONS': {
+            'MAX_ENTRIES': 1000
+        }
+    },
+    'image_licenses': {  # whether files on Wikipedia are free to use per file title
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'image_licenses',
+        'TIMEOUT': 7 * 24 * 60 * 60,
+        'OPTIONS': {
+            'MAX_ENTRIES': 100000
+        }
+    }
+}
+
 REST_FRAMEWORK = {
     'DEFAULT_VERSIONING_CLASS': 'rest_framework.versioning.NamespaceVersioning',
     #'DEFAULT_PAGINATION_CLASS': 'core.views.content.ContentPagination',
@@ -316,3 +345,7 @@ if USE_WEBSOCKETS:
 #######################################################
 
 DATASCOPE_DATETIME_FORMAT = "%Y%m%d%H%M%S%f"
+MANIFESTATION_TIMEOUT = 24 * 60 * 60  # seconds before manifestation data gets recalculated while serving stale data
+MANIFESTATION_CHUNK_SIZE = 100  # amount of items stored together and returned per page
+MANIFESTATION_LOCAL_CACHE_SIZE = 100  # amount of manifestations to keep in process memory
+MANIFESTATION_LOCAL_CACHE_TIMEOUT = 60  # seconds to keep manifestations in process memory
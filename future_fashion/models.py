@@ -1,7 +1,12 @@
 from __future__ import unicode_literals, absolute_import, print_function, division
 import six
 
+from io import BytesIO
+
+import numpy as np
+
 from django.conf import settings
+from django.core.files.base import ContentFile
 from django.core.files.storage import default_storage
 
 from collections import OrderedDict
@@ -9,6 +14,9 @@ from collections import OrderedDict
 from core.models.organisms import Community, Collective, Individual
 
 
+VECTOR_INDEXES = {}  # vector indexes by storage path together with the kernel version they got loaded for
+
+
 class FutureFashionCommunity(Community):
 
     COMMUNITY_SPIRIT = OrderedDict([
@@ -35,6 +43,7 @@ class FutureFashionCommunity(Community):
         }
     ]
     ASYNC_MANIFEST = True
+    ASYNC_GROWTH_CALLBACKS = True
     INPUT_THROUGH_PATH = False
 
     PUBLIC_CONFIG = {
@@ -42,6 +51,9 @@ class FutureFashionCommunity(Community):
         "$euclidean_distance": 1
     }
 
+    RESULT_SIZE = 20
+    VECTOR_INDEX_DIRECTORY = "future_fashion/vectors/"
+
     def initial_input(self, *args):
         directory = args[0]
         initial = Collective.objects.create(community=self, schema={})
@@ -64,9 +76,110 @@ class FutureFashionCommunity(Community):
     def set_kernel(self):
         self.kernel = self.current_growth.output
 
+    @staticmethod
+    def get_vector_matrix(collective):
+        """
+        Collects the vectors of Individuals in a Collective into a single contiguous float32 matrix.
+
+        :param collective: Collective with Individuals that hold vectors
+        :return: NumPy array with Individual ids and a NumPy matrix with a vector per row for those ids
+        """
+        identifiers = []
+        vectors = []
+        for individual in collective.individual_set.iterator():
+            vector = individual.properties.get("vectors")
+            if not vector:
+                continue
+            identifiers.append(individual.id)
+            vectors.append(vector)
+        return np.array(identifiers, dtype=np.int64), np.ascontiguousarray(vectors, dtype=np.float32)
+
+    @property
+    def vector_index_path(self):
+        return "{}{}.npz".format(self.VECTOR_INDEX_DIRECTORY, self.id)
+
+    def finish_vectors(self, out, err):
+        identifiers, vectors = self.get_vector_matrix(out)
+        index_file = BytesIO()
+        np.savez(index_file, identifiers=identifiers, vectors=vectors)
+        if default_storage.exists(self.vector_index_path):
+            default_storage.delete(self.vector_index_path)
+        default_storage.save(self.vector_index_path, ContentFile(index_file.getvalue()))
+
+    @property
+    def vector_index_version(self):
+        if self.kernel is None:
+            return None
+        return "{}-{}".format(self.kernel.id, self.kernel.modified_at.isoformat())
+
+    def get_vector_index(self):
+        """
+        Loads the vectors stored by finish_vectors. A KD-tree gets built over the vectors when SciPy is installed,
+        otherwise nearest neighbours get found by computing all distances at once.
+        Indexes are kept per process for as long as the kernel of the Community doesn't change.
+
+        :return: NumPy array with Individual ids, NumPy matrix with vectors and a KD-tree or None
+        """
+        version = self.vector_index_version
+        cached_version, vector_index = VECTOR_INDEXES.get(self.vector_index_path, (None, None))
+        if vector_index is not None and cached_version == version:
+            return vector_index
+        if not default_storage.exists(self.vector_index_path):
+            return None
+        with default_storage.open(self.vector_index_path) as index_file:
+            index = np.load(BytesIO(index_file.read()))
+            identifiers, vectors = index["identifiers"], index["vectors"]
+        try:
+            from scipy.spatial import cKDTree
+            tree = cKDTree(vectors) if len(vectors) else None
+        except ImportError:
+            tree = None
+        vector_index = (identifiers, vectors, tree)
+        VECTOR_INDEXES[self.vector_index_path] = (version, vector_index)
+        return vector_index
+
+    def get_nearest_identifiers(self, reference_vector, size):
+        """
+        Returns the ids of Individuals with vectors nearest to the reference vector, nearest first.
+
+        :param reference_vector: the vector to find neighbours for
+        :param size: the amount of neighbours to return
+        :return: list of Individual ids or None when there is no vector index
+        """
+        vector_index = self.get_vector_index()
+        if vector_index is None:
+            return None
+        identifiers, vectors, tree = vector_index
+        size = min(size, len(identifiers))
+        if not size:
+            return []
+        reference_vector = np.asarray(reference_vector, dtype=np.float32)
+        if tree is not None:
+            distances, indices = tree.query(reference_vector, k=size)
+            indices = np.atleast_1d(indices)
+        else:
+            distances = np.linalg.norm(vectors - reference_vector, axis=1)
+            indices = np.argpartition(distances, size - 1)[:size]
+            indices = indices[np.argsort(distances[indices], kind="mergesort")]
+        return identifiers[indices].tolist()
+
+    def get_manifestation_content(self):
+        reference = getattr(self.config, "reference", None)
+        if reference is None:
+            return super(FutureFashionCommunity, self).get_manifestation_content()
+        reference_individual = Individual.objects.get(id=int(reference))
+        nearest_identifiers = self.get_nearest_identifiers(
+            reference_individual.properties["vectors"],
+            self.RESULT_SIZE
+        )
+        if nearest_identifiers is None:
+            return super(FutureFashionCommunity, self).get_manifestation_content()
+        individuals = Individual.objects.in_bulk(nearest_identifiers)
+        return iter([individuals[identifier].content for identifier in nearest_identifiers])
+
     @property
     def manifestation(self):
-        return list(super(FutureFashionCommunity, self).manifestation)[:20]
+        return list(super(FutureFashionCommunity, self).manifestation)[:self.RESULT_SIZE]
 
     class Meta:
         verbose_name = "Future fashion"
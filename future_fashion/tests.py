@@ -1,3 +1,51 @@
 from __future__ import unicode_literals, absolute_import, print_function, division
 
+from io import BytesIO
+from mock import patch
+
+import numpy as np
+
 from django.test import TestCase
+
+from future_fashion.models import FutureFashionCommunity
+from sources.processors.indico.compare import get_inverse_distances
+
+
+class TestFutureFashionCommunity(TestCase):
+
+    def setUp(self):
+        super(TestFutureFashionCommunity, self).setUp()
+        self.instance = FutureFashionCommunity()
+        self.vectors = np.array([[0, 0], [3, 4], [1, 0], [0, 2]], dtype=np.float32)
+        self.identifiers = np.array([10, 11, 12, 13], dtype=np.int64)
+
+    def test_get_nearest_identifiers(self):
+        with patch.object(FutureFashionCommunity, "get_vector_index", return_value=None):
+            self.assertIsNone(self.instance.get_nearest_identifiers([0, 0], 2))
+        vector_index = (self.identifiers, self.vectors, None)
+        with patch.object(FutureFashionCommunity, "get_vector_index", return_value=vector_index):
+            self.assertEqual(self.instance.get_nearest_identifiers([0, 0], 2), [10, 12])
+            self.assertEqual(self.instance.get_nearest_identifiers([3, 3], 10), [11, 13, 12, 10])
+
+    @patch("future_fashion.models.VECTOR_INDEXES", {})
+    @patch.object(FutureFashionCommunity, "vector_index_path", "future_fashion/vectors/test.npz")
+    def test_get_vector_index(self):
+        index_file = BytesIO()
+        np.savez(index_file, identifiers=self.identifiers, vectors=self.vectors)
+        with patch("future_fashion.models.default_storage") as storage_mock:
+            storage_mock.exists.return_value = True
+            storage_mock.open.return_value = BytesIO(index_file.getvalue())
+            with patch.object(FutureFashionCommunity, "vector_index_version", "1-a"):
+                identifiers, vectors, tree = self.instance.get_vector_index()
+                self.assertEqual(identifiers.tolist(), [10, 11, 12, 13])
+                self.assertIs(self.instance.get_vector_index()[0], identifiers)
+                self.assertIs(FutureFashionCommunity().get_vector_index()[0], identifiers)
+                self.assertEqual(storage_mock.open.call_count, 1)
+            storage_mock.open.return_value = BytesIO(index_file.getvalue())
+            with patch.object(FutureFashionCommunity, "vector_index_version", "1-b"):
+                self.instance.get_vector_index()
+                self.assertEqual(storage_mock.open.call_count, 2)
+
+    def test_get_inverse_distances(self):
+        inverse_distances = get_inverse_distances(self.vectors, np.array([0, 0], dtype=np.float32))
+        self.assertEqual(list(inverse_distances), [0.99999999, 0.2, 1.0, 0.5])
@@ -25,6 +25,7 @@ class OfficialAnnouncementsNetherlands(HttpResource):
     }
 
     CONFIG_NAMESPACE = "dutch_government"
+    HTML_PARSER = "lxml"
 
     GET_SCHEMA = {
         "args": {
@@ -66,6 +67,8 @@ class OfficialAnnouncementsNetherlands(HttpResource):
 
 class OfficialAnnouncementsDocumentNetherlands(URLResource):
 
+    HTML_PARSER = "lxml"
+
     class Meta:
         verbose_name = "Official announcements document (Dutch)"
         verbose_name_plural = "Official announcements document (Dutch)"
@@ -25,6 +25,7 @@ class ActeursSpotProfile(HttpResource):
     }
 
     CONFIG_NAMESPACE = "acteurs_spot"
+    HTML_PARSER = "lxml"
 
     def _handle_errors(self):
         super(ActeursSpotProfile, self)._handle_errors()
@@ -25,6 +25,7 @@ class BenfCastingProfile(HttpResource):
     }
 
     CONFIG_NAMESPACE = "benf_casting"
+    HTML_PARSER = "lxml"
 
     def _handle_errors(self):
         super(BenfCastingProfile, self)._handle_errors()
@@ -22,6 +22,9 @@ class WikipediaAPI(HttpResource):
         "maxlag": 503
     }
 
+    CONCAT_ARGS_MAX_SIZE = 50  # the API limit for titles, pageids and ids without bot rights
+    CONCAT_ARGS_MAX_LENGTH = 6000  # Wikimedia servers reject URLs of around 8000 bytes
+
     class Meta:
         abstract = True
 
@@ -1,3 +1,5 @@
+import json
+
 from core.utils.helpers import override_dict
 from sources.models.wikipedia.base import WikipediaAPI
 
@@ -54,7 +56,50 @@ class WikiDataItems(WikipediaAPI):
                 "type": snak["datatype"]
             }, False
 
-    def get_item(self, raw_item_data):
+    @staticmethod
+    def get_claim_index(claim_entities):
+        """
+        Indexes claim values by their property, which allows direct lookups of claims by property.
+
+        :param claim_entities: list of claim entities as returned by get_entity
+        :return: dict with properties as keys and lists of claim values as values
+        """
+        claim_index = {}
+        for claim_entity in claim_entities:
+            claim_index.setdefault(claim_entity["property"], []).append(claim_entity["value"])
+        return claim_index
+
+    def get_claim_properties(self):
+        """
+        Returns the properties of claims to keep as configured through claim_properties.
+
+        :return: set of properties or None when all claims should be kept
+        """
+        claim_properties = self.config.claim_properties
+        return set(claim_properties) if claim_properties else None
+
+    @staticmethod
+    def project_entity(raw_item_data, claim_properties):
+        """
+        Removes claims with properties that are not projected from raw Wikidata entity data.
+
+        :param raw_item_data: raw Wikidata entity data
+        :param claim_properties: set of properties to keep or None to keep all claims
+        :return: the raw entity data with projected claims
+        """
+        if claim_properties is None:
+            return raw_item_data
+        raw_item_data["claims"] = {
+            claim_property: raw_claims_list
+            for claim_property, raw_claims_list in raw_item_data.get("claims", {}).items()
+            if claim_property in claim_properties
+        }
+        return raw_item_data
+
+    def get_item(self, raw_item_data, claim_properties=None):
+        if claim_properties is None:
+            claim_properties = self.get_claim_properties()
+        self.project_entity(raw_item_data, claim_properties)
         raw_claims = []
         for raw_claims_list in raw_item_data.get("claims", {}).values():
             raw_claims += raw_claims_list
@@ -86,6 +131,7 @@ class WikiDataItems(WikipediaAPI):
             item["description"] = "No English description available"
 
         item["claims"] = claim_entities
+        item["claim_index"] = self.get_claim_index(claim_entities)
         item["references"] = list(references)
         return item
 
@@ -96,10 +142,30 @@ class WikiDataItems(WikipediaAPI):
             self.set_error(self.ERROR_CODE_TO_STATUS[error_code])
         super(WikiDataItems, self)._handle_errors()
 
+    def _update_from_response(self, response):
+        """
+        Stores only projected claims of the entities in a response, which keeps stored bodies small.
+        """
+        super(WikiDataItems, self)._update_from_response(response)
+        claim_properties = self.get_claim_properties()
+        if claim_properties is None or not self.success:
+            return
+        try:
+            data = json.loads(self.body)
+        except ValueError:
+            return
+        for raw_item in data.get("entities", {}).values():
+            self.project_entity(raw_item, claim_properties)
+        self.body = json.dumps(data)
+
     @property
     def content(self):
+        """
+        Returns entities as items. Items get parsed lazily one at a time while the content gets iterated.
+
+        :return: content_type, generator yielding items
+        """
         content_type, data = super(WikiDataItems, self).content
-        items = []
-        for raw_item in data.get("entities", {}).values():
-            items.append(self.get_item(raw_item))
-        return content_type, items
+        claim_properties = self.get_claim_properties()
+        raw_items = data.get("entities", {}).values()
+        return content_type, (self.get_item(raw_item, claim_properties) for raw_item in raw_items)
@@ -1,15 +1,53 @@
 from __future__ import unicode_literals, absolute_import, print_function, division
 
+import numpy as np
+
 from core.processors.compare import ComparisonProcessor
 
 
+def get_inverse_distances(vectors, reference_vector):
+    """
+    Calculates the inverse euclidean distances between the rows of a matrix and a reference vector in one go.
+    Identical vectors get a value just below one instead of an infinite value.
+
+    :param vectors: NumPy matrix with a vector per row
+    :param reference_vector: NumPy array with the reference vector
+    :return: NumPy array with inverse distances
+    """
+    distances = np.linalg.norm(vectors - reference_vector, axis=1).astype(np.float64)
+    inverse_distances = np.full(distances.shape, 0.99999999, dtype=np.float64)
+    np.divide(1, distances, out=inverse_distances, where=distances != 0)
+    return inverse_distances
+
+
 class ImageFeaturesCompareProcessor(ComparisonProcessor):
 
+    def __init__(self, config):
+        super(ImageFeaturesCompareProcessor, self).__init__(config)
+        self.reference_vector = np.asarray(self.reference.properties["vectors"], dtype=np.float32)
+
     @staticmethod
     def euclidean_distance(individual, reference_individual):
-        from scipy.spatial.distance import euclidean
-        distance = euclidean(individual["vectors"], reference_individual["vectors"])
-        if not distance:
-            return 0.99999999
-        else:
-            return 1/distance
+        vector = np.asarray(individual["vectors"], dtype=np.float32)
+        reference_vector = np.asarray(reference_individual["vectors"], dtype=np.float32)
+        return float(get_inverse_distances(vector[np.newaxis, :], reference_vector)[0])
+
+    def get_hook_values(self, batch, hooks):
+        """
+        Calculates the euclidean_distance hook for a whole batch with a single float32 matrix.
+        Other hooks get called per individual as usual.
+
+        :param batch: list of individuals
+        :param hooks: list of hook methods
+        :return: NumPy array with a row per individual and a column per hook
+        """
+        columns = [column for column, hook in enumerate(hooks) if hook.__name__ == "euclidean_distance"]
+        other_hooks = [hook for hook in hooks if hook.__name__ != "euclidean_distance"]
+        values = super(ImageFeaturesCompareProcessor, self).get_hook_values(batch, other_hooks)
+        if not columns:
+            return values
+        vectors = np.array([individual["vectors"] for individual in batch], dtype=np.float32)
+        inverse_distances = get_inverse_distances(vectors, self.reference_vector)
+        for column in columns:
+            values = np.insert(values, column, inverse_distances, axis=1)
+        return values
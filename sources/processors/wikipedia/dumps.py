@@ -0,0 +1,200 @@
+from __future__ import unicode_literals, absolute_import, print_function, division
+
+import json
+import mmap
+from contextlib import contextmanager
+from functools import partial
+from multiprocessing import Pool
+from xml.etree import ElementTree
+
+from core.utils.helpers import ibatch
+from sources.models.wikipedia import WikiDataItems
+from sources.processors.wikipedia.rank import get_timestamp_epoch
+
+
+PAGE_BATCH_SIZE = 100
+ENTITY_BATCH_SIZE = 1000
+NON_CONTENT_ENTITY_KEYS = ["labels", "aliases", "sitelinks"]
+
+_entity_ids = None  # set per worker process by set_entity_filter
+_claim_properties = None  # set per worker process by set_entity_filter
+
+
+@contextmanager
+def open_dump(file_path):
+    """
+    Memory maps an uncompressed dump file, which lets the operating system page the file in and out as it gets read.
+
+    :param file_path: path to the dump file
+    :return: context manager returning a mmap object
+    """
+    with open(file_path, "rb") as dump_file:
+        dump = mmap.mmap(dump_file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            yield dump
+        finally:
+            dump.close()
+
+
+def iterate_elements(dump, tag):
+    """
+    Yields the raw XML of all elements with given tag without parsing the rest of the dump.
+
+    :param dump: mmap object with an XML dump
+    :param tag: the tag name of the elements
+    :return: generator yielding bytes
+    """
+    start_tag = "<{}>".format(tag).encode("utf-8")
+    end_tag = "</{}>".format(tag).encode("utf-8")
+    start = dump.find(start_tag)
+    while start != -1:
+        end = dump.find(end_tag, start)
+        if end == -1:
+            return
+        end += len(end_tag)
+        yield dump[start:end]
+        start = dump.find(start_tag, end)
+
+
+def iterate_lines(dump):
+    line = dump.readline()
+    while line:
+        yield line
+        line = dump.readline()
+
+
+def parallel_map(function, batches, processes=None, initializer=None, initargs=()):
+    """
+    Maps a function over batches in worker processes and yields results in order.
+    With a single process the batches get mapped in the current process instead.
+
+    :param function: a picklable function that takes a batch
+    :param batches: iterable of batches
+    :param processes: (optional) the amount of worker processes (CPU count by default)
+    :param initializer: (optional) function that gets called once in every worker
+    :param initargs: (optional) arguments for the initializer
+    :return: generator yielding results
+    """
+    if processes == 1:
+        if initializer is not None:
+            initializer(*initargs)
+        for batch in batches:
+            yield function(batch)
+        return
+    with Pool(processes, initializer=initializer, initargs=initargs) as pool:
+        for result in pool.imap(function, batches):
+            yield result
+
+
+def parse_pages(pages, start_time=None, end_time=None):
+    """
+    Parses pages of an XML revision dump into revisions that look like changes from the recent changes API.
+    Like WikipediaRecentChanges only revisions to articles that are not redirects or minor edits get returned.
+
+    :param pages: list of page XML as bytes
+    :param start_time: (optional) epoch of the first revisions to include
+    :param end_time: (optional) epoch of the first revisions to exclude
+    :return: list of revision dicts
+    """
+    revisions = []
+    for page_xml in pages:
+        page = ElementTree.fromstring(page_xml)
+        if page.findtext("ns") != "0" or page.find("redirect") is not None:
+            continue
+        pageid = int(page.findtext("id"))
+        title = page.findtext("title")
+        for revision in page.iter("revision"):
+            if revision.find("minor") is not None:
+                continue
+            timestamp = revision.findtext("timestamp")
+            epoch = get_timestamp_epoch(timestamp)
+            if start_time is not None and epoch < start_time or end_time is not None and epoch >= end_time:
+                continue
+            contributor = revision.find("contributor")
+            user = None
+            if contributor is not None:
+                user = contributor.findtext("username") or contributor.findtext("ip")
+            revisions.append({
+                "pageid": pageid,
+                "revid": int(revision.findtext("id")),
+                "title": title,
+                "timestamp": timestamp,
+                "comment": revision.findtext("comment") or "",
+                "user": user
+            })
+    return revisions
+
+
+def iterate_revision_dump(file_path, start_time=None, end_time=None, processes=None):
+    """
+    Reads an uncompressed XML revision dump and yields revisions of articles.
+    Pages get found in the memory mapped dump and get parsed in worker processes.
+
+    :param file_path: path to the XML dump
+    :param start_time: (optional) epoch of the first revisions to include
+    :param end_time: (optional) epoch of the first revisions to exclude
+    :param processes: (optional) the amount of worker processes (CPU count by default)
+    :return: generator yielding revision dicts
+    """
+    parse = partial(parse_pages, start_time=start_time, end_time=end_time)
+    with open_dump(file_path) as dump:
+        batches = ibatch(iterate_elements(dump, "page"), batch_size=PAGE_BATCH_SIZE)
+        for revisions in parallel_map(parse, batches, processes=processes):
+            for revision in revisions:
+                yield revision
+
+
+def set_entity_filter(entity_ids, claim_properties):
+    global _entity_ids, _claim_properties
+    _entity_ids = entity_ids
+    _claim_properties = set(claim_properties) if claim_properties else None
+
+
+def parse_entities(lines):
+    """
+    Parses lines of a JSON entity dump into items like WikiDataItems returns them.
+    When set_entity_filter got called only entities with those ids get parsed
+    and only claims with the given properties get kept.
+
+    :param lines: list of lines as bytes
+    :return: list of item dicts
+    """
+    parser = WikiDataItems()
+    claim_properties = _claim_properties if _claim_properties is not None else parser.get_claim_properties()
+    items = []
+    for line in lines:
+        line = line.strip().rstrip(b",")
+        if line in [b"", b"[", b"]"]:
+            continue
+        entity = json.loads(line.decode("utf-8"))
+        if _entity_ids is not None and entity.get("id") not in _entity_ids:
+            continue
+        for key in NON_CONTENT_ENTITY_KEYS:
+            entity.pop(key, None)
+        items.append(parser.get_item(entity, claim_properties))
+    return items
+
+
+def iterate_entity_dump(file_path, entity_ids=None, claim_properties=None, processes=None):
+    """
+    Reads an uncompressed JSON entity dump and yields items like WikiDataItems returns them.
+    Lines get read from the memory mapped dump and get parsed in worker processes.
+
+    :param file_path: path to the JSON dump
+    :param entity_ids: (optional) set of entity ids to yield items for (all entities by default)
+    :param claim_properties: (optional) list of properties of claims to keep (claim_properties configuration by default)
+    :param processes: (optional) the amount of worker processes (CPU count by default)
+    :return: generator yielding item dicts
+    """
+    with open_dump(file_path) as dump:
+        batches = ibatch(iterate_lines(dump), batch_size=ENTITY_BATCH_SIZE)
+        results = parallel_map(
+            parse_entities,
+            batches,
+            processes=processes,
+            initializer=set_entity_filter,
+            initargs=(entity_ids, claim_properties,)
+        )
+        for items in results:
+            for item in items:
+                yield item
@@ -1,3 +1,6 @@
+from types import MappingProxyType
+from calendar import timegm
+
 import dateutil.parser
 
 from core.processors.rank import RankProcessor
@@ -20,29 +23,49 @@ def categories_watch(categories, page_data):
         if category in categories
     ])
 
+''' Returns seconds since epoch for a Wikipedia timestamp like 2017-11-02T13:51:12Z'''
+def get_timestamp_epoch(timestamp):
+    if not timestamp:
+        return None
+    return timegm(dateutil.parser.parse(timestamp).utctimetuple())
+
+''' Returns the epoch of a revision, which gets set during ingestion or parsed for older data'''
+def get_revision_epoch(revision):
+    epoch = revision.get("epoch")
+    if epoch is None:
+        epoch = get_timestamp_epoch(revision.get("timestamp"))
+    return epoch
+
+''' Returns the values of all claims for a property, using the claim index from ingestion when available'''
+def get_claim_values(property, wikidata):
+    claim_index = wikidata.get("claim_index")
+    if claim_index is not None:
+        return claim_index.get(property, [])
+    return [claim["value"] for claim in wikidata.get("claims", []) if claim["property"] == property]
+
 ''' Returns articles with a given claim e.g. if property(genre) is item(superhero film)'''
 def claim_watch(property, item, wikidata):
-    return any(
-        (claim for claim in wikidata.get("claims", [])
-        if claim["property"] == property and claim["value"] == item)
-    )
+    return item in get_claim_values(property, wikidata)
 
 ''' Returns articles ranked by a quantity from wikidata e.g. property(box office)'''
 def get_quantity(property, wikidata):
     return next(
-        (float(claim["value"]["amount"]) for claim in wikidata.get("claims", [])
-        if claim["property"] == property)
+        (float(value["amount"]) for value in get_claim_values(property, wikidata))
     , 0.0)
 
 
 class WikipediaRankProcessor(RankProcessor):
 
+    FEATURE_STORE = "features"
+    FEATURE_IDENTIFIER = "pageid"
+    CLAIM_PROPERTIES = ["P17", "P21", "P31", "P136", "P1120", "P2142"]  # Wikidata properties that hooks read
+
     def get_hook_arguments(self, individual):
         individual_argument = super(WikipediaRankProcessor, self).get_hook_arguments(individual)[0]
         wikidata_argument = individual_argument.get("wikidata", {})
         if wikidata_argument is None or isinstance(wikidata_argument, str):
             wikidata_argument = {}
-        return [individual_argument, wikidata_argument]
+        return [individual_argument, MappingProxyType(wikidata_argument)]
 
     @staticmethod
     def investigative_journalism(page, wikidata):
@@ -68,26 +91,19 @@ class WikipediaRankProcessor(RankProcessor):
     def number_of_deaths(page, wikidata):
         number_of_deaths_property = "P1120"
         return next(
-            (int(claim["value"]["amount"]) for claim in wikidata.get("claims", [])
-            if claim["property"] == number_of_deaths_property)
+            (int(value["amount"]) for value in get_claim_values(number_of_deaths_property, wikidata))
         , 0)
 
     @staticmethod
     def is_woman(page, wikidata):
         sex_property = "P21"
         women_item = "Q6581072"
-        return any(
-            (claim for claim in wikidata.get("claims", [])
-            if claim["property"] == sex_property and claim["value"] == women_item)
-        )
+        return claim_watch(sex_property, women_item, wikidata)
 
     @staticmethod
     def box_office(page, wikidata):
         box_office_property = "P2142"
-        return next(
-            (float(claim["value"]["amount"]) for claim in wikidata.get("claims", [])
-             if claim["property"] == box_office_property)
-            , 0)
+        return get_quantity(box_office_property, wikidata)
 
     @staticmethod
     def superhero_blockbusters(page, wikidata):
@@ -113,8 +129,8 @@ class WikipediaRankProcessor(RankProcessor):
         :return: True if a page is breaking news, False if it isn't
         """
         revisions = sorted(
-            page.get("revisions", []),
-            key=lambda rev: rev["timestamp"]
+            ((get_revision_epoch(revision), revision) for revision in page.get("revisions", [])),
+            key=lambda rev: rev[0]
         )
         if not len(revisions):
             return None
@@ -122,17 +138,16 @@ class WikipediaRankProcessor(RankProcessor):
         # First we build "clusters" of revisions (aka edits) that happened 60 seconds from each other
         clusters = []
         revisions = iter(revisions)
-        cluster_revisions = [next(revisions)]
-        for revision in revisions:
-            last_revision_timestamp = cluster_revisions[-1].get("timestamp")
-            between_revisions = dateutil.parser.parse(revision.get("timestamp")) - \
-                                dateutil.parser.parse(last_revision_timestamp)
-            if between_revisions.seconds >= 60:
+        last_epoch, first_revision = next(revisions)
+        cluster_revisions = [first_revision]
+        for epoch, revision in revisions:
+            if epoch - last_epoch >= 60:
                 if len(cluster_revisions) > 1:
                     clusters.append(cluster_revisions)
                 cluster_revisions = [revision]
-                continue
-            cluster_revisions.append(revision)
+            else:
+                cluster_revisions.append(revision)
+            last_epoch = epoch
 
         # Now we check the clusters for the breaking news quality defined as:
         # At least 3 concurrent revisions (paper suggests 5, but that is cross language and we only look at English)
@@ -182,9 +197,8 @@ class WikipediaRankProcessor(RankProcessor):
             'Q39',  # Switzerland
         ]
         return any(
-            (claim["value"] for claim in wikidata.get("claims", [])
-             if claim["property"] == country_property and
-             claim["value"] in central_europe_country_entities)
+            value in central_europe_country_entities
+            for value in get_claim_values(country_property, wikidata)
         )
 
     @staticmethod
@@ -4,8 +4,9 @@ from datetime import date, datetime, timedelta
 
 from core.management.commands.grow_community import Command as GrowCommand
 from core.utils.configuration import DecodeConfigAction
+from core.models.organisms.states import CommunityState
 from sources.models import WikipediaListPages, WikipediaRecentChanges, WikiDataItems, WikipediaPageviewDetails
-from wiki_feed.models import WikiFeedCommunity
+from wiki_feed.models import WikiFeedCommunity, RecentChangesStream
 
 
 class Command(GrowCommand):
@@ -14,6 +15,10 @@ class Command(GrowCommand):
         parser.add_argument('community', type=str, nargs="?", default="WikiFeedCommunity")
         parser.add_argument('-c', '--config', type=str, action=DecodeConfigAction, nargs="?", default={})
         parser.add_argument('-d', '--delete', action="store_true")
+        parser.add_argument('-i', '--incremental', action="store_true")
+        parser.add_argument('-s', '--stream', type=str, nargs="?", const="en", default=None)
+        parser.add_argument('--revisions-dump', type=str, default=None)
+        parser.add_argument('--entities-dump', type=str, default=None)
 
     @staticmethod
     def clear_database():
@@ -24,8 +29,22 @@ class Command(GrowCommand):
         WikiDataItems.objects.all().delete()
         WikipediaPageviewDetails.objects.all().delete()
 
+    @staticmethod
+    def get_predecessor():
+        return WikiFeedCommunity.objects \
+            .filter(signature="recent_changes", state=CommunityState.READY) \
+            .order_by("created_at") \
+            .last()
+
     @staticmethod
     def archive_growth():
+        """
+        Renames the signature of communities that grew the recent changes before, so a new community gets created.
+        Their manifestations remain until the new community took over the most recent ones.
+
+        :return: list of ids of the archived communities
+        """
+        archived_ids = []
         for community in WikiFeedCommunity.objects.filter(signature="recent_changes"):
             start = datetime.fromtimestamp(community.config.start_time)
             end = datetime.fromtimestamp(community.config.end_time)
@@ -34,7 +53,23 @@ class Command(GrowCommand):
                 end.strftime("%Y-%m-%d")
             )
             community.save()
-            community.manifestation_set.all().delete()
+            archived_ids.append(community.id)
+        return archived_ids
+
+    def take_over_manifestations(self, community):
+        """
+        Moves the most recent manifestations of archived communities to the new community and deletes the rest.
+        The archived communities no longer have the recent_changes signature,
+        which is why this doesn't happen when the community grows.
+
+        :param community: the newly grown community
+        :return: None
+        """
+        archived = WikiFeedCommunity.objects.filter(id__in=self.archived_ids)
+        if community.state == CommunityState.READY:
+            community.warm_up_manifestations(predecessors=archived)
+        for archived_community in archived:
+            archived_community.manifestation_set.all().delete()
 
     def handle_community(self, community, **options):
         today_at_midnight = (date.today() - date(1970, 1, 1)).total_seconds()
@@ -43,11 +78,31 @@ class Command(GrowCommand):
             "start_time": yesterday_at_midnight,
             "end_time": today_at_midnight
         }
+        if self.predecessor is not None:
+            # Recent changes get fetched from the last end_time, pages and items known by the predecessor get reused
+            community.config = {
+                "start_time": max(yesterday_at_midnight, self.predecessor.config.end_time),
+                "predecessor": self.predecessor.id
+            }
+        if self.stream is not None:
+            # Recent changes get read from the changes that ingest_recent_changes collected
+            community.config = {
+                "stream": self.stream.id
+            }
+        if options["revisions_dump"] or options["entities_dump"]:
+            # Revisions and/or Wikidata items get read from local dump files instead of the API
+            community.config = {
+                "revisions_dump": options["revisions_dump"],
+                "entities_dump": options["entities_dump"]
+            }
         community.signature = "recent_changes"
         super(Command, self).handle_community(community, **options)
+        self.take_over_manifestations(community)
 
     def handle(self, *args, **options):
         if options["delete"]:
             self.clear_database()
-        self.archive_growth()
+        self.predecessor = self.get_predecessor() if options["incremental"] else None
+        self.stream = RecentChangesStream.objects.get(wiki_country=options["stream"]) if options["stream"] else None
+        self.archived_ids = self.archive_growth()
         super(Command, self).handle(*args, **options)
@@ -0,0 +1,32 @@
+from __future__ import unicode_literals, absolute_import, print_function, division
+
+import logging
+
+from django.core.management.base import BaseCommand
+
+from wiki_feed.models import RecentChangesStream
+
+
+log = logging.getLogger("datascope")
+
+
+class Command(BaseCommand):
+    """
+    Adds recent changes to a RecentChangesStream. Run this every few minutes
+    and grow_wiki_feed with --stream to build the daily feed from ingested changes.
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument('-w', '--wiki-country', type=str, default="en")
+        parser.add_argument('-r', '--replay', type=str, help="change log file with a recent changes response per line")
+        parser.add_argument('-l', '--limit', type=int, default=None)
+
+    def handle(self, *args, **options):
+        stream, created = RecentChangesStream.objects.get_or_create(wiki_country=options["wiki_country"])
+        if options["replay"]:
+            with open(options["replay"]) as change_log:
+                count = stream.replay(change_log)
+            log.info("Replayed {} responses for {}".format(count, stream))
+        else:
+            count = stream.ingest(request_limit=options["limit"])
+            log.info("Made {} requests for {}".format(count, stream))
@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+import json_field.fields
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0022_collective_view_of'),
+        ('wiki_feed', '0003_wikifeedpublishcommunity'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RecentChangesStream',
+            fields=[
+                ('id', models.AutoField(verbose_name='ID', auto_created=True, primary_key=True, serialize=False)),
+                ('wiki_country', models.CharField(unique=True, max_length=10)),
+                ('next_request', json_field.fields.JSONField(default='null', help_text='Enter a valid JSON object', null=True, blank=True)),
+                ('last_timestamp', models.FloatField(null=True, blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('modified_at', models.DateTimeField(auto_now=True)),
+                ('changes', models.ForeignKey(related_name='+', blank=True, to='core.Collective', null=True)),
+            ],
+            options={
+                'verbose_name': 'Recent changes stream',
+                'verbose_name_plural': 'Recent changes streams',
+            },
+        ),
+    ]
@@ -0,0 +1,26 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations
+
+
+def detach_changes_from_streams(apps, schema_editor):
+    RecentChangesStream = apps.get_model("wiki_feed", "RecentChangesStream")
+    Collective = apps.get_model("core", "Collective")
+    Individual = apps.get_model("core", "Individual")
+    changes_ids = RecentChangesStream.objects.filter(changes__isnull=False).values_list("changes_id", flat=True)
+    changes_ids = list(changes_ids)
+    Collective.objects.filter(id__in=changes_ids).update(community_type=None, community_id=None)
+    Individual.objects.filter(collective_id__in=changes_ids).update(community_type=None, community_id=None)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0023_organism_community_null'),
+        ('wiki_feed', '0004_recentchangesstream'),
+    ]
+
+    operations = [
+        migrations.RunPython(detach_changes_from_streams, migrations.RunPython.noop),
+    ]
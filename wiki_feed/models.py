@@ -1,16 +1,32 @@
 import re
+import json
+import math
+import hashlib
 
 from collections import OrderedDict
-from itertools import groupby, islice
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from itertools import islice
 from datetime import datetime
+from time import time
+
+import json_field
+from urlobject import URLObject
 
 from django.conf import settings
+from django.db import models, connection
+from django.core.cache import caches
 from django.template.loader import render_to_string
 
-from core.models.organisms import Community, Individual
+from core.models.organisms import Community, Collective, Individual
+from core.models.organisms.growth import GrowthState
+from core.processors.extraction import ExtractProcessor
 from core.views import CommunityView
-from core.exceptions import DSResourceException
-from sources.models.wikipedia import WikipediaCategories
+from core.exceptions import DSResourceException, DSHttpError40X
+from core.utils.helpers import ibatch
+from sources.models.wikipedia import WikipediaCategories, WikipediaRecentChanges
+from sources.processors.wikipedia.rank import WikipediaRankProcessor, get_timestamp_epoch
+from sources.processors.wikipedia.dumps import iterate_revision_dump, iterate_entity_dump
 
 
 class WikiFeedCommunity(Community):
@@ -79,12 +95,14 @@ class WikiFeedCommunity(Community):
                     "@": "$",
                     "wikidata": "$.id",
                     "claims": "$.claims",
+                    "claim_index": "$.claim_index",
                     "references": "$.references",
                     "description": "$.description",
                 },
                 "_inline_key": "wikidata",
                 "_concat_args_size": 50,
                 "_continuation_limit": 1000,
+                "claim_properties": WikipediaRankProcessor.CLAIM_PROPERTIES,
                 "user_agent": USER_AGENT
             },
             "schema": {},
@@ -120,7 +138,12 @@ class WikiFeedCommunity(Community):
         }
     ]
     ASYNC_MANIFEST = True
+    ASYNC_GROWTH_CALLBACKS = True
     INPUT_THROUGH_PATH = False
+    WARM_UP_SIZE = 20
+    IMAGE_BATCH_SIZE = 50  # maximum amount of titles per request that the Wikipedia API accepts
+    IMAGE_CONCURRENCY = 4
+    PAGEID_BATCH_SIZE = 300  # stays below SQLite variable limits when filtering on pageids
 
     PUBLIC_CONFIG = {
         "$edit_count": 1,
@@ -142,37 +165,186 @@ class WikiFeedCommunity(Community):
     def initial_input(self, *args):
         return Individual.objects.create(community=self, properties={}, schema={})
 
-    def finish_revisions(self, out, err):
-        pages_growth = self.next_growth()
-        grouped_pages = groupby(out.individual_set.order_by("identity").iterator(), lambda ind: ind.identity)
-
-        pages = []
-        for pageid, revision_individuals in grouped_pages:
+    @staticmethod
+    def group_revisions(revisions):
+        """
+        Groups the recent changes in given Collective into page dicts holding the revisions and users of a page.
+        The database groups the revisions, which prevents loading all revisions as Individuals.
+        Revisions get an epoch with their timestamp in seconds, so rank hooks don't need to parse timestamps.
+
+        :param revisions: Collective with recent changes and pageid as identifier
+        :return: generator yielding page dicts
+        """
+        for pageid, page_revisions in revisions.iterate_grouped_properties():
             # Filter mysterious pageids like None and "0"
             if not pageid:
                 continue
-            revisions = list(revision_individuals)
-            pages.append({
+            yield {
                 "pageid": pageid,
-                "revisions": [revision.content for revision in revisions],
-                "users": list(
-                    {revision.properties["user"] for revision in revisions if revision.properties["user"]}
-                )
-            })
+                "revisions": [
+                    dict(
+                        {key: value for key, value in revision.items() if not key.startswith("_")},
+                        epoch=get_timestamp_epoch(revision.get("timestamp"))
+                    )
+                    for revision in page_revisions
+                ],
+                "users": list({revision["user"] for revision in page_revisions if revision.get("user")})
+            }
+
+    def get_predecessor_pages(self, pageids):
+        """
+        Returns page data that the predecessor of this community collected for any of the given pageids.
+        Incremental growth uses this to skip fetching pages and Wikidata items that got collected before.
+        Kernels identify pages by pageid, so only the requested pages get fetched and decoded.
+
+        :param pageids: set of pageids as strings
+        :return: dict with pageids as keys and page data as values
+        """
+        predecessor = self.predecessor
+        if predecessor is None or predecessor.kernel is None:
+            return {}
+        kernel = predecessor.kernel
+        if kernel.identifier != "pageid":  # kernels that got grown before pages were identified by pageid
+            return {
+                str(page.get("pageid")): page
+                for page in kernel.content
+                if str(page.get("pageid")) in pageids
+            }
+        known_pages = {}
+        for batch in ibatch(sorted(pageids), batch_size=self.PAGEID_BATCH_SIZE):
+            for individual in kernel.members.filter(identity__in=batch).iterator():
+                known_pages[individual.identity] = individual.content
+        return known_pages
+
+    @staticmethod
+    def get_recent_pageids(revisions):
+        return set(revisions.individual_set.values_list("identity", flat=True).distinct())
+
+    def finish_revisions(self, out, err):
+        pages_growth = self.next_growth()
+        known_pages = self.get_predecessor_pages(self.get_recent_pageids(out))
+        pages = []
+        for page in self.group_revisions(out):
+            if page["pageid"] in known_pages:
+                continue  # gets added by finish_wikidata without fetching
+            pages.append(page)
             if len(pages) >= 1000:
                 pages_growth.input.update(pages, reset=False)
                 pages = []
         if len(pages):
             pages_growth.input.update(pages, reset=False)
 
+    def setup_growth(self, *args):
+        super(WikiFeedCommunity, self).setup_growth(*args)
+        if getattr(self.config, "stream", None):
+            self.aggregate_stream()
+        elif getattr(self.config, "revisions_dump", None):
+            self.load_revisions_dump()
+
+    def fill_revisions(self, changes):
+        """
+        Fills the revisions growth with changes that got collected without fetching them
+        and finishes the revisions growth right away.
+
+        :param changes: iterator of change dicts matching the revisions objective
+        :return: None
+        """
+        revisions_growth = self.growth_set.filter(type="revisions").last()
+        revisions = revisions_growth.output
+        revisions.update(changes, reset=False, validate=False)
+        revisions_growth.state = GrowthState.COMPLETE
+        revisions_growth.save()
+        self.finish_revisions(revisions, [])
+
+    def aggregate_stream(self):
+        """
+        Fills the revisions growth with changes that a RecentChangesStream ingested before,
+        instead of fetching all recent changes at once.
+        Set the "stream" configuration to the id of a RecentChangesStream to enable this.
+
+        :return: None
+        """
+        stream = RecentChangesStream.objects.get(id=self.config.stream)
+        changes = stream.iterate_changes(self.config.start_time, getattr(self.config, "end_time", None))
+        self.fill_revisions(changes)
+
+    @staticmethod
+    def extract_dump_data(growth_type, data, wrap):
+        """
+        Extracts data read from a dump with the objective of a growth, so it matches data fetched from the API.
+
+        :param growth_type: the growth in COMMUNITY_SPIRIT with the objective
+        :param data: iterator of dicts as the API returns them
+        :param wrap: function that wraps a batch of dicts into an API response
+        :return: generator yielding extracted dicts
+        """
+        objective = WikiFeedCommunity.COMMUNITY_SPIRIT[growth_type]["config"]["_objective"]
+        extractor = ExtractProcessor({"_objective": objective})
+        for batch in ibatch(data, batch_size=settings.MAX_BATCH_SIZE):
+            for extracted in extractor.extract("application/json", wrap(batch)):
+                yield extracted
+
+    def load_revisions_dump(self):
+        """
+        Fills the revisions growth with revisions from a local XML revision dump instead of the API.
+        Set the "revisions_dump" configuration to the path of an uncompressed dump to enable this.
+
+        :return: None
+        """
+        revisions = iterate_revision_dump(
+            self.config.revisions_dump,
+            start_time=getattr(self.config, "start_time", None),
+            end_time=getattr(self.config, "end_time", None)
+        )
+        wrap = lambda batch: {"query": {"recentchanges": batch}}
+        self.fill_revisions(self.extract_dump_data("revisions", revisions, wrap))
+
+    def finish_pages(self, out, err):
+        if getattr(self.config, "entities_dump", None):
+            self.load_entities_dump(out)
+
+    def load_entities_dump(self, pages):
+        """
+        Inlines items from a local JSON entity dump into the pages instead of fetching them from the API.
+        The wikidata growth gets finished right away.
+        Set the "entities_dump" configuration to the path of an uncompressed dump to enable this.
+
+        :param pages: Collective with pages
+        :return: None
+        """
+        wikidata_growth = self.growth_set.filter(type="wikidata").last()
+        pages.rekey("wikidata")
+        entity_ids = set(pages.individual_set.exclude(identity=None).values_list("identity", flat=True))
+        items = iterate_entity_dump(
+            self.config.entities_dump,
+            entity_ids=entity_ids,
+            claim_properties=self.COMMUNITY_SPIRIT["wikidata"]["config"]["claim_properties"]
+        )
+        wrap = lambda batch: batch
+        wikidata_growth.inline_by_key(self.extract_dump_data("wikidata", items, wrap), "wikidata")
+        wikidata_growth.state = GrowthState.COMPLETE
+        wikidata_growth.save()
+        self.finish_wikidata(wikidata_growth.output, [])
+
     def begin_wikidata(self, inp):
         pages = self.growth_set.filter(type="pages").last().output
-        pages.identifier = "wikidata"
-        pages.save()
-        now = datetime.now()
-        pages.update(pages.content, reset=False, validate=False)
-        pages.individual_set.filter(created_at__lt=now).delete()
-        inp.update(pages.individual_set.filter(identity__isnull=False).exclude(identity="").iterator())
+        pages.rekey("wikidata")
+        inp.view_of = pages  # pages with a wikidata identity become input without copying them
+        inp.save()
+
+    def finish_wikidata(self, out, err):
+        revisions = self.growth_set.filter(type="revisions").last().output
+        known_pages = self.get_predecessor_pages(self.get_recent_pageids(revisions))
+        if known_pages:
+            # Grouped revisions carry their pageid as identity string, while pages store pageids as integers
+            reused_pages = (
+                dict(known_pages[page["pageid"]], **dict(page, pageid=int(page["pageid"])))
+                for page in self.group_revisions(revisions)
+                if page["pageid"] in known_pages
+            )
+            out.update(reused_pages, reset=False, validate=False)
+        # Successors look up pages of the kernel by pageid
+        out.rekey("pageid")
 
     def begin_pageviews(self, inp):
         inp.identifier = "title"
@@ -184,53 +356,124 @@ class WikiFeedCommunity(Community):
     def set_kernel(self):
         self.kernel = self.current_growth.output
 
-    @staticmethod
-    def filter_commons_images(image_titles):
-        if not len(image_titles):
-            return image_titles
+    @classmethod
+    def fetch_image_categories(cls, config, image_titles, close_connection=False):
+        """
+        Fetches the categories of a batch of files from Wikipedia.
+
+        :param config: configuration for WikipediaCategories
+        :param image_titles: list of file titles
+        :param close_connection: (optional) closes the database connection when done to use this in a thread
+        :return: dict with page ids as keys and page data as values
+        """
         try:
-            config = {"wiki_country": "commons"}
-            titles = "|".join(image_titles)
-            image_categories = WikipediaCategories(config=config).get(titles)
-        except DSResourceException as exc:
-            image_categories = exc.resource
-        return [
-            image["title"].replace(" ", "_")
-            for page_id, image in image_categories.get_wikipedia_json().items()
-            if int(page_id) < 0
-        ]
+            try:
+                image_categories = WikipediaCategories(config=config).get("|".join(image_titles))
+            except DSResourceException as exc:
+                image_categories = exc.resource
+            return image_categories.get_wikipedia_json()
+        finally:
+            if close_connection:
+                connection.close()
+
+    @classmethod
+    def get_image_categories(cls, config, image_titles):
+        """
+        Fetches the categories of files in batches that the Wikipedia API accepts. Multiple batches get fetched concurrently.
+
+        :param config: configuration for WikipediaCategories
+        :param image_titles: list of file titles
+        :return: list with the pages of every batch
+        """
+        batches = list(ibatch(image_titles, batch_size=cls.IMAGE_BATCH_SIZE))
+        if len(batches) <= 1:
+            return [cls.fetch_image_categories(config, batch) for batch in batches]
+        fetch_in_thread = partial(cls.fetch_image_categories, config, close_connection=True)
+        with ThreadPoolExecutor(max_workers=cls.IMAGE_CONCURRENCY) as executor:
+            return list(executor.map(fetch_in_thread, batches))
+
+    @classmethod
+    def lookup_commons_images(cls, image_titles):
+        """
+        Looks up which files are hosted on Wikimedia Commons.
+
+        :param image_titles: list of file titles
+        :return: dict with True for files on Commons and False for local files, only for files the API returned
+        """
+        if not len(image_titles):
+            return {}
+        config = {"wiki_country": "commons"}
+        return {
+            image["title"].replace(" ", "_"): int(page_id) >= 0
+            for image_categories in cls.get_image_categories(config, image_titles)
+            for page_id, image in image_categories.items()
+        }
 
-    @staticmethod
-    def filter_free_images(image_titles):
+    @classmethod
+    def lookup_free_images(cls, image_titles):
+        """
+        Looks up which local files are in the free media category.
+
+        :param image_titles: list of file titles
+        :return: dict with True for free files and False for non-free files, only for files the API returned
+        """
         if not len(image_titles):
-            return image_titles
-        try:
-            config = {"wiki_show_categories": "hidden"}
-            titles = "|".join(image_titles)
-            image_categories = WikipediaCategories(config=config).get(titles)
-        except DSResourceException as exc:
-            image_categories = exc.resource
-        non_free_images = set()
-        for page_id, page_content in image_categories.get_wikipedia_json().items():
-            free_image = any([
-                category
+            return {}
+        config = {"wiki_show_categories": "hidden"}
+        return {
+            page_content["title"].replace(" ", "_"): any(
+                category["title"] == "Category:All free media"
                 for category in page_content.get("categories", [])
-                if "Category:All free media" == category["title"]
-            ])
-            if not free_image:
-                non_free_images.add(page_content["title"].replace(" ", "_"))
-        return list(non_free_images)
+            )
+            for image_categories in cls.get_image_categories(config, image_titles)
+            for page_id, page_content in image_categories.items()
+        }
+
+    @staticmethod
+    def get_image_license_key(image_title):
+        return "image_license:" + hashlib.sha1(image_title.encode("utf-8")).hexdigest()
+
+    @classmethod
+    def get_image_licenses(cls, image_titles):
+        """
+        Indicates for files whether they are free to use. Files that are not in the image_licenses cache get looked up.
+        Only files that the API returned get cached.
+        Files that could not be looked up count as free and get looked up again next time.
+
+        :param image_titles: list of file titles
+        :return: dict with file titles as keys and True for free files or False for non-free files as values
+        """
+        license_cache = caches["image_licenses"]
+        license_keys = {image_title: cls.get_image_license_key(image_title) for image_title in image_titles}
+        cached_licenses = license_cache.get_many(list(license_keys.values()))
+        licenses = {
+            image_title: cached_licenses[license_key]
+            for image_title, license_key in license_keys.items()
+            if license_key in cached_licenses
+        }
+        unknown_images = [image_title for image_title in image_titles if image_title not in licenses]
+        if not unknown_images:
+            return licenses
+        commons_images = cls.lookup_commons_images(unknown_images)
+        local_images = [image_title for image_title, is_commons in commons_images.items() if not is_commons]
+        resolved_licenses = {image_title: True for image_title, is_commons in commons_images.items() if is_commons}
+        resolved_licenses.update(cls.lookup_free_images(local_images))
+        license_cache.set_many({
+            license_keys[image_title]: is_free
+            for image_title, is_free in resolved_licenses.items()
+            if image_title in license_keys
+        })
+        licenses.update({image_title: resolved_licenses.get(image_title, True) for image_title in unknown_images})
+        return licenses
 
     @property
     def manifestation(self):
         pages = list(super(WikiFeedCommunity, self).manifestation)
-        image_titles = ["File:{}".format(page["image"]) for page in pages if "image" in page and page["image"]]
-        en_images = WikiFeedCommunity.filter_commons_images(image_titles)
-        non_free_images = WikiFeedCommunity.filter_free_images(en_images)
-        if len(non_free_images):
-            for page in pages:
-                if "File:{}".format(page["image"]) in non_free_images:
-                    page["image"] = None
+        image_titles = list({"File:{}".format(page["image"]) for page in pages if page.get("image")})
+        licenses = WikiFeedCommunity.get_image_licenses(image_titles)
+        for page in pages:
+            if page.get("image") and not licenses.get("File:{}".format(page["image"]), True):
+                page["image"] = None
         return pages
 
     class Meta:
@@ -420,3 +663,184 @@ class WikiFeedPublishCommunity(Community):
     class Meta:
         verbose_name = "Wiki feed publication"
         verbose_name_plural = "Wiki feed publications"
+
+
+class RecentChangesStream(models.Model):
+    """
+    Ingests Wikipedia recent changes continuously into a rolling Collective.
+    The continuation request and the time until which changes got ingested are stored,
+    so every run continues where the previous run stopped.
+    """
+
+    wiki_country = models.CharField(max_length=10, unique=True)
+    next_request = json_field.JSONField(default=None, null=True, blank=True)
+    last_timestamp = models.FloatField(null=True, blank=True)
+    changes = models.ForeignKey(Collective, null=True, blank=True, related_name="+")
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    modified_at = models.DateTimeField(auto_now=True)
+
+    REQUEST_LIMIT = 50  # maximum amount of continuation requests per run
+    ROLLING_WINDOW = 60 * 60 * 24 * 2  # seconds of changes that get kept
+
+    def get_changes(self):
+        """
+        Returns the Collective with ingested changes and creates it when it does not exist yet.
+        Changes are identified by their epoch, which lets windows and pruning filter on the indexed identity.
+        The stream is not a Community, so the Collective only belongs to the stream through its changes field.
+
+        :return: Collective with epoch as identifier
+        """
+        if self.changes is None:
+            self.changes = Collective.objects.create(schema={}, identifier="epoch")
+            self.save()
+        elif self.changes.identifier != "epoch":  # changes that got ingested before they were identified by epoch
+            self.changes.rekey("epoch")
+        return self.changes
+
+    @staticmethod
+    def get_epoch_identity(epoch):
+        """
+        Returns the identity of changes at the first whole second at or after given epoch.
+        Epochs between 2001 and 2286 all have ten digits, so their identities sort like the epochs themselves.
+
+        :param epoch: epoch in seconds
+        :return: epoch as identity string
+        """
+        return str(int(math.ceil(epoch)))
+
+    def filter_changes(self, start_time=None, end_time=None):
+        """
+        Returns the members of the rolling Collective that happened within given window.
+
+        :param start_time: (optional) epoch of the start of the window
+        :param end_time: (optional) epoch of the end of the window
+        :return: Individual queryset
+        """
+        changes = self.get_changes().individual_set.all()
+        if start_time is not None:
+            changes = changes.filter(identity__gte=self.get_epoch_identity(start_time))
+        if end_time is not None:
+            changes = changes.filter(identity__lt=self.get_epoch_identity(end_time))
+        return changes
+
+    def get_config(self, start_time, end_time):
+        config = WikiFeedCommunity.COMMUNITY_SPIRIT["revisions"]["config"]
+        return {
+            "wiki_country": self.wiki_country,
+            "start_time": start_time,
+            "end_time": end_time,
+            "user_agent": config["user_agent"]
+        }
+
+    def add_changes(self, data):
+        """
+        Extracts changes from the data of a recent changes response and adds them to the rolling Collective.
+        Changes get an epoch with their timestamp in seconds, which windows and pruning use.
+
+        :param data: dict with a Wikipedia recent changes response
+        :return: None
+        """
+        objective = WikiFeedCommunity.COMMUNITY_SPIRIT["revisions"]["config"]["_objective"]
+        extractor = ExtractProcessor({"_objective": objective})
+        changes = [
+            dict(change, epoch=get_timestamp_epoch(change.get("timestamp")))
+            for change in extractor.extract("application/json", data)
+            if change.get("timestamp")  # changes without a timestamp can't be windowed or pruned
+        ]
+        self.get_changes().update(changes, reset=False, validate=False)
+
+    def ingest(self, end_time=None, request_limit=None):
+        """
+        Fetches changes since the last run and adds them to the rolling Collective.
+        The continuation request gets stored after every response,
+        so a run that hits the request limit or fails gets continued by the next run.
+
+        :param end_time: (optional) epoch until which changes get fetched (now by default, ignored when continuing)
+        :param request_limit: (optional) maximum amount of requests (REQUEST_LIMIT by default)
+        :return: amount of requests made
+        """
+        if self.next_request:  # continues the window of the previous run
+            end_time = float(URLObject(self.next_request["url"]).query.dict["rcend"])
+        end_time = end_time or time()
+        # Windows include changes at their end, so the next window starts a second later to prevent duplicates
+        start_time = self.last_timestamp + 1 if self.last_timestamp else end_time - self.ROLLING_WINDOW
+        request_limit = request_limit or self.REQUEST_LIMIT
+        config = self.get_config(start_time, end_time)
+        count = 0
+        while count < request_limit:
+            resource = WikipediaRecentChanges(config=config)
+            if self.next_request:
+                resource.request = self.next_request
+            count += 1
+            try:
+                resource = resource.get()
+            except DSHttpError40X:  # no changes in the requested window
+                self.next_request = None
+                self.last_timestamp = end_time
+                break
+            content_type, data = resource.content
+            self.add_changes(data)
+            self.next_request = resource.create_next_request()
+            if not self.next_request:
+                self.last_timestamp = end_time
+                break
+            self.save()
+        self.save()
+        self.prune()
+        return count
+
+    def replay(self, change_log):
+        """
+        Adds changes from a local change log instead of fetching them. Useful for testing without network access.
+        The change log should contain a Wikipedia recent changes response per line.
+
+        :param change_log: file object with the change log
+        :return: amount of responses replayed
+        """
+        count = 0
+        for line in change_log:
+            line = line.strip()
+            if not line:
+                continue
+            data = json.loads(line)
+            self.add_changes(data)
+            epochs = [
+                get_timestamp_epoch(change.get("timestamp"))
+                for change in data.get("query", {}).get("recentchanges", [])
+            ]
+            self.last_timestamp = max([self.last_timestamp or 0] + [epoch for epoch in epochs if epoch])
+            count += 1
+        self.save()
+        self.prune()
+        return count
+
+    def prune(self):
+        """
+        Deletes changes that are older than the ROLLING_WINDOW before the last timestamp.
+
+        :return: None
+        """
+        if self.changes is None or not self.last_timestamp:
+            return
+        self.filter_changes(end_time=self.last_timestamp - self.ROLLING_WINDOW).delete()
+
+    def iterate_changes(self, start_time=None, end_time=None):
+        """
+        Yields ingested changes that happened within given window.
+
+        :param start_time: (optional) epoch of the start of the window
+        :param end_time: (optional) epoch of the end of the window
+        :return: generator yielding change dicts
+        """
+        if self.changes is None:
+            return
+        for individual in self.filter_changes(start_time, end_time).iterator():
+            yield individual.content
+
+    def __str__(self):
+        return "Recent changes stream for {}".format(self.wiki_country)
+
+    class Meta:
+        verbose_name = "Recent changes stream"
+        verbose_name_plural = "Recent changes streams"
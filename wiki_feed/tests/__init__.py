@@ -1,2 +1,4 @@
 from .community import TestWikiFeedCommunity
 from .features import TestWikiFeedFeatures, TestWikiFeedFeaturesHelpers
+from .stream import TestRecentChangesStream
+from .dumps import TestWikipediaDumps, TestWikiDataItemsProjection
@@ -1,5 +1,9 @@
+from mock import patch
+
 from django.test import TestCase
+from django.core.cache import caches
 
+from core.models.organisms import Collective
 from wiki_feed.models import WikiFeedCommunity
 
 
@@ -18,3 +22,55 @@ class TestWikiFeedCommunity(TestCase):
         self.instance.setup_growth()
         growth = self.instance.next_growth()
         self.assertEqual(growth.type, "revisions")
+
+    def test_get_predecessor_pages(self):
+        self.assertEqual(self.instance.get_predecessor_pages({"1", "2"}), {})
+        predecessor = WikiFeedCommunity()
+        predecessor.save()
+        kernel = Collective.objects.create(community=predecessor, schema={}, identifier="pageid")
+        kernel.update([
+            {"pageid": 1, "title": "known"},
+            {"pageid": 3, "title": "not requested"}
+        ])
+        predecessor.kernel = kernel
+        predecessor.save()
+        self.instance.config = {"predecessor": predecessor.id}
+        known_pages = self.instance.get_predecessor_pages({"1", "2"})
+        self.assertEqual(list(known_pages.keys()), ["1"])
+        self.assertEqual(known_pages["1"], {"pageid": 1, "title": "known"})
+        # Kernels that identify pages by something else get scanned
+        kernel.rekey("title")
+        known_pages = self.instance.get_predecessor_pages({"1", "2"})
+        self.assertEqual(known_pages, {"1": {"pageid": 1, "title": "known"}})
+
+    @patch.object(WikiFeedCommunity, "lookup_free_images", return_value={"File:non-free.jpg": False})
+    @patch.object(WikiFeedCommunity, "lookup_commons_images")
+    def test_get_image_licenses(self, lookup_commons_images, lookup_free_images):
+        lookup_commons_images.return_value = {"File:free.jpg": True, "File:non-free.jpg": False}
+        caches["image_licenses"].clear()
+        licenses = WikiFeedCommunity.get_image_licenses(["File:free.jpg", "File:non-free.jpg"])
+        self.assertEqual(licenses, {"File:free.jpg": True, "File:non-free.jpg": False})
+        lookup_free_images.assert_called_once_with(["File:non-free.jpg"])
+        self.assertEqual(lookup_commons_images.call_count, 1)
+        licenses = WikiFeedCommunity.get_image_licenses(["File:free.jpg", "File:non-free.jpg"])
+        self.assertEqual(licenses, {"File:free.jpg": True, "File:non-free.jpg": False})
+        self.assertEqual(lookup_commons_images.call_count, 1)
+        WikiFeedCommunity.get_image_licenses(["File:free.jpg", "File:new.jpg"])
+        lookup_commons_images.assert_called_with(["File:new.jpg"])
+
+    @patch.object(WikiFeedCommunity, "lookup_free_images", return_value={})
+    @patch.object(WikiFeedCommunity, "lookup_commons_images", return_value={})
+    def test_get_image_licenses_failed_lookup(self, lookup_commons_images, lookup_free_images):
+        caches["image_licenses"].clear()
+        licenses = WikiFeedCommunity.get_image_licenses(["File:unknown.jpg"])
+        self.assertEqual(licenses, {"File:unknown.jpg": True})
+        WikiFeedCommunity.get_image_licenses(["File:unknown.jpg"])
+        self.assertEqual(lookup_commons_images.call_count, 2)
+
+    @patch.object(WikiFeedCommunity, "fetch_image_categories", side_effect=lambda config, titles, **kwargs: titles)
+    def test_get_image_categories(self, fetch_image_categories):
+        titles = ["File:{}.jpg".format(index) for index in range(120)]
+        batches = WikiFeedCommunity.get_image_categories({}, titles)
+        self.assertEqual([len(batch) for batch in batches], [50, 50, 20])
+        self.assertEqual([title for batch in batches for title in batch], titles)
+        self.assertEqual(WikiFeedCommunity.get_image_categories({}, []), [])
@@ -0,0 +1,185 @@
+import os
+import json
+from tempfile import NamedTemporaryFile
+
+from mock import Mock
+
+from django.test import TestCase
+
+from sources.models.wikipedia import WikiDataItems
+from sources.processors.wikipedia.dumps import iterate_revision_dump, iterate_entity_dump
+from wiki_feed.models import WikiFeedCommunity
+
+
+REVISION_DUMP = """<mediawiki xmlns="http://www.mediawiki.org/xml/export-0.10/" xml:lang="en">
+  <siteinfo>
+    <sitename>Wikipedia</sitename>
+  </siteinfo>
+  <page>
+    <title>Article</title>
+    <ns>0</ns>
+    <id>1</id>
+    <revision>
+      <id>11</id>
+      <timestamp>2017-03-01T10:00:00Z</timestamp>
+      <contributor><username>Editor</username><id>5</id></contributor>
+      <comment>first edit</comment>
+      <text xml:space="preserve">Text</text>
+    </revision>
+    <revision>
+      <id>12</id>
+      <timestamp>2017-03-01T11:00:00Z</timestamp>
+      <contributor><ip>127.0.0.1</ip></contributor>
+      <minor />
+      <text xml:space="preserve">Text with typo fix</text>
+    </revision>
+    <revision>
+      <id>13</id>
+      <timestamp>2017-03-02T10:00:00Z</timestamp>
+      <contributor><ip>127.0.0.1</ip></contributor>
+      <text xml:space="preserve">More text</text>
+    </revision>
+  </page>
+  <page>
+    <title>Talk:Article</title>
+    <ns>1</ns>
+    <id>2</id>
+    <revision>
+      <id>21</id>
+      <timestamp>2017-03-01T10:00:00Z</timestamp>
+      <contributor><username>Editor</username><id>5</id></contributor>
+    </revision>
+  </page>
+  <page>
+    <title>Redirect</title>
+    <ns>0</ns>
+    <id>3</id>
+    <redirect title="Article" />
+    <revision>
+      <id>31</id>
+      <timestamp>2017-03-01T10:00:00Z</timestamp>
+      <contributor><username>Editor</username><id>5</id></contributor>
+    </revision>
+  </page>
+</mediawiki>
+"""
+
+
+def get_entity(entity_id, description):
+    return {
+        "type": "item",
+        "id": entity_id,
+        "labels": {"en": {"language": "en", "value": entity_id}},
+        "descriptions": {"en": {"language": "en", "value": description}},
+        "sitelinks": {},
+        "claims": {
+            "P31": [{
+                "mainsnak": {
+                    "snaktype": "value",
+                    "property": "P31",
+                    "datatype": "wikibase-item",
+                    "datavalue": {"value": {"entity-type": "item", "numeric-id": 5}, "type": "wikibase-entityid"}
+                },
+                "type": "statement",
+                "rank": "normal"
+            }],
+            "P17": [{
+                "mainsnak": {
+                    "snaktype": "value",
+                    "property": "P17",
+                    "datatype": "wikibase-item",
+                    "datavalue": {"value": {"entity-type": "item", "numeric-id": 55}, "type": "wikibase-entityid"}
+                },
+                "type": "statement",
+                "rank": "normal"
+            }]
+        }
+    }
+
+
+class TestWikipediaDumps(TestCase):
+
+    def setUp(self):
+        super(TestWikipediaDumps, self).setUp()
+        self.revision_dump = self.create_dump(REVISION_DUMP)
+        self.entity_dump = self.create_dump("[\n{},\n{}\n]\n".format(
+            json.dumps(get_entity("Q1", "first item")),
+            json.dumps(get_entity("Q2", "second item"))
+        ))
+
+    def tearDown(self):
+        super(TestWikipediaDumps, self).tearDown()
+        os.remove(self.revision_dump)
+        os.remove(self.entity_dump)
+
+    @staticmethod
+    def create_dump(content):
+        with NamedTemporaryFile("wb", delete=False) as dump_file:
+            dump_file.write(content.encode("utf-8"))
+        return dump_file.name
+
+    def test_iterate_revision_dump(self):
+        revisions = list(iterate_revision_dump(self.revision_dump, processes=1))
+        self.assertEqual([revision["revid"] for revision in revisions], [11, 13])
+        self.assertEqual(revisions[0], {
+            "pageid": 1,
+            "revid": 11,
+            "title": "Article",
+            "timestamp": "2017-03-01T10:00:00Z",
+            "comment": "first edit",
+            "user": "Editor"
+        })
+        self.assertEqual(revisions[1]["user"], "127.0.0.1")
+        revisions = list(iterate_revision_dump(self.revision_dump, start_time=1488326400, end_time=1488412800))
+        self.assertEqual([revision["revid"] for revision in revisions], [11])
+
+    def test_iterate_entity_dump(self):
+        items = list(iterate_entity_dump(self.entity_dump, processes=1))
+        self.assertEqual([item["id"] for item in items], ["Q1", "Q2"])
+        self.assertEqual(items[0]["description"], "first item")
+        self.assertEqual(items[0]["claim_index"], {"P31": ["Q5"], "P17": ["Q55"]})
+        self.assertNotIn("labels", items[0])
+        items = list(iterate_entity_dump(self.entity_dump, entity_ids={"Q2"}, claim_properties=["P17"]))
+        self.assertEqual([item["id"] for item in items], ["Q2"])
+        self.assertEqual(items[0]["claim_index"], {"P17": ["Q55"]})
+
+    def test_extract_dump_data(self):
+        revisions = iterate_revision_dump(self.revision_dump, processes=1)
+        wrap = lambda batch: {"query": {"recentchanges": batch}}
+        changes = list(WikiFeedCommunity.extract_dump_data("revisions", revisions, wrap))
+        self.assertEqual(sorted(changes[0].keys()), ["comment", "pageid", "timestamp", "title", "user"])
+        items = iterate_entity_dump(self.entity_dump, processes=1)
+        wikidata = list(WikiFeedCommunity.extract_dump_data("wikidata", items, lambda batch: batch))
+        self.assertEqual(
+            sorted(wikidata[0].keys()),
+            ["claim_index", "claims", "description", "references", "wikidata"]
+        )
+        self.assertEqual(wikidata[1]["wikidata"], "Q2")
+
+
+class TestWikiDataItemsProjection(TestCase):
+
+    def setUp(self):
+        super(TestWikiDataItemsProjection, self).setUp()
+        self.body = json.dumps({"entities": {"Q1": get_entity("Q1", "first item")}})
+        self.response = Mock(headers={"content-type": "application/json"}, status_code=200, content=self.body)
+
+    def test_projected_storage(self):
+        instance = WikiDataItems(config={"claim_properties": ["P31"]})
+        instance._update_from_response(self.response)
+        stored = json.loads(instance.body)
+        self.assertEqual(list(stored["entities"]["Q1"]["claims"].keys()), ["P31"])
+        instance = WikiDataItems()
+        instance._update_from_response(self.response)
+        self.assertEqual(instance.body, self.body)
+
+    def test_lazy_content(self):
+        instance = WikiDataItems(config={"claim_properties": ["P17"]})
+        instance._update_from_response(self.response)
+        content_type, items = instance.content
+        self.assertEqual(content_type, "application/json")
+        self.assertFalse(isinstance(items, list))
+        items = list(items)
+        self.assertEqual(len(items), 1)
+        self.assertEqual(items[0]["claim_index"], {"P17": ["Q55"]})
+        self.assertEqual([claim["property"] for claim in items[0]["claims"]], ["P17"])
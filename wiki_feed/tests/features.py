@@ -1,7 +1,9 @@
 from django.test import TestCase
 
 from core.models import Individual
-from sources.processors.wikipedia.rank import WikipediaRankProcessor, users_watch, categories_watch, claim_watch
+from sources.models.wikipedia import WikiDataItems
+from sources.processors.wikipedia.rank import (WikipediaRankProcessor, users_watch, categories_watch, claim_watch,
+                                               get_claim_values, get_timestamp_epoch)
 
 
 class TestWikiFeedFeatures(TestCase):
@@ -78,3 +80,20 @@ class TestWikiFeedFeaturesHelpers(TestCase):
         self.assertFalse(is_childrens_party)
         is_woman = claim_watch("P21", "Q6581097", page.properties["wikidata"])
         self.assertFalse(is_woman)
+
+    def test_get_claim_values(self):
+        page = Individual.objects.get(identity="Q42440670")
+        wikidata = page.properties["wikidata"]
+        self.assertEqual(get_claim_values("P17", wikidata), ["Q30"])
+        self.assertEqual(get_claim_values("P21", wikidata), [])
+        indexed_wikidata = dict(wikidata, claim_index=WikiDataItems.get_claim_index(wikidata["claims"]))
+        self.assertEqual(get_claim_values("P17", indexed_wikidata), ["Q30"])
+        self.assertEqual(get_claim_values("P21", indexed_wikidata), [])
+        self.assertEqual(
+            WikipediaRankProcessor.number_of_deaths(page.properties, indexed_wikidata),
+            WikipediaRankProcessor.number_of_deaths(page.properties, wikidata)
+        )
+
+    def test_get_timestamp_epoch(self):
+        self.assertEqual(get_timestamp_epoch("2017-11-02T13:51:12Z"), 1509630672)
+        self.assertIsNone(get_timestamp_epoch(None))
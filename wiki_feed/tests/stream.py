@@ -0,0 +1,119 @@
+import json
+from io import StringIO
+
+from mock import patch, Mock
+
+from django.test import TestCase
+
+from sources.models.wikipedia import WikipediaRecentChanges
+from wiki_feed.models import RecentChangesStream, WikiFeedCommunity
+
+
+def get_recent_changes_data(*changes):
+    return {
+        "query": {
+            "recentchanges": [
+                {"pageid": pageid, "title": title, "timestamp": timestamp, "comment": "", "user": "user"}
+                for pageid, title, timestamp in changes
+            ]
+        }
+    }
+
+
+class TestRecentChangesStream(TestCase):
+
+    def setUp(self):
+        super(TestRecentChangesStream, self).setUp()
+        self.instance = RecentChangesStream.objects.create(wiki_country="en")
+        self.change_log = StringIO("\n".join([
+            json.dumps(get_recent_changes_data(
+                (1, "first", "2017-03-01T10:00:00Z"),
+                (2, "second", "2017-03-01T11:00:00Z")
+            )),
+            "",
+            json.dumps(get_recent_changes_data(
+                (1, "first", "2017-03-02T10:00:00Z"),
+            ))
+        ]))
+
+    def test_get_changes(self):
+        changes = self.instance.get_changes()
+        self.assertEqual(changes.identifier, "epoch")
+        self.assertIsNone(changes.community)
+        self.assertEqual(self.instance.get_changes(), changes)
+
+    def test_replay(self):
+        count = self.instance.replay(self.change_log)
+        self.assertEqual(count, 2)
+        self.assertEqual(self.instance.last_timestamp, 1488448800)  # 2017-03-02T10:00:00Z
+        self.assertEqual(self.instance.changes.individual_set.count(), 3)
+        self.assertEqual(
+            sorted(change["epoch"] for change in self.instance.iterate_changes()),
+            [1488362400, 1488366000, 1488448800]
+        )
+        window = list(self.instance.iterate_changes(1488366000, 1488448800))
+        self.assertEqual(len(window), 1)
+        self.assertEqual(window[0]["title"], "second")
+        self.assertEqual(
+            sorted(self.instance.filter_changes(1488366000).values_list("identity", flat=True)),
+            ["1488366000", "1488448800"]
+        )
+
+    def test_prune(self):
+        self.instance.ROLLING_WINDOW = 60 * 60 * 12
+        self.instance.replay(self.change_log)
+        self.assertEqual(
+            [change["epoch"] for change in self.instance.iterate_changes()],
+            [1488448800]
+        )
+
+    @patch.object(WikipediaRecentChanges, "get")
+    def test_ingest(self, get_mock):
+        first_response = Mock(content=("application/json", get_recent_changes_data(
+            (1, "first", "2017-03-01T10:00:00Z"),
+        )))
+        first_response.create_next_request.return_value = {
+            "url": "https://en.wikipedia.org/w/api.php?rcstart=1488362400&rcend=1488369600&rccontinue=2"
+        }
+        second_response = Mock(content=("application/json", get_recent_changes_data(
+            (2, "second", "2017-03-01T11:00:00Z"),
+        )))
+        second_response.create_next_request.return_value = None
+        get_mock.side_effect = [first_response, second_response]
+        # The request limit interrupts the window, but the continuation request gets stored
+        count = self.instance.ingest(end_time=1488369600, request_limit=1)
+        self.assertEqual(count, 1)
+        self.instance = RecentChangesStream.objects.get(id=self.instance.id)
+        self.assertIsNone(self.instance.last_timestamp)
+        self.assertIn("rccontinue=2", self.instance.next_request["url"])
+        # The next run continues the window
+        count = self.instance.ingest(end_time=1488373200)
+        self.assertEqual(count, 1)
+        self.instance = RecentChangesStream.objects.get(id=self.instance.id)
+        self.assertIsNone(self.instance.next_request)
+        self.assertEqual(self.instance.last_timestamp, 1488369600)
+        self.assertEqual(self.instance.changes.individual_set.count(), 2)
+        # Windows include changes at their end, so the next window starts a second after the last one
+        third_response = Mock(content=("application/json", get_recent_changes_data()))
+        third_response.create_next_request.return_value = None
+        get_mock.side_effect = [third_response]
+        with patch.object(RecentChangesStream, "get_config", return_value={}) as get_config:
+            self.instance.ingest(end_time=1488373200)
+        get_config.assert_called_once_with(1488369601, 1488373200)
+
+    def test_aggregate_stream(self):
+        self.instance.replay(self.change_log)
+        community = WikiFeedCommunity()
+        community.config = {
+            "start_time": 1488326400,  # 2017-03-01T00:00:00Z
+            "end_time": 1488412800,  # 2017-03-02T00:00:00Z
+            "stream": self.instance.id
+        }
+        community.save()
+        community.setup_growth()
+        revisions_growth = community.growth_set.get(type="revisions")
+        self.assertTrue(revisions_growth.is_finished)
+        self.assertEqual(revisions_growth.output.individual_set.count(), 2)
+        self.assertEqual(community.next_growth().type, "pages")
+        pages = community.next_growth().input
+        self.assertEqual(sorted(pages.individual_set.values_list("identity", flat=True)), ["1", "2"])